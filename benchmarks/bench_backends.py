@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos backends de saída: o mesmo layout entregue a cada backend.
+
+  nulo_paginas - NullBackend(count_ops=False): só layout e paginação
+  nulo_ops     - NullBackend(): também decompõe as linhas em TextOp
+  pdf          - PdfBackend (PyMuPDF, o render_to_pdf)
+  raster       - RasterBackend: PNGs direto do layout, sem PDF intermediário
+  pdf+raster   - o caminho antigo para prévias: PDF e depois pixmap do PyMuPDF
+
+Uso:
+    python benchmarks/bench_backends.py [arquivo.docx] [--dpi 96] [--workers N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import fitz
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pydocx_render.backends.null import NullBackend
+from pydocx_render.backends.pdf import PdfBackend
+from pydocx_render.backends.raster import RasterBackend
+from pydocx_render.core.parser import parse_docx
+from pydocx_render.renderer import render
+
+def pdf_then_raster(doc, tmp, dpi):
+    pdf_path = os.path.join(tmp, 'previa.pdf')
+    stats = render(doc, PdfBackend(pdf_path))
+    with fitz.open(pdf_path) as pdf_doc:
+        for page in pdf_doc:
+            page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY).save(
+                os.path.join(tmp, f'pdf_{page.number + 1:03d}.png'))
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('file', nargs='?', default=os.path.join(ROOT, 'documents', 'FlowScript.docx'))
+    parser.add_argument('--dpi', type=float, default=96)
+    parser.add_argument('--workers', type=int)
+    args = parser.parse_args()
+
+    doc = parse_docx(args.file)
+    with tempfile.TemporaryDirectory() as tmp:
+        modes = [
+            ('nulo_paginas', lambda: render(doc, NullBackend(count_ops=False))),
+            ('nulo_ops', lambda: render(doc, NullBackend())),
+            ('pdf', lambda: render(doc, PdfBackend(os.path.join(tmp, 'saida.pdf')))),
+            ('raster', lambda: render(doc, RasterBackend(os.path.join(tmp, 'raster_{page:03d}.png'),
+                                                         dpi=args.dpi, workers=args.workers))),
+            ('pdf+raster', lambda: pdf_then_raster(doc, tmp, args.dpi)),
+        ]
+        print(f"{'backend':<13} {'tempo (s)':>10} {'páginas':>8}")
+        for name, run in modes:
+            start = time.perf_counter()
+            stats = run()
+            print(f"{name:<13} {time.perf_counter() - start:>10.2f} {stats.pages:>8}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos prazos: quanto uma conversão passa do prazo antes de parar.
+
+Gera um .docx grande (muitos parágrafos e um parágrafo gigante no meio) e
+converte com prazos crescentes, nos modos on_timeout='abort' e 'partial'.
+Para cada prazo mostra o tempo até a conversão voltar, o atraso em relação
+ao prazo, a etapa em que parou e as páginas salvas. Mede também o parse com
+os dois parsers (parse_docx confere por parágrafo, parse_docx_sax por bloco)
+e o render de uma cópia dividida em --sections seções, diagramadas em
+paralelo.
+
+Um atraso acima de --max-overshoot segundos encerra com código 1. O limite
+não vale para parse_docx, que monta a árvore do lxml de uma vez; nos demais
+o pior caso é o layout do parágrafo gigante e, em 'partial', a gravação das
+páginas prontas.
+
+Uso:
+    python benchmarks/bench_deadline.py [--paragraphs 20000] [--timeouts 0.1 0.5 2]
+        [--sections 4] [--max-overshoot 1.0]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import zipfile
+from xml.sax.saxutils import escape
+
+import fitz
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pydocx_render.core.parser import parse_docx
+from pydocx_render.core.sax_parser import parse_docx_sax
+from pydocx_render.deadline import ConversionTimeout, Deadline
+from pydocx_render.renderer import render_to_pdf
+
+NAMESPACES = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+LOREM = ("Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor "
+         "incididunt ut labore et dolore magna aliqua. ")
+
+def make_document(path: str, paragraphs: int, giant_words: int, sections: int = 1):
+    body = []
+    per_section = -(-paragraphs // sections)
+    for number in range(paragraphs):
+        if number == paragraphs // 2:
+            body.append(f'<w:p><w:r><w:t>{escape(LOREM * (giant_words // 18))}</w:t></w:r></w:p>')
+        text = escape(f"Parágrafo {number + 1}. {LOREM}")
+        # Quebra de seção no último parágrafo de cada seção (a última fica em w:body)
+        ppr = '<w:pPr><w:sectPr/></w:pPr>' if (number + 1) % per_section == 0 and number + 1 < paragraphs else ''
+        body.append(f'<w:p>{ppr}<w:r><w:t xml:space="preserve">{text}</w:t></w:r></w:p>')
+    document = f'<?xml version="1.0" encoding="UTF-8"?><w:document {NAMESPACES}><w:body>{"".join(body)}</w:body></w:document>'
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as docx_zip:
+        docx_zip.writestr('word/document.xml', document)
+
+def timed(run, timeout):
+    start = time.perf_counter()
+    try:
+        result = run(Deadline(timeout))
+        error = None
+    except ConversionTimeout as e:
+        result, error = None, e
+    return time.perf_counter() - start, result, error
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--paragraphs', type=int, default=20000)
+    parser.add_argument('--giant-words', type=int, default=200000)
+    parser.add_argument('--timeouts', type=float, nargs='+', default=[0.1, 0.5, 2.0])
+    parser.add_argument('--sections', type=int, default=4)
+    parser.add_argument('--max-overshoot', type=float, default=1.0)
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        docx_path = os.path.join(tmp, 'grande.docx')
+        sections_path = os.path.join(tmp, 'secoes.docx')
+        pdf_path = os.path.join(tmp, 'grande.pdf')
+        make_document(docx_path, args.paragraphs, args.giant_words)
+        make_document(sections_path, args.paragraphs, args.giant_words, args.sections)
+        doc = parse_docx(docx_path)
+        sectioned = parse_docx(sections_path)
+
+        print(f"{'operação':<22} {'prazo':>6} {'tempo':>7} {'atraso':>7}  resultado")
+        # (nome, conversão, atraso limitado por --max-overshoot)
+        operations = [
+            ('parse_docx', lambda deadline: parse_docx(docx_path, deadline=deadline), False),
+            ('parse_docx_sax', lambda deadline: parse_docx_sax(docx_path, deadline=deadline), True),
+            ('render (abort)', lambda deadline: render_to_pdf(doc, pdf_path, deadline=deadline), True),
+            ('render (partial)', lambda deadline: render_to_pdf(doc, pdf_path, deadline=deadline,
+                                                                on_timeout='partial'), True),
+            ('render (seções)', lambda deadline: render_to_pdf(sectioned, pdf_path, deadline=deadline,
+                                                               section_workers=args.sections), True),
+        ]
+        for name, run, bounded in operations:
+            for timeout in args.timeouts:
+                elapsed, result, error = timed(run, timeout)
+                late = max(0.0, elapsed - timeout)
+                if bounded and late > args.max_overshoot:
+                    failures.append(f"{name}, prazo {timeout:.1f}s: atraso de {late:.2f}s")
+                if error is not None:
+                    outcome = f"interrompida: {error.progress}"
+                elif getattr(result, 'truncated', None) is not None:
+                    with fitz.open(pdf_path) as pdf_doc:
+                        outcome = f"parcial: {result.truncated} ({pdf_doc.page_count} páginas no PDF)"
+                else:
+                    outcome = "completa"
+                print(f"{name:<22} {timeout:>5.1f}s {elapsed:>6.2f}s {late:>6.2f}s  {outcome}")
+
+    for failure in failures:
+        print(f"ERRO: {failure} (limite {args.max_overshoot:.2f}s)")
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
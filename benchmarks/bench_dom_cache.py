@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Benchmark do cache de DOM: parse_docx sem cache x carga do DomCache.
+
+Uso:
+    python benchmarks/bench_dom_cache.py [arquivo.docx ...] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pydocx_render.core.parser import parse_docx
+from pydocx_render.core.dom_cache import DomCache
+
+def best_of(repeat, func, *args, **kwargs):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('files', nargs='*', default=[os.path.join(ROOT, 'documents', 'FlowScript.docx')])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = DomCache(tmp)
+        print(f"{'arquivo':<30} {'parse (ms)':>11} {'cache (ms)':>11} {'ganho':>7}")
+        for path in args.files:
+            parse_time = best_of(args.repeat, parse_docx, path)
+            parse_docx(path, cache=cache)  # popula o cache
+            cached_time = best_of(args.repeat, parse_docx, path, cache=cache)
+            print(f"{os.path.basename(path):<30} {parse_time * 1000:>11.2f} "
+                  f"{cached_time * 1000:>11.2f} {parse_time / cached_time:>6.1f}x")
+        print(f"hits={cache.hits} misses={cache.misses}")
+
+if __name__ == '__main__':
+    main()
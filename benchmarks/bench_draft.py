@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Benchmark do modo rascunho: Helvetica base-14 x fontes TrueType embutidas.
+
+O documento é lido uma vez; só a renderização é medida.
+
+Uso:
+    python benchmarks/bench_draft.py [arquivo.docx] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pydocx_render.core.parser import parse_docx
+from pydocx_render.renderer import render_to_pdf
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('file', nargs='?', default=os.path.join(ROOT, 'documents', 'FlowScript.docx'))
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    doc = parse_docx(args.file)
+    print(f"{'modo':<8} {'melhor (s)':>10} {'páginas':>8} {'tamanho (KB)':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ('normal', 'rascunho'):
+            output = os.path.join(tmp, f'{mode}.pdf')
+            best = None
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                stats = render_to_pdf(doc, output, draft=mode == 'rascunho')
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            print(f"{mode:<8} {best:>10.2f} {stats.pages:>8} {os.path.getsize(output) / 1024:>13.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark da leitura das fontes: extensão ft_native (API C do FreeType) x freetype-py.
+
+Mede, por fonte, a construção a frio da tabela de avanços e a leitura do cmap
+usado pela cadeia de fallback, e confere que os dois caminhos dão os mesmos
+valores. Precisa da extensão compilada (python setup.py build_ext --inplace).
+
+Uso:
+    python benchmarks/bench_font_tables.py [fonte.ttf ...] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pydocx_render.layout import ft_native
+from pydocx_render.layout.advance_tables import _build_table, _build_table_freetype_py
+from pydocx_render.renderer import find_font_file
+
+def best_of(repeat, run):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def read_cmap_freetype_py(font_path):
+    import freetype
+    face = freetype.Face(font_path)
+    return [charcode for charcode, glyph_index in face.get_chars() if glyph_index]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('fonts', nargs='*')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    fonts = args.fonts or [find_font_file(style) for style in ('regular', 'bold')]
+    print(f"{'fonte':<28} {'glifos':>7} {'tabela C':>9} {'tabela py':>10} "
+          f"{'cmap C':>8} {'cmap py':>8} {'iguais':>7}")
+    for font_path in fonts:
+        native_s, native = best_of(args.repeat, lambda: _build_table(font_path))
+        py_s, py = best_of(args.repeat, lambda: _build_table_freetype_py(font_path))
+        cmap_native_s, cmap_native = best_of(args.repeat, lambda: ft_native.read_cmap(font_path))
+        cmap_py_s, cmap_py = best_of(args.repeat, lambda: read_cmap_freetype_py(font_path))
+        same = (native.advances == py.advances and native.default_advance == py.default_advance
+                and native.units_per_em == py.units_per_em and cmap_native == cmap_py)
+        print(f"{os.path.basename(font_path)[:28]:<28} {len(native.advances):>7} "
+              f"{native_s * 1000:>7.1f}ms {py_s * 1000:>8.1f}ms "
+              f"{cmap_native_s * 1000:>6.1f}ms {cmap_py_s * 1000:>6.1f}ms {'sim' if same else 'NÃO':>7}")
+
+if __name__ == '__main__':
+    main()
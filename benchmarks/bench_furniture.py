@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark de cabeçalho/rodapé: Form XObject carimbado x redesenho por página.
+
+Só o custo do cabeçalho e do rodapé é medido: as páginas ficam sem corpo.
+"carimbo" usa o XObject desenhado uma vez (mais os campos PAGE por página);
+"redesenho" desenha todas as linhas do cabeçalho/rodapé em cada página.
+
+Uso:
+    python benchmarks/bench_furniture.py arquivo.docx [--pages 200]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import fitz
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pydocx_render.core.parser import parse_docx
+from pydocx_render import renderer
+
+def run(mode, model, ctx, pages):
+    start = time.perf_counter()
+    pdf_doc = fitz.open()
+    stamp = renderer._FurnitureStamp(model.furniture, ctx, model.width, model.height) if mode == 'carimbo' else None
+    for number in range(1, pages + 1):
+        page = pdf_doc.new_page(width=model.width, height=model.height)
+        if stamp is not None:
+            stamp.apply(page, number)
+        else:
+            for line in model.furniture:
+                renderer._draw_line(page, line, ctx, number)
+    size = len(pdf_doc.tobytes(garbage=4, deflate=True))
+    pdf_doc.close()
+    if stamp is not None:
+        stamp.close()
+    return time.perf_counter() - start, size
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('file')
+    parser.add_argument('--pages', type=int, default=200)
+    args = parser.parse_args()
+
+    dom = parse_docx(args.file)
+    if not dom.header and not dom.footer:
+        sys.exit("O documento não tem cabeçalho nem rodapé padrão.")
+    ctx = renderer._make_context(None)
+    model = next(renderer._iter_page_models([], dom.header, dom.footer, ctx))
+
+    print(f"{'modo':<10} {'tempo (s)':>10} {'tamanho (KB)':>13}")
+    for mode in ('carimbo', 'redesenho'):
+        elapsed, size = run(mode, model, ctx, args.pages)
+        print(f"{mode:<10} {elapsed:>10.2f} {size / 1024:>13.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark da entrega progressiva: tempo até a primeira página com iter_pages.
+
+Compara render_to_pdf (tudo ou nada) com iter_pages sobre iter_paragraphs,
+nos dois formatos de saída (PDF de uma página e PageModel). Cada modo roda
+num subprocesso para que o pico de RSS seja medido isoladamente.
+
+Uso:
+    python benchmarks/bench_iter_pages.py [arquivo.docx]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MODES = ('render_to_pdf', 'iter_pages_pdf', 'iter_pages_model')
+
+def run_mode(mode, path):
+    from pydocx_render.core.sax_parser import iter_paragraphs
+    from pydocx_render.memory import peak_rss_mb
+    from pydocx_render.renderer import iter_pages, render_to_pdf
+
+    start = time.perf_counter()
+    first = None
+    pages = 0
+    if mode == 'render_to_pdf':
+        with tempfile.TemporaryDirectory() as tmp:
+            pages = render_to_pdf(iter_paragraphs(path), os.path.join(tmp, 'out.pdf')).pages
+        first = time.perf_counter() - start
+    else:
+        for _ in iter_pages(iter_paragraphs(path), as_pdf=mode == 'iter_pages_pdf'):
+            if first is None:
+                first = time.perf_counter() - start
+            pages += 1
+    total = time.perf_counter() - start
+    return {'first': first, 'total': total, 'pages': pages, 'rss': peak_rss_mb()}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('file', nargs='?', default=os.path.join(ROOT, 'documents', 'FlowScript.docx'))
+    parser.add_argument('--mode', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        # Subprocesso: só a última linha da saída interessa ao processo pai
+        print(json.dumps(run_mode(args.mode, args.file)))
+        return
+
+    print(f"{'modo':<18} {'1ª página (s)':>14} {'total (s)':>10} {'páginas':>8} {'pico RSS (MB)':>14}")
+    for mode in MODES:
+        out = subprocess.run([sys.executable, __file__, args.file, '--mode', mode],
+                             capture_output=True, text=True, check=True).stdout
+        result = json.loads(out.strip().splitlines()[-1])
+        rss = f"{result['rss']:.1f}" if result['rss'] is not None else '-'
+        print(f"{mode:<18} {result['first']:>14.2f} {result['total']:>10.2f} "
+              f"{result['pages']:>8} {rss:>14}")
+
+if __name__ == '__main__':
+    main()
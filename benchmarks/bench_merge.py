@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark da mala direta: registros por segundo com MergeTemplate.
+
+Sem arquivo, gera um modelo sintético (carta com cabeçalho, rodapé com PAGE,
+campos MERGEFIELD e {{nome}} e parágrafos fixos). Compara:
+  ingenuo     - parse + layout + render_to_pdf do documento inteiro por registro
+  por_arquivo - MergeTemplate.render_each (um PDF por registro)
+  combinado   - MergeTemplate.render_all (um PDF só, fontes compartilhadas)
+
+Uso:
+    python benchmarks/bench_merge.py [modelo.docx] [--records 200] [--paragraphs 8]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import zipfile
+from dataclasses import replace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pydocx_render.merge import MergeTemplate, fill_runs, parse_template
+from pydocx_render.renderer import render_to_pdf
+
+NS = ('xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+      'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"')
+
+def _merge_field(name):
+    return (f'<w:r><w:fldChar w:fldCharType="begin"/></w:r>'
+            f'<w:r><w:instrText xml:space="preserve"> MERGEFIELD {name} \\* MERGEFORMAT </w:instrText></w:r>'
+            f'<w:r><w:fldChar w:fldCharType="separate"/></w:r>'
+            f'<w:r><w:t>«{name}»</w:t></w:r>'
+            f'<w:r><w:fldChar w:fldCharType="end"/></w:r>')
+
+def _text(text, bold=False):
+    rpr = '<w:rPr><w:b/></w:rPr>' if bold else ''
+    return f'<w:r>{rpr}<w:t xml:space="preserve">{text}</w:t></w:r>'
+
+def build_template(path, paragraphs):
+    lorem = ("Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod "
+             "tempor incididunt ut labore et dolore magna aliqua. ") * 3
+    body = [
+        f'<w:p><w:pPr><w:jc w:val="right"/></w:pPr>{_text("São Paulo, {{data}}")}</w:p>',
+        f'<w:p>{_text("Prezado(a) ")}{_merge_field("Nome")}{_text(",", True)}</w:p>',
+        f'<w:p><w:fldSimple w:instr=" MERGEFIELD Endereco "><w:r><w:t>«Endereco»</w:t></w:r></w:fldSimple></w:p>',
+    ]
+    body += [f'<w:p>{_text(lorem)}</w:p>' for _ in range(paragraphs)]
+    body.append(f'<w:p>{_text("Saldo devedor: R$ ")}{_merge_field("Valor")}</w:p>')
+    sect = ('<w:sectPr><w:headerReference w:type="default" r:id="rIdH"/>'
+            '<w:footerReference w:type="default" r:id="rIdF"/></w:sectPr>')
+    document = f'<?xml version="1.0" encoding="UTF-8"?><w:document {NS}><w:body>{"".join(body)}{sect}</w:body></w:document>'
+    header = (f'<?xml version="1.0" encoding="UTF-8"?><w:hdr {NS}><w:p><w:pPr><w:jc w:val="center"/></w:pPr>'
+              f'{_text("ACME Cobranças S.A.", True)}</w:p></w:hdr>')
+    footer = (f'<?xml version="1.0" encoding="UTF-8"?><w:ftr {NS}><w:p><w:pPr><w:jc w:val="right"/></w:pPr>'
+              f'{_text("Página ")}<w:fldSimple w:instr=" PAGE "><w:r><w:t>1</w:t></w:r></w:fldSimple></w:p></w:ftr>')
+    rels = ('<?xml version="1.0" encoding="UTF-8"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rIdH" Type="header" Target="header1.xml"/>'
+            '<Relationship Id="rIdF" Type="footer" Target="footer1.xml"/></Relationships>')
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as docx_zip:
+        docx_zip.writestr('word/document.xml', document)
+        docx_zip.writestr('word/header1.xml', header)
+        docx_zip.writestr('word/footer1.xml', footer)
+        docx_zip.writestr('word/_rels/document.xml.rels', rels)
+
+def make_records(count):
+    return [{'Nome': f'Cliente {i:05d} da Silva', 'Endereco': f'Rua {i % 97}, {i}',
+             'Valor': f'{i * 13.7:,.2f}', 'data': f'{1 + i % 28} de outubro de 2026'}
+            for i in range(count)]
+
+def run_naive(path, records, out_dir):
+    start = time.perf_counter()
+    for index, record in enumerate(records):
+        doc = parse_template(path)
+        doc.body = [replace(para, runs=fill_runs(para, record)) for para in doc.body]
+        render_to_pdf(doc, os.path.join(out_dir, f'ingenuo_{index:05d}.pdf'))
+    return time.perf_counter() - start
+
+def dir_size(out_dir, prefix):
+    return sum(os.path.getsize(os.path.join(out_dir, name))
+               for name in os.listdir(out_dir) if name.startswith(prefix))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('file', nargs='?')
+    parser.add_argument('--records', type=int, default=200)
+    parser.add_argument('--paragraphs', type=int, default=8)
+    args = parser.parse_args()
+
+    records = make_records(args.records)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.file or os.path.join(tmp, 'modelo.docx')
+        if not args.file:
+            build_template(path, args.paragraphs)
+
+        start = time.perf_counter()
+        template = MergeTemplate(path)
+        prepare = time.perf_counter() - start
+        print(f"Modelo preparado em {prepare:.3f}s; campos: {', '.join(template.fields) or '-'}")
+
+        results = [('ingenuo', run_naive(path, records, tmp), dir_size(tmp, 'ingenuo_'))]
+        with template:
+            stats = template.render_each(records, os.path.join(tmp, 'carta_{index:05d}.pdf'))
+            results.append(('por_arquivo', stats.seconds, dir_size(tmp, 'carta_')))
+            stats = template.render_all(records, os.path.join(tmp, 'todas.pdf'))
+            results.append(('combinado', stats.seconds, dir_size(tmp, 'todas')))
+        print(f"Parágrafos com campos: {template.stats.relaid_paragraphs} quebrados de novo, "
+              f"{template.stats.reused_paragraphs} reaproveitados")
+
+    print(f"{'modo':<12} {'tempo (s)':>10} {'registros/s':>12} {'tamanho (KB)':>13}")
+    for mode, elapsed, size in results:
+        print(f"{mode:<12} {elapsed:>10.2f} {len(records) / elapsed:>12.1f} {size / 1024:>13.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos arquivos de métricas: FreeType em cada processo x mmap compartilhado.
+
+Sobe 'workers' processos novos (spawn) e mede, em cada um, o tempo para montar
+as métricas da fonte regular e da cadeia de fallback (como _make_context faz)
+e a memória do processo: PSS e páginas privadas, de /proc/self/smaps_rollup
+(só no Linux). Com arquivos de métricas as tabelas ficam em páginas
+compartilhadas, que o PSS divide entre os processos.
+
+Uso:
+    python benchmarks/bench_metric_files.py [--workers 4] [--fonts a.ttf b.ttf ...]
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def smaps_mb():
+    """(PSS, privada) do processo em MB, ou (None, None) fora do Linux."""
+    values = {}
+    try:
+        with open('/proc/self/smaps_rollup') as rollup:
+            for line in rollup:
+                key, _, rest = line.partition(':')
+                if rest.strip().endswith('kB'):
+                    values[key] = int(rest.split()[0]) / 1024
+    except OSError:
+        return None, None
+    return values.get('Pss'), values.get('Private_Clean', 0) + values.get('Private_Dirty', 0)
+
+def worker(metrics_dir, fonts, barrier):
+    from pydocx_render.layout import metric_files
+    from pydocx_render.layout.advance_tables import advance_table_for
+    from pydocx_render.renderer import FontMetrics
+    metric_files.set_metrics_dir(metrics_dir)
+    _, private_before = smaps_mb()
+    start = time.perf_counter()
+    metrics = FontMetrics(fonts[0], fonts[1:])
+    for font_path in fonts:
+        advance_table_for(font_path)
+    elapsed = time.perf_counter() - start
+    # Todos medem com os outros vivos, senão o PSS não divide nada
+    barrier.wait()
+    pss, private = smaps_mb()
+    barrier.wait()
+    del metrics
+    return elapsed, pss, None if private is None else private - private_before
+
+def run(metrics_dir, fonts, workers):
+    context = multiprocessing.get_context('spawn')
+    barrier = context.Manager().Barrier(workers)
+    with context.Pool(workers) as pool:
+        return pool.starmap(worker, [(metrics_dir, fonts, barrier)] * workers)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--fonts', nargs='+')
+    args = parser.parse_args()
+
+    from pydocx_render.layout.metric_files import compile_metrics
+    from pydocx_render.renderer import find_fallback_fonts, find_font_file
+    fonts = args.fonts or [find_font_file('regular'), *find_fallback_fonts()]
+
+    with tempfile.TemporaryDirectory() as metrics_dir:
+        for font_path in fonts:
+            compile_metrics(font_path, metrics_dir)
+        print(f"fontes: {', '.join(os.path.basename(path) for path in fonts)}")
+        print(f"{'modo':<9} {'métricas (ms)':>14} {'PSS (MB)':>9} {'privada (MB)':>13}")
+        for mode, directory in (('freetype', None), ('mmap', metrics_dir)):
+            results = run(directory, fonts, args.workers)
+            elapsed = sum(r[0] for r in results) / len(results)
+            line = f"{mode:<9} {elapsed * 1000:>14.1f}"
+            if results[0][1] is not None:
+                pss = sum(r[1] for r in results) / len(results)
+                private = sum(r[2] for r in results) / len(results)
+                line += f" {pss:>9.1f} {private:>13.2f}"
+            print(line)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos backends de parsing: parse_docx (árvore lxml) x parse_docx_sax.
+
+Gera um .docx sintético com um word/document.xml do tamanho pedido (50 MB por
+padrão), cheio de runs fragmentadas como as que o Word produz, e mede cada
+backend num processo novo para que o pico de RSS de um não contamine o outro.
+
+Uso:
+    python benchmarks/bench_parser.py [--size-mb 50] [--repeat 3]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+BACKENDS = {
+    'tree': ('pydocx_render.core.parser', 'parse_docx'),
+    'sax': ('pydocx_render.core.sax_parser', 'parse_docx_sax'),
+}
+
+HEADER = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+    '<w:body>'
+)
+FOOTER = '</w:body></w:document>'
+
+PARAGRAPH = (
+    '<w:p w:rsidR="00F10D84" w:rsidRDefault="00F10D84">'
+    '<w:r w:rsidRPr="00A1"><w:t xml:space="preserve">Lorem ipsum dolor sit amet, </w:t></w:r>'
+    '<w:r w:rsidRPr="00A2"><w:t xml:space="preserve">consectetur adipiscing </w:t></w:r>'
+    '<w:r w:rsidRPr="00A3"><w:rPr><w:b/><w:bCs/></w:rPr><w:t>elit</w:t></w:r>'
+    '<w:r w:rsidRPr="00A4"><w:rPr><w:b/><w:bCs/></w:rPr><w:t xml:space="preserve">, sed do </w:t></w:r>'
+    '<w:r w:rsidRPr="00A5"><w:rPr><w:i/></w:rPr><w:t>eiusmod</w:t><w:tab/><w:t>tempor</w:t></w:r>'
+    '<w:r w:rsidRPr="00A6"><w:t xml:space="preserve"> incididunt ut labore et dolore magna aliqua.</w:t></w:r>'
+    '</w:p>'
+)
+
+def build_docx(path, size_mb):
+    """Escreve um .docx mínimo cujo document.xml tem aproximadamente size_mb MB."""
+    count = int(size_mb * 1024 * 1024 / len(PARAGRAPH.encode('utf-8')))
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as docx_zip:
+        with docx_zip.open('word/document.xml', 'w', force_zip64=True) as xml_stream:
+            xml_stream.write(HEADER.encode('utf-8'))
+            block = (PARAGRAPH * 1000).encode('utf-8')
+            for _ in range(count // 1000):
+                xml_stream.write(block)
+            xml_stream.write((PARAGRAPH * (count % 1000)).encode('utf-8'))
+            xml_stream.write(FOOTER.encode('utf-8'))
+    return count
+
+def run_backend(name, docx_path):
+    """Executado no processo filho: faz o parse e imprime tempo e pico de RSS."""
+    import importlib
+    from pydocx_render.memory import peak_rss_mb
+
+    module_name, func_name = BACKENDS[name]
+    parse = getattr(importlib.import_module(module_name), func_name)
+
+    start = time.perf_counter()
+    doc = parse(docx_path)
+    elapsed = time.perf_counter() - start
+
+    print(f"{elapsed} {peak_rss_mb()} {len(doc.body)}")
+
+def measure(name, docx_path):
+    output = subprocess.run(
+        [sys.executable, __file__, '--child', name, docx_path],
+        check=True, capture_output=True, text=True,
+    ).stdout.split()
+    elapsed, peak, paragraphs = output[-3:]
+    return float(elapsed), float(peak), int(paragraphs)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size-mb', type=float, default=50.0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--child', nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_backend(*args.child)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        docx_path = os.path.join(tmp, 'bench.docx')
+        print(f"Gerando document.xml de ~{args.size_mb:.0f} MB...")
+        build_docx(docx_path, args.size_mb)
+        with zipfile.ZipFile(docx_path) as docx_zip:
+            xml_mb = docx_zip.getinfo('word/document.xml').file_size / (1024 * 1024)
+
+        print(f"{'backend':<8} {'tempo (s)':>10} {'MB/s':>8} {'pico RSS (MB)':>14} {'parágrafos':>11}")
+        for name in BACKENDS:
+            best = None
+            for _ in range(args.repeat):
+                result = measure(name, docx_path)
+                if best is None or result[0] < best[0]:
+                    best = result
+            elapsed, peak, paragraphs = best
+            print(f"{name:<8} {elapsed:>10.2f} {xml_mb / elapsed:>8.1f} "
+                  f"{peak:>14.1f} {paragraphs:>11}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark do pipeline de lote: convert_batch x conversões em sequência.
+
+Converte cada arquivo 'copies' vezes. "sequencial" chama convert_docx um
+documento por vez; "pipeline" usa convert_batch com as threads por etapa
+indicadas (e, opcionalmente, o desenho em processos) e mostra a ocupação de
+cada etapa, para achar o gargalo.
+
+Os dois modos têm que dar as mesmas páginas: os PDFs são comparados pelo
+texto de cada página e qualquer diferença encerra com código 1. Os bytes não
+servem para isso: o PyMuPDF grava um /ID aleatório no trailer a cada
+gravação e, como ele sai com os bytes altos em UTF-8, até o tamanho do
+arquivo varia de uma execução para outra.
+
+O pipeline só ganha quando as etapas podem de fato se sobrepor: com mais de
+um núcleo (parse e layout de um documento enquanto outro é desenhado; com
+--draw-processes, o desenho em vários processos) ou com E/S lenta na leitura
+e na gravação. Com um núcleo só e arquivos locais ele empata com o
+sequencial.
+
+Uso:
+    python benchmarks/bench_pipeline.py [arquivo.docx ...] [--copies 4]
+        [--parse 1] [--layout 1] [--draw 1] [--save 1] [--queue 2]
+        [--draw-processes 0]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import tempfile
+import time
+
+import fitz
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pydocx_render.convert import convert_docx
+from pydocx_render.pipeline import convert_batch
+
+def page_texts(pdf_path):
+    with fitz.open(pdf_path) as pdf:
+        return [page.get_text() for page in pdf]
+
+def compare(index, sequential_path, result) -> bool:
+    """True se o pipeline gerou as mesmas páginas que a conversão sequencial."""
+    if result.error is not None:
+        print(f"ERRO: documento {index} falhou no pipeline: {result.error}")
+        return False
+    expected = page_texts(sequential_path)
+    got = page_texts(result.output_path)
+    if len(expected) != len(got):
+        print(f"ERRO: documento {index} tem {len(expected)} páginas no sequencial "
+              f"e {len(got)} no pipeline")
+        return False
+    for number, (a, b) in enumerate(zip(expected, got), 1):
+        if a != b:
+            print(f"ERRO: documento {index} difere entre os modos na página {number}")
+            return False
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('files', nargs='*')
+    parser.add_argument('--copies', type=int, default=4)
+    parser.add_argument('--parse', type=int, default=1)
+    parser.add_argument('--layout', type=int, default=1)
+    parser.add_argument('--draw', type=int, default=1)
+    parser.add_argument('--save', type=int, default=1)
+    parser.add_argument('--queue', type=int, default=2)
+    parser.add_argument('--draw-processes', type=int, default=0)
+    args = parser.parse_args()
+
+    files = args.files or sorted(glob.glob(os.path.join(ROOT, 'documents', '*.docx')))
+    inputs = [path for _ in range(args.copies) for path in files]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        for index, path in enumerate(inputs):
+            convert_docx(path, os.path.join(tmp, f'seq_{index:04d}.pdf'))
+        sequential = time.perf_counter() - start
+
+        jobs = [(path, os.path.join(tmp, f'pipe_{index:04d}.pdf')) for index, path in enumerate(inputs)]
+        stats = convert_batch(jobs, parse_workers=args.parse, layout_workers=args.layout,
+                              draw_workers=args.draw, save_workers=args.save,
+                              queue_size=args.queue, draw_processes=args.draw_processes)
+
+        mismatches = sum(1 for index, result in enumerate(stats.results)
+                         if not compare(index, os.path.join(tmp, f'seq_{index:04d}.pdf'), result))
+
+    print(f"sequencial: {sequential:.2f}s ({len(inputs) / sequential:.2f} docs/s)")
+    print(f"pipeline:   {stats.seconds:.2f}s ({len(inputs) / stats.seconds:.2f} docs/s)")
+    print()
+    print(stats)
+    print(f"Gargalo: {stats.bottleneck.name}")
+    if (os.cpu_count() or 1) == 1:
+        print("AVISO: um núcleo só; as etapas não rodam em paralelo e o pipeline não deve ganhar.")
+    print(f"Páginas iguais nos dois modos: {len(inputs) - mismatches} de {len(inputs)} documentos")
+    sys.exit(1 if mismatches else 0)
+
+if __name__ == '__main__':
+    main()
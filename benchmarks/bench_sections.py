@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark das seções: relatório sintético com seções retrato e paisagem.
+
+Gera um .docx com 'sections' seções (alternando A4 retrato com margens de
+2,5 cm e A4 paisagem com margens de 1,5 cm, uma a cada três começando em
+página ímpar), com cabeçalho e rodapé com o campo PAGE. Mede o layout
+(NullBackend) com as seções diagramadas em sequência e em paralelo, e o PDF
+completo, e confere que os dois layouts são iguais.
+
+Uso:
+    python benchmarks/bench_sections.py [--sections 12] [--paragraphs 150] [--workers N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import zipfile
+from xml.sax.saxutils import escape
+
+import fitz
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pydocx_render.backends.null import NullBackend
+from pydocx_render.core.parser import parse_docx
+from pydocx_render.renderer import _iter_document_models, _make_context, render, render_to_pdf
+
+NAMESPACES = ('xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+              'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"')
+LOREM = ("Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor "
+         "incididunt ut labore et dolore magna aliqua. Ut enim ad minim veniam, quis nostrud. ")
+REFERENCES = ('<w:headerReference w:type="default" r:id="rIdH"/>'
+              '<w:footerReference w:type="default" r:id="rIdF"/>')
+
+def sect_pr(index: int) -> str:
+    start = '<w:type w:val="oddPage"/>' if index % 3 == 2 else ''
+    if index % 2:
+        size = '<w:pgSz w:w="16838" w:h="11906" w:orient="landscape"/>'
+        margins = '<w:pgMar w:top="851" w:right="851" w:bottom="851" w:left="851" w:header="425" w:footer="425" w:gutter="0"/>'
+    else:
+        size = '<w:pgSz w:w="11906" w:h="16838"/>'
+        margins = '<w:pgMar w:top="1417" w:right="1417" w:bottom="1417" w:left="1417" w:header="709" w:footer="709" w:gutter="0"/>'
+    return f'<w:sectPr>{REFERENCES}{start}{size}{margins}</w:sectPr>'
+
+def make_report(path: str, sections: int, paragraphs: int):
+    body = []
+    for index in range(sections):
+        for number in range(paragraphs):
+            text = escape(f"Seção {index + 1}, parágrafo {number + 1}. {LOREM * 2}")
+            body.append(f'<w:p><w:r><w:t xml:space="preserve">{text}</w:t></w:r></w:p>')
+        if index + 1 < sections:
+            body.append(f'<w:p><w:pPr>{sect_pr(index)}</w:pPr></w:p>')
+    body.append(sect_pr(sections - 1))
+    document = f'<?xml version="1.0" encoding="UTF-8"?><w:document {NAMESPACES}><w:body>{"".join(body)}</w:body></w:document>'
+    header = (f'<?xml version="1.0"?><w:hdr {NAMESPACES}><w:p><w:pPr><w:jc w:val="center"/></w:pPr>'
+              '<w:r><w:rPr><w:b/></w:rPr><w:t>Relatório anual</w:t></w:r></w:p></w:hdr>')
+    footer = (f'<?xml version="1.0"?><w:ftr {NAMESPACES}><w:p><w:pPr><w:jc w:val="right"/></w:pPr>'
+              '<w:r><w:t xml:space="preserve">Página </w:t></w:r>'
+              '<w:fldSimple w:instr=" PAGE "><w:r><w:t>1</w:t></w:r></w:fldSimple></w:p></w:ftr>')
+    rels = ('<?xml version="1.0"?><Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rIdH" Type="x/header" Target="header1.xml"/>'
+            '<Relationship Id="rIdF" Type="x/footer" Target="footer1.xml"/></Relationships>')
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as docx_zip:
+        docx_zip.writestr('word/document.xml', document)
+        docx_zip.writestr('word/header1.xml', header)
+        docx_zip.writestr('word/footer1.xml', footer)
+        docx_zip.writestr('word/_rels/document.xml.rels', rels)
+
+def layout_signature(doc, workers):
+    ctx = _make_context(None)
+    return [(model.number, model.width, model.height,
+             [(line.x, line.y, len(line.spans)) for line in model.lines])
+            for model in _iter_document_models(doc, ctx, workers)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sections', type=int, default=12)
+    parser.add_argument('--paragraphs', type=int, default=150)
+    parser.add_argument('--workers', type=int)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        docx_path = os.path.join(tmp, 'relatorio.docx')
+        make_report(docx_path, args.sections, args.paragraphs)
+        doc = parse_docx(docx_path)
+        print(f"{len(doc.sections)} seções, {len(doc.body)} parágrafos")
+
+        print(f"{'modo':<18} {'tempo (s)':>10} {'páginas':>8}")
+        for name, workers in (('layout sequencial', 1), ('layout paralelo', args.workers)):
+            start = time.perf_counter()
+            stats = render(doc, NullBackend(count_ops=False), section_workers=workers)
+            print(f"{name:<18} {time.perf_counter() - start:>10.2f} {stats.pages:>8}")
+
+        output = os.path.join(tmp, 'relatorio.pdf')
+        start = time.perf_counter()
+        stats = render_to_pdf(doc, output, section_workers=args.workers)
+        print(f"{'pdf':<18} {time.perf_counter() - start:>10.2f} {stats.pages:>8}")
+
+        same = layout_signature(doc, 1) == layout_signature(doc, args.workers)
+        with fitz.open(output) as pdf_doc:
+            sizes = sorted({(round(page.rect.width), round(page.rect.height)) for page in pdf_doc})
+        print(f"layouts iguais: {'sim' if same else 'NÃO'}; tamanhos de página: {sizes}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark do índice de texto: gravado durante o desenho x extraído do PDF depois.
+
+Renderiza o documento sem e com 'text_index_path' (o custo extra do índice)
+e mede a segunda passada que o indexador fazia antes: reabrir o PDF e
+extrair as palavras com get_text('words'). Confere também que cada palavra
+extraída cai dentro da caixa de algum trecho do índice na mesma página.
+
+Uso:
+    python benchmarks/bench_text_index.py [documento.docx] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+import fitz
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pydocx_render.core.parser import parse_docx
+from pydocx_render.renderer import render_to_pdf
+from pydocx_render.text_index import iter_text_index
+
+def best_of(repeat, run):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def extract_words(pdf_path):
+    with fitz.open(pdf_path) as pdf_doc:
+        return [(page.number + 1, word) for page in pdf_doc for word in page.get_text('words')]
+
+def covered(words, index_path, tolerance=1.0):
+    """Fração das palavras extraídas cujo centro cai numa caixa do índice."""
+    boxes = defaultdict(list)
+    for record in iter_text_index(index_path):
+        boxes[record['page']].append(record['bbox'])
+    hits = 0
+    for page, (x0, y0, x1, y1, *_rest) in words:
+        cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+        if any(bx0 - tolerance <= cx <= bx1 + tolerance and by0 - tolerance <= cy <= by1 + tolerance
+               for bx0, by0, bx1, by1 in boxes[page]):
+            hits += 1
+    return hits / len(words) if words else 1.0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('document', nargs='?', default=os.path.join(ROOT, 'documents', 'FlowScript.docx'))
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    doc = parse_docx(args.document)
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = os.path.join(tmp, 'saida.pdf')
+        index_path = os.path.join(tmp, 'saida.jsonl')
+        plain_s = best_of(args.repeat, lambda: render_to_pdf(doc, pdf_path))
+        index_s = best_of(args.repeat, lambda: render_to_pdf(doc, pdf_path, text_index_path=index_path))
+        extract_s = best_of(args.repeat, lambda: extract_words(pdf_path))
+
+        words = extract_words(pdf_path)
+        records = sum(1 for _ in iter_text_index(index_path))
+        print(f"{'render sem índice':<22} {plain_s:>8.3f}s")
+        print(f"{'render com índice':<22} {index_s:>8.3f}s  (+{(index_s - plain_s) * 1000:.1f}ms)")
+        print(f"{'extração do PDF':<22} {extract_s:>8.3f}s")
+        print(f"índice: {records} trechos, {os.path.getsize(index_path) / 1024:.1f} KB; "
+              f"palavras do PDF cobertas: {covered(words, index_path):.1%}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark do memo de larguras: layout com e sem o WIDTH_MEMO.
+
+Gera um texto com vocabulário de distribuição Zipf e diagrama os parágrafos
+(layout_paragraph, sem desenho) com o memo ligado e desligado, em dois casos
+em que medir é caro: o modo rascunho no motor Python puro (soma em Python)
+e, no motor Cython, palavras com caracteres fora do BMP (símbolos
+matemáticos), que o caminho rápido em C não mede.
+Mostra o tempo, a taxa de acertos do memo (FontMetrics.memo_stats) e confere
+que as linhas saem iguais.
+
+Uso:
+    python benchmarks/bench_width_memo.py [--paragraphs 2000] [--vocabulary 20000] [--capacity 16384] [--repeat 3]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pydocx_render.core.dom import Run
+from pydocx_render.layout import line_breaker_pure
+from pydocx_render.layout.width_memo import DEFAULT_CAPACITY, WIDTH_MEMO
+from pydocx_render.renderer import _make_context, layout_paragraph
+
+SYLLABLES = ['ca', 'sa', 'de', 'ra', 'men', 'to', 'pro', 'ces', 'so', 'li', 'vro', 'ção', 'par', 'te']
+# Fora do BMP: o caminho rápido em C para neles e a medida volta ao Python
+SYMBOLS = '𝑥𝑦𝑧𝜋𝜆𝟙'
+
+def make_vocabulary(size, symbols, rng):
+    words = set()
+    while len(words) < size:
+        word = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 4)))
+        if symbols and rng.random() < 0.5:
+            word = rng.choice(SYMBOLS) + word
+        words.add(word)
+    return sorted(words)
+
+def make_paragraphs(count, vocabulary, rng):
+    # Zipf: o peso da palavra de posição r é 1/r
+    weights = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+    return [[Run(text=' '.join(rng.choices(vocabulary, weights, k=80)))] for _ in range(count)]
+
+def run_layout(layout, paragraphs, metrics, capacity, repeat):
+    """Melhor tempo de 'repeat' rodadas, cada uma com o memo vazio."""
+    best = None
+    for _ in range(repeat):
+        WIDTH_MEMO.resize(capacity)
+        start = time.perf_counter()
+        lines = [[(span.x, span.width) for line in layout(runs, metrics, 495.0, 11)
+                  for span in line.spans] for runs in paragraphs]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, lines, metrics.memo_stats()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--paragraphs', type=int, default=2000)
+    parser.add_argument('--vocabulary', type=int, default=20000)
+    parser.add_argument('--capacity', type=int, default=DEFAULT_CAPACITY)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(47)
+    cases = [('rascunho (puro)', line_breaker_pure.layout_paragraph,
+              line_breaker_pure.FontMetrics('Helvetica'), False)]
+    cython_ctx = _make_context(None)
+    if not isinstance(cython_ctx.metrics, line_breaker_pure.FontMetrics):
+        cases.append(('fora do BMP', layout_paragraph, cython_ctx.metrics, True))
+
+    print(f"{'caso':<16} {'sem memo (s)':>12} {'com memo (s)':>12} {'acertos':>8} {'iguais':>7}")
+    for name, layout, metrics, symbols in cases:
+        paragraphs = make_paragraphs(args.paragraphs, make_vocabulary(args.vocabulary, symbols, rng), rng)
+        plain_s, plain_lines, _ = run_layout(layout, paragraphs, metrics, 0, args.repeat)
+        memo_s, memo_lines, stats = run_layout(layout, paragraphs, metrics, args.capacity, args.repeat)
+        print(f"{name:<16} {plain_s:>12.3f} {memo_s:>12.3f} {stats.hit_rate:>8.1%} "
+              f"{'sim' if plain_lines == memo_lines else 'NÃO':>7}")
+        print(f"  {stats}")
+    WIDTH_MEMO.resize(DEFAULT_CAPACITY)
+
+if __name__ == '__main__':
+    main()
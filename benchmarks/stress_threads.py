@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Teste de estresse do uso concorrente: render_to_pdf em várias threads.
+
+Renderiza os documentos em sequência (referência) e depois todos ao mesmo
+tempo num ThreadPoolExecutor, comparando o texto de cada página. Em seguida
+várias threads medem as mesmas palavras com um único FontMetrics
+compartilhado e as larguras precisam bater com as da medição sequencial.
+
+Uso:
+    python benchmarks/stress_threads.py [arquivo.docx ...] [--threads 8] [--rounds 3]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import fitz
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pydocx_render.core.parser import parse_docx
+from pydocx_render.renderer import FontMetrics, find_fallback_fonts, find_font_file, render_to_pdf
+
+def page_texts(pdf_path):
+    with fitz.open(pdf_path) as pdf:
+        return [page.get_text() for page in pdf]
+
+def render_job(job):
+    dom, output_path = job
+    render_to_pdf(dom, output_path)
+    return page_texts(output_path)
+
+def stress_render(docs, tmp, threads, rounds):
+    baseline = [render_job((dom, os.path.join(tmp, f'seq_{i}.pdf'))) for i, dom in enumerate(docs)]
+
+    jobs = [(dom, os.path.join(tmp, f'par_{r}_{i}.pdf'))
+            for r in range(rounds) for i, dom in enumerate(docs)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(render_job, jobs))
+    elapsed = time.perf_counter() - start
+
+    failures = sum(1 for k, texts in enumerate(results) if texts != baseline[k % len(docs)])
+    print(f"render: {len(jobs)} PDFs em {threads} threads, {elapsed:.2f}s, divergências={failures}")
+    return failures
+
+def stress_metrics(docs, threads, rounds):
+    regular = find_font_file('regular')
+    fallback = [path for path in find_fallback_fonts() if path != regular]
+    metrics = FontMetrics(regular, fallback)
+
+    words = sorted({word for dom in docs for para in dom.body for run in para.runs
+                    for word in run.text.split()})
+    sizes = (8, 11, 14, 24)
+    expected = [metrics.get_text_width(word, size) for size in sizes for word in words]
+
+    def measure(_):
+        return [metrics.get_text_width(word, size) for size in sizes for word in words]
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(measure, range(threads * rounds)))
+
+    failures = sum(1 for widths in results if widths != expected)
+    print(f"métricas: {len(results)} passadas de {len(expected)} medições, divergências={failures}")
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('files', nargs='*', default=[os.path.join(ROOT, 'documents', 'FlowScript.docx')])
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+
+    docs = [parse_docx(path) for path in args.files]
+    with tempfile.TemporaryDirectory() as tmp:
+        failures = stress_render(docs, tmp, args.threads, args.rounds)
+    failures += stress_metrics(docs, args.threads, args.rounds)
+    print("OK" if not failures else "FALHOU")
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
@@ -9,6 +9,8 @@ def main():
     print(f"Parsing '{input_file}'...")
     dom = parse_docx(input_file)
     print("DOM criado com sucesso.")
+    if dom.normalization is not None:
+        print(f"Normalização: {dom.normalization}")
 
     print(f"Rendering to '{output_file}'...")
     render_to_pdf(dom, output_file)
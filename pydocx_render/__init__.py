@@ -0,0 +1,2 @@
+# pydocx_render/__init__.py
+__version__ = "0.1.0"
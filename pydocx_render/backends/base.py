@@ -0,0 +1,22 @@
+# pydocx_render/backends/base.py
+# Interface dos destinos de renderização.
+#
+# O renderizador só produz PageModel; quem transforma as páginas em alguma
+# coisa (PDF, imagens, contagens) é o backend. renderer.render() chama start()
+# uma vez, draw_page() para cada página, na ordem, e close() no fim. cleanup()
+# roda sempre, mesmo depois de um erro, para liberar o que ficou aberto.
+
+class OutputBackend:
+    def start(self, ctx):
+        """Recebe o contexto de layout (fontes, métricas, modo rascunho)."""
+        self.ctx = ctx
+
+    def draw_page(self, model):
+        raise NotImplementedError
+
+    def close(self):
+        """Conclui a saída e devolve um renderer.RenderStats."""
+        raise NotImplementedError
+
+    def cleanup(self):
+        pass
@@ -0,0 +1,51 @@
+# pydocx_render/backends/null.py
+# Backend nulo: não desenha nada, só conta.
+#
+# Serve para medir o layout sem pagar o desenho do PDF e para contar páginas.
+# Com count_ops=True as linhas são decompostas nas mesmas TextOp que o backend
+# PDF desenharia (inclusive a divisão por fonte de fallback).
+
+from dataclasses import dataclass
+from ..memory import peak_rss_mb
+from ..renderer import RenderStats, _text_ops
+from .base import OutputBackend
+
+@dataclass
+class OperationCounts:
+    pages: int = 0
+    lines: int = 0
+    # Chamadas de texto que o backend PDF faria, e seus caracteres
+    text_ops: int = 0
+    characters: int = 0
+    # Cabeçalho/rodapé: desenhados uma vez; os campos PAGE, página a página
+    furniture_ops: int = 0
+    field_ops: int = 0
+
+class NullBackend(OutputBackend):
+    def __init__(self, count_ops: bool = True):
+        self.count_ops = count_ops
+        self.counts = OperationCounts()
+        self._furniture = None
+
+    def draw_page(self, model):
+        counts = self.counts
+        counts.pages += 1
+        counts.lines += len(model.lines)
+        if not self.count_ops:
+            return
+        ctx = self.ctx
+        for line in model.lines:
+            for op in _text_ops(line, ctx):
+                counts.text_ops += 1
+                counts.characters += len(op.text)
+        if model.furniture and self._furniture is not model.furniture:
+            self._furniture = model.furniture
+            for line in model.furniture:
+                counts.furniture_ops += sum(1 for _ in _text_ops(line, ctx))
+        for line in model.furniture:
+            for span in line.spans:
+                if span.run.field_code:
+                    counts.field_ops += 1
+
+    def close(self) -> RenderStats:
+        return RenderStats(pages=self.counts.pages, parts=0, peak_rss_mb=peak_rss_mb())
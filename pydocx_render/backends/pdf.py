@@ -0,0 +1,54 @@
+# pydocx_render/backends/pdf.py
+# Backend PyMuPDF: o PDF de render_to_pdf.
+
+from typing import Optional
+from ..renderer import _FITZ_LOCK, RenderStats, _PdfWriter, _Stamps, _draw_page
+from ..text_index import TextIndexWriter
+from .base import OutputBackend
+
+class PdfBackend(OutputBackend):
+    """PDF em output_path, com o modo de memória limitada de _PdfWriter.
+
+    Cabeçalho e rodapé são carimbados como Form XObject (_FurnitureStamp),
+    um por seção. Com 'text_index_path' grava também o índice de posições do
+    texto (text_index.TextIndexWriter) enquanto desenha.
+    """
+
+    def __init__(self, output_path: str, pages_per_chunk: Optional[int] = None,
+                 memory_limit_mb: Optional[float] = None,
+                 text_index_path: Optional[str] = None):
+        self.writer = _PdfWriter(output_path, pages_per_chunk, memory_limit_mb)
+        self.stamps = None
+        self.text_index = TextIndexWriter(text_index_path) if text_index_path else None
+
+    def start(self, ctx):
+        super().start(ctx)
+        self.stamps = _Stamps(ctx)
+
+    def draw_page(self, model):
+        # O prazo segue o do contexto: em on_timeout='partial' render o retira
+        # para entregar a página de aviso e gravar as páginas prontas
+        self.writer.deadline = self.ctx.deadline
+        page = self.writer.new_page(model.width, model.height)
+        with _FITZ_LOCK:
+            self.stamps.apply(page, model)
+            _draw_page(page, model, self.ctx)
+        if self.text_index is not None:
+            self.text_index.write_page(model, self.ctx)
+
+    def close(self) -> RenderStats:
+        self.writer.deadline = self.ctx.deadline
+        stats = self.writer.close()
+        if self.text_index is not None:
+            self.text_index.close()
+            self.text_index = None
+        return stats
+
+    def cleanup(self):
+        self.writer.cleanup()
+        if self.stamps is not None:
+            self.stamps.close()
+            self.stamps = None
+        if self.text_index is not None:
+            self.text_index.cleanup()
+            self.text_index = None
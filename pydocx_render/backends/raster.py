@@ -0,0 +1,137 @@
+# pydocx_render/backends/raster.py
+# Backend de imagens: desenha as páginas direto em PIL.Image, sem passar por PDF.
+#
+# Cada página é desenhada numa thread de um pool, em paralelo com o layout das
+# seguintes. Como no backend PDF, cabeçalho e rodapé são desenhados uma única
+# vez numa imagem de fundo; cada página começa como cópia dela e só os campos
+# PAGE são desenhados por página.
+#
+# Um FreeTypeFont do Pillow guarda um FT_Face, que não pode ser usado por duas
+# threads ao mesmo tempo: as fontes ficam num cache por thread, como o
+# FACE_POOL de layout/advance_tables.
+
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+from PIL import Image, ImageDraw, ImageFont
+from ..memory import peak_rss_mb
+from ..renderer import PlacedLine, RenderStats, _text_ops, find_font_file
+from .base import OutputBackend
+
+# Escala de cinza: texto preto em fundo branco
+MODE = 'L'
+BACKGROUND = 255
+INK = 0
+
+class RasterBackend(OutputBackend):
+    """Uma imagem por página.
+
+    'output_path' é um padrão com {page} (ex.: 'previa/pagina_{page:03d}.png');
+    com None as imagens ficam em self.images (número da página -> PIL.Image).
+    No modo rascunho as fontes base-14 são trocadas pelos arquivos de
+    find_font_file (Arial/Liberation Sans têm as larguras da Helvetica).
+    """
+
+    def __init__(self, output_path: Optional[str] = None, dpi: float = 96,
+                 workers: Optional[int] = None, max_pending: Optional[int] = None):
+        self.output_path = output_path
+        self.scale = dpi / 72.0
+        self.workers = workers or os.cpu_count() or 1
+        # Páginas desenhadas ou na fila ao mesmo tempo (limita a memória)
+        self.max_pending = max_pending or 2 * self.workers
+        self.images: Dict[int, Image.Image] = {}
+        self.pages = 0
+        self._pending = deque()
+        self._executor = None
+        self._fonts = threading.local()
+        self._backgrounds = {}
+
+    def start(self, ctx):
+        super().start(ctx)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                            thread_name_prefix='raster')
+
+    def _font(self, style: str, font_index: int, size: float):
+        cache = getattr(self._fonts, 'cache', None)
+        if cache is None:
+            cache = self._fonts.cache = {}
+        key = (style, font_index, size)
+        font = cache.get(key)
+        if font is None:
+            if font_index:
+                path = self.ctx.fallback_fonts[font_index - 1]
+            else:
+                path = find_font_file(style)
+            # BASIC: avanços do próprio FreeType, sem kerning, como no PDF
+            font = cache[key] = ImageFont.truetype(path, size * self.scale,
+                                                   layout_engine=ImageFont.Layout.BASIC)
+        return font
+
+    def _draw_line(self, draw, line, page_number=None):
+        scale = self.scale
+        for op in _text_ops(line, self.ctx, page_number):
+            try:
+                font = self._font(op.style, op.font_index, op.size)
+            except FileNotFoundError as e:
+                print(f"ERRO DE FONTE: {e}, pulando run.")
+                continue
+            draw.text((op.x * scale, op.y * scale), op.text, font=font, fill=INK, anchor='ls')
+
+    def _background(self, model):
+        """(página em branco com cabeçalho e rodapé, linhas só com os campos), uma por seção."""
+        key = (id(model.furniture), model.width, model.height)
+        cached = self._backgrounds.get(key)
+        # O id pode ter sido reaproveitado por outra lista depois de uma seção terminar
+        if cached is None or cached[0] is not model.furniture:
+            size = (round(model.width * self.scale), round(model.height * self.scale))
+            background = Image.new(MODE, size, BACKGROUND)
+            draw = ImageDraw.Draw(background)
+            field_lines = []
+            for line in model.furniture:
+                self._draw_line(draw, line)
+                spans = [span for span in line.spans if span.run.field_code]
+                if spans:
+                    field_lines.append(PlacedLine(x=line.x, y=line.y, spans=spans))
+            cached = self._backgrounds[key] = (model.furniture, background, field_lines)
+        return cached[1:]
+
+    def _render(self, model, background, field_lines) -> Image.Image:
+        image = background.copy()
+        draw = ImageDraw.Draw(image)
+        for line in field_lines:
+            self._draw_line(draw, line, model.number)
+        for line in model.lines:
+            self._draw_line(draw, line)
+        if self.output_path is not None:
+            image.save(self.output_path.format(page=model.number))
+        return image
+
+    def draw_page(self, model):
+        # O fundo é montado aqui, na thread do renderizador, antes de despachar
+        background, field_lines = self._background(model)
+        if len(self._pending) >= self.max_pending:
+            self._collect(self._pending.popleft())
+        future = self._executor.submit(self._render, model, background, field_lines)
+        self._pending.append((model.number, future))
+
+    def _collect(self, pending):
+        number, future = pending
+        image = future.result()
+        self.pages += 1
+        if self.output_path is None:
+            self.images[number] = image
+
+    def close(self) -> RenderStats:
+        while self._pending:
+            self._collect(self._pending.popleft())
+        return RenderStats(pages=self.pages, parts=self.pages if self.output_path else 0,
+                           peak_rss_mb=peak_rss_mb())
+
+    def cleanup(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self._pending.clear()
+        self._backgrounds.clear()
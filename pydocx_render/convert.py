@@ -0,0 +1,28 @@
+# pydocx_render/convert.py
+# Ponto de entrada de alto nível: .docx -> PDF, com cache de resultado opcional.
+
+from .core.parser import parse_docx
+from .renderer import render_to_pdf
+
+def convert_docx(input_path: str, output_path: str, cache=None, deadline=None,
+                 **render_options) -> bool:
+    """Converte um .docx em PDF. Devolve True quando o PDF veio do OutputCache.
+
+    Com 'text_index_path' (ver render_to_pdf) o documento é sempre
+    renderizado, porque o índice de texto sai do desenho; o PDF ainda é
+    guardado no cache. 'deadline' (deadline.Deadline) vale para o parse e o
+    desenho juntos; um PDF truncado (on_timeout='partial') não entra no cache.
+    """
+    if cache is not None:
+        # O caminho do índice não muda o PDF: fica fora da chave
+        key = cache.key_for(input_path, {name: value for name, value in render_options.items()
+                                         if name != 'text_index_path'})
+        if render_options.get('text_index_path') is None and cache.fetch(key, output_path):
+            return True
+
+    doc = parse_docx(input_path, deadline=deadline)
+    stats = render_to_pdf(doc, output_path, deadline=deadline, **render_options)
+
+    if cache is not None and stats.truncated is None:
+        cache.store(key, output_path)
+    return False
@@ -1,17 +1,64 @@
 # pydocx_render/core/dom.py
 from dataclasses import dataclass, field
-from typing import List
+from typing import TYPE_CHECKING, List, Optional
+
+if TYPE_CHECKING:
+    from .normalize import NormalizationStats
 
 @dataclass
 class Run:
     text: str
     is_bold: bool = False
     is_italic: bool = False
+    # Tamanho em pontos (w:sz); None = tamanho padrão do renderizador
+    size: Optional[float] = None
+    # Campo que o renderizador preenche por página ('PAGE'); o texto é o
+    # último resultado gravado pelo Word
+    field_code: Optional[str] = None
 
 @dataclass
 class Paragraph:
     runs: List[Run] = field(default_factory=list)
+    # 'left', 'center', 'right' ou 'justify' (lido de w:pPr/w:jc)
+    alignment: str = 'left'
+
+# Valores de Section.start (w:type)
+SECTION_STARTS = ('nextPage', 'continuous', 'evenPage', 'oddPage')
+
+@dataclass
+class Section:
+    """Geometria das páginas de uma seção (w:sectPr), em pontos.
+
+    A seção cobre Document.body[início:end]; o início é o 'end' da seção
+    anterior (0 na primeira). Os valores padrão são os do renderizador para
+    documentos sem w:sectPr: A4, margens de 50 pt.
+    """
+    end: int = 0
+    page_width: float = 595.0
+    page_height: float = 842.0
+    # 'portrait' ou 'landscape' (w:pgSz/@w:orient)
+    orientation: str = 'portrait'
+    margin_top: float = 50.0
+    margin_right: float = 50.0
+    margin_bottom: float = 50.0
+    margin_left: float = 50.0
+    # Distância da borda até o topo do cabeçalho e até a base do rodapé
+    header_distance: float = 25.0
+    footer_distance: float = 25.0
+    # Como a seção começa (w:type), um de SECTION_STARTS
+    start: str = 'nextPage'
+    # Cabeçalho e rodapé da seção (já com a herança das seções anteriores);
+    # None = os do Document
+    header: Optional[List[Paragraph]] = None
+    footer: Optional[List[Paragraph]] = None
 
 @dataclass
 class Document:
-    body: List[Paragraph] = field(default_factory=list)
\ No newline at end of file
+    body: List[Paragraph] = field(default_factory=list)
+    # Preenchido por parse_docx quando a normalização está ativa.
+    normalization: Optional['NormalizationStats'] = None
+    # Cabeçalho e rodapé da última seção; valem para as seções sem os seus
+    header: List[Paragraph] = field(default_factory=list)
+    footer: List[Paragraph] = field(default_factory=list)
+    # Seções em ordem; vazia = uma seção só, com a geometria padrão
+    sections: List[Section] = field(default_factory=list)
@@ -0,0 +1,313 @@
+# pydocx_render/core/dom_cache.py
+# Cache em disco do DOM já analisado, num formato binário compacto.
+#
+# Re-renderizar o mesmo .docx com outras configurações de página não deveria
+# pagar de novo a descompressão do zip e o parsing do XML. A chave é um hash
+# dos bytes comprimidos de word/document.xml, word/styles.xml, das relações e
+# dos cabeçalhos/rodapés, lidos direto do zip (sem inflate), e o Document é
+# gravado assim:
+#
+#   cabeçalho   struct HEADER (magic, versão, contagens, estatísticas)
+#   partes      uint32[n_parts]       número de parágrafos de cada cabeçalho/rodapé;
+#                                     as duas primeiras são Document.header e .footer
+#   parágrafos  uint32[n_paragraphs]  número de runs de cada parágrafo (corpo,
+#                                     depois as partes, em ordem)
+#   alinhamento uint8[n_paragraphs]   índice em ALIGNMENTS
+#   runs        uint32[n_runs]        offset (em caracteres) do fim de cada run
+#   estilos     uint8[n_runs]         bit 0 = negrito, bit 1 = itálico
+#   tamanhos    uint16[n_runs]        meios pontos (w:sz); 0 = tamanho padrão
+#   campos      uint8[n_runs]         1 + índice em FIELD_CODES; 0 = texto comum
+#   seções      struct SECTION[n_sections]  fim, geometria (pt), início e partes
+#                                           (cabeçalho, rodapé) de cada seção
+#   texto       UTF-8 com o texto de todas as runs concatenado
+#
+# A leitura usa mmap e não copia as tabelas: depois de o tamanho do arquivo ser
+# conferido com o cabeçalho, cada tabela é uma view (memoryview.cast) sobre as
+# páginas mapeadas e o texto é decodificado direto delas, de uma vez só, sendo
+# depois fatiado por run. Todas as views são soltas no fim, inclusive depois de
+# um erro, para que o mmap possa ser fechado. Só em máquinas big-endian as
+# tabelas de inteiros são copiadas, para inverter os bytes.
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import zipfile
+from array import array
+from typing import Optional
+from ..disk_cache import atomic_write, evict_lru, touch
+from .dom import SECTION_STARTS, Document, Paragraph, Run, Section
+from .headers import FIELD_CODES
+from .normalize import NormalizationStats
+
+MAGIC = b'PDXD'
+FORMAT_VERSION = 6
+# magic, versão, flags, n_paragraphs, n_runs, n_text_bytes, runs_before, runs_after,
+# n_parts, n_sections
+HEADER = struct.Struct('<4sHHIIQIIII')
+# fim, largura, altura, margens (topo, direita, base, esquerda), distâncias do
+# cabeçalho e do rodapé, paisagem, índice em SECTION_STARTS, partes do
+# cabeçalho e do rodapé (NO_PART = Section.header/footer None)
+SECTION = struct.Struct('<IddddddddBBHH')
+NO_PART = 0xFFFF
+
+FLAG_NORMALIZED = 0x1
+STYLE_BOLD = 0x1
+STYLE_ITALIC = 0x2
+ALIGNMENTS = ('left', 'center', 'right', 'justify')
+_ALIGNMENT_INDEX = {name: index for index, name in enumerate(ALIGNMENTS)}
+_FIELD_INDEX = {code: index + 1 for index, code in enumerate(FIELD_CODES)}
+
+CACHE_SUFFIX = '.pdom'
+KEY_MEMBERS = ('word/document.xml', 'word/styles.xml', 'word/_rels/document.xml.rels')
+
+_LITTLE_ENDIAN = sys.byteorder == 'little'
+
+def _update_with_raw_member(digest, docx_file, docx_zip, name):
+    """Alimenta o hash com os bytes comprimidos de um membro do zip."""
+    try:
+        info = docx_zip.getinfo(name)
+    except KeyError:
+        digest.update(b'\0missing:' + name.encode('utf-8'))
+        return
+
+    digest.update(struct.pack('<IQQ', info.CRC, info.file_size, info.compress_size))
+    # O cabeçalho local tem 30 bytes fixos + nome + campo extra
+    docx_file.seek(info.header_offset + 26)
+    name_len, extra_len = struct.unpack('<HH', docx_file.read(4))
+    docx_file.seek(info.header_offset + 30 + name_len + extra_len)
+
+    remaining = info.compress_size
+    while remaining:
+        chunk = docx_file.read(min(remaining, 1 << 20))
+        if not chunk:
+            break
+        digest.update(chunk)
+        remaining -= len(chunk)
+
+def document_key(file_path: str, normalize: bool = True) -> str:
+    """Chave de cache do .docx: conteúdo de document.xml, styles.xml, das relações e dos cabeçalhos/rodapés."""
+    digest = hashlib.sha256()
+    digest.update(struct.pack('<HB', FORMAT_VERSION, bool(normalize)))
+    with open(file_path, 'rb') as docx_file:
+        with zipfile.ZipFile(docx_file, 'r') as docx_zip:
+            parts = sorted(name for name in docx_zip.namelist()
+                           if name.startswith(('word/header', 'word/footer')))
+            for name in (*KEY_MEMBERS, *parts):
+                _update_with_raw_member(digest, docx_file, docx_zip, name)
+    return digest.hexdigest()
+
+def _to_le_bytes(values: array) -> bytes:
+    if not _LITTLE_ENDIAN:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+def _parts(doc: Document):
+    """Cabeçalhos e rodapés distintos (por identidade): os do Document e os das seções."""
+    parts = [doc.header, doc.footer]
+    index = {id(doc.header): 0, id(doc.footer): 1}
+    for section in doc.sections:
+        for part in (section.header, section.footer):
+            if part is not None and id(part) not in index:
+                index[id(part)] = len(parts)
+                parts.append(part)
+    return parts, index
+
+def dump_document(doc: Document) -> bytes:
+    """Serializa o Document no formato binário do cache."""
+    parts, part_index = _parts(doc)
+    part_counts = array('I', [len(part) for part in parts])
+    run_counts = array('I')
+    alignments = bytearray()
+    run_ends = array('I')
+    styles = bytearray()
+    sizes = array('H')
+    fields = bytearray()
+    texts = []
+    offset = 0
+
+    for para in (*doc.body, *(para for part in parts for para in part)):
+        run_counts.append(len(para.runs))
+        alignments.append(_ALIGNMENT_INDEX.get(para.alignment, 0))
+        for run in para.runs:
+            offset += len(run.text)
+            run_ends.append(offset)
+            styles.append((STYLE_BOLD if run.is_bold else 0) |
+                          (STYLE_ITALIC if run.is_italic else 0))
+            sizes.append(round(run.size * 2) if run.size else 0)
+            fields.append(_FIELD_INDEX.get(run.field_code, 0))
+            texts.append(run.text)
+
+    sections = b''.join(
+        SECTION.pack(section.end, section.page_width, section.page_height,
+                     section.margin_top, section.margin_right, section.margin_bottom,
+                     section.margin_left, section.header_distance, section.footer_distance,
+                     section.orientation == 'landscape', SECTION_STARTS.index(section.start),
+                     NO_PART if section.header is None else part_index[id(section.header)],
+                     NO_PART if section.footer is None else part_index[id(section.footer)])
+        for section in doc.sections)
+
+    text_bytes = ''.join(texts).encode('utf-8')
+    stats = doc.normalization
+    header = HEADER.pack(
+        MAGIC, FORMAT_VERSION,
+        FLAG_NORMALIZED if stats is not None else 0,
+        len(run_counts), len(run_ends), len(text_bytes),
+        stats.runs_before if stats is not None else 0,
+        stats.runs_after if stats is not None else 0,
+        len(parts), len(doc.sections),
+    )
+    return b''.join((header, _to_le_bytes(part_counts), _to_le_bytes(run_counts), bytes(alignments),
+                     _to_le_bytes(run_ends), bytes(styles), _to_le_bytes(sizes), bytes(fields),
+                     sections, text_bytes))
+
+def _table(view: memoryview, start: int, count: int, typecode: str, views: list):
+    """Tabela little-endian do buffer, sem cópia; as views criadas vão para 'views'."""
+    raw = view[start:start + struct.calcsize(typecode) * count]
+    views.append(raw)
+    if typecode == 'B':
+        return raw
+    if _LITTLE_ENDIAN:
+        table = raw.cast(typecode)
+        views.append(table)
+        return table
+    table = array(typecode)
+    table.frombytes(raw)
+    table.byteswap()
+    return table
+
+def _stored_size(n_paragraphs: int, n_runs: int, n_text_bytes: int, n_parts: int,
+                 n_sections: int) -> int:
+    """Tamanho do arquivo que o cabeçalho descreve."""
+    return (HEADER.size + 4 * n_parts + 5 * n_paragraphs + 8 * n_runs
+            + SECTION.size * n_sections + n_text_bytes)
+
+def load_document(buffer) -> Document:
+    """Reconstrói o Document a partir de um buffer (bytes ou mmap) do cache."""
+    view = memoryview(buffer)
+    # Fatias e casts de 'view' também prendem o mmap até serem soltos
+    views = []
+    try:
+        (magic, version, flags, n_paragraphs, n_runs, n_text_bytes,
+         runs_before, runs_after, n_parts, n_sections) = HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("Arquivo de cache de DOM inválido ou de outra versão.")
+        # Arquivo cortado ou com lixo no fim: fatias além do fim só voltariam curtas
+        if n_parts < 2 or len(view) != _stored_size(n_paragraphs, n_runs, n_text_bytes,
+                                                    n_parts, n_sections):
+            raise ValueError("Arquivo de cache de DOM truncado ou corrompido.")
+
+        pos = HEADER.size
+        part_counts = _table(view, pos, n_parts, 'I', views)
+        pos += 4 * n_parts
+        run_counts = _table(view, pos, n_paragraphs, 'I', views)
+        pos += 4 * n_paragraphs
+        alignments = _table(view, pos, n_paragraphs, 'B', views)
+        pos += n_paragraphs
+        run_ends = _table(view, pos, n_runs, 'I', views)
+        pos += 4 * n_runs
+        styles = _table(view, pos, n_runs, 'B', views)
+        pos += n_runs
+        sizes = _table(view, pos, n_runs, 'H', views)
+        pos += 2 * n_runs
+        fields = _table(view, pos, n_runs, 'B', views)
+        pos += n_runs
+        sections = []
+        section_parts = []
+        for index in range(n_sections):
+            (end, width, height, top, right, bottom, left, header_distance, footer_distance,
+             landscape, start, header_part, footer_part) = SECTION.unpack_from(
+                 view, pos + SECTION.size * index)
+            sections.append(Section(end, width, height, 'landscape' if landscape else 'portrait',
+                                    top, right, bottom, left, header_distance, footer_distance,
+                                    SECTION_STARTS[start]))
+            section_parts.append((header_part, footer_part))
+        pos += SECTION.size * n_sections
+        text_view = view[pos:pos + n_text_bytes]
+        views.append(text_view)
+        text = str(text_view, 'utf-8')
+
+        ends = run_ends.tolist()
+        if sum(run_counts) != n_runs or (ends and ends[-1] != len(text)):
+            raise ValueError("Arquivo de cache de DOM corrompido.")
+        starts = [0]
+        starts.extend(ends[:-1])
+        runs = [Run(text[start:end], bool(style & STYLE_BOLD), bool(style & STYLE_ITALIC),
+                    size / 2 if size else None, FIELD_CODES[field - 1] if field else None)
+                for start, end, style, size, field in zip(starts, ends, styles, sizes, fields)]
+
+        paragraphs = []
+        first = 0
+        for count, alignment in zip(run_counts, alignments):
+            paragraphs.append(Paragraph(runs=runs[first:first + count], alignment=ALIGNMENTS[alignment]))
+            first += count
+
+        n_body = n_paragraphs - sum(part_counts)
+        if n_body < 0:
+            raise ValueError("Arquivo de cache de DOM corrompido.")
+        parts = []
+        first = n_body
+        for count in part_counts:
+            parts.append(paragraphs[first:first + count])
+            first += count
+        for section, (header_part, footer_part) in zip(sections, section_parts):
+            section.header = None if header_part == NO_PART else parts[header_part]
+            section.footer = None if footer_part == NO_PART else parts[footer_part]
+
+        doc = Document(body=paragraphs[:n_body], header=parts[0], footer=parts[1],
+                       sections=sections)
+
+        if flags & FLAG_NORMALIZED:
+            doc.normalization = NormalizationStats(runs_before, runs_after)
+        return doc
+    finally:
+        # Solta as views antes de o mmap ser fechado
+        for table in reversed(views):
+            table.release()
+        view.release()
+
+class DomCache:
+    """Diretório de DOMs serializados com limite de tamanho (remove os menos usados)."""
+
+    def __init__(self, cache_dir: str, max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + CACHE_SUFFIX)
+
+    def load(self, key: str) -> Optional[Document]:
+        """Document guardado na chave; None se não houver ou se a entrada estiver danificada."""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as cache_file:
+                with mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    doc = load_document(mapped)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, IndexError, TypeError, BufferError, struct.error) as e:
+            # Entrada danificada: conta como falta e sai do diretório
+            print(f"AVISO: entrada do cache de DOM '{path}' descartada: {e}")
+            self.misses += 1
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+
+        touch(path)
+        self.hits += 1
+        return doc
+
+    def store(self, key: str, doc: Document):
+        data = dump_document(doc)
+        if len(data) > self.max_bytes:
+            return
+        atomic_write(self._path(key), data)
+        evict_lru(self.cache_dir, CACHE_SUFFIX, self.max_bytes)
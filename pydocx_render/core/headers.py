@@ -0,0 +1,177 @@
+# pydocx_render/core/headers.py
+# Cabeçalhos e rodapés (word/header*.xml e word/footer*.xml).
+#
+# Cada seção aponta para eles no seu w:sectPr, com w:headerReference/
+# w:footerReference (r:id -> word/_rels/document.xml.rels). Só a referência
+# 'default' é lida: é a que vale para todas as páginas da seção. Uma seção sem
+# referência herda a da seção anterior, como no Word, e cada parte é lida uma
+# vez só, compartilhada pelas seções que a usam. O campo PAGE vira uma run com field_code,
+# para o renderizador sobrepor o número de cada página; os demais campos ficam
+# com o último resultado gravado pelo Word, como texto comum.
+
+import posixpath
+from typing import Dict, List, Optional, Tuple
+from lxml import etree
+from .dom import Document, Paragraph
+from .normalize import merge_runs
+from .parser import NSMAP, W, paragraph_alignment, parse_run
+
+R_ID = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id'
+RELS_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+DOCUMENT_RELS = 'word/_rels/document.xml.rels'
+
+W_R = W + 'r'
+W_FLD_SIMPLE = W + 'fldSimple'
+W_FLD_CHAR = W + 'fldChar'
+W_INSTR_TEXT = W + 'instrText'
+W_HEADER_REFERENCE = W + 'headerReference'
+W_FOOTER_REFERENCE = W + 'footerReference'
+
+# Campos que o renderizador preenche página a página
+FIELD_CODES = ('PAGE',)
+
+def section_references(sect_pr) -> Dict[str, str]:
+    """r:id do cabeçalho e do rodapé 'default' de um w:sectPr."""
+    references = {}
+    if sect_pr is None:
+        return references
+    for node in sect_pr:
+        if node.tag == W_HEADER_REFERENCE:
+            kind = 'header'
+        elif node.tag == W_FOOTER_REFERENCE:
+            kind = 'footer'
+        else:
+            continue
+        if node.get(W + 'type', 'default') == 'default' and node.get(R_ID):
+            references[kind] = node.get(R_ID)
+    return references
+
+def read_relationships(docx_zip) -> Dict[str, str]:
+    """Id -> caminho no zip, a partir de document.xml.rels."""
+    try:
+        root = etree.fromstring(docx_zip.read(DOCUMENT_RELS))
+    except KeyError:
+        return {}
+    targets = {}
+    for rel in root.iter(RELS_NS + 'Relationship'):
+        target = rel.get('Target', '')
+        if rel.get('TargetMode') == 'External' or not target:
+            continue
+        if target.startswith('/'):
+            targets[rel.get('Id')] = target.lstrip('/')
+        else:
+            targets[rel.get('Id')] = posixpath.normpath(posixpath.join('word', target))
+    return targets
+
+def field_code(instr: str) -> Optional[str]:
+    """Código do campo ('PAGE') se o renderizador souber preenchê-lo."""
+    words = instr.split()
+    if words and words[0].upper() in FIELD_CODES:
+        return words[0].upper()
+    return None
+
+def parse_field_paragraph(p_node, classify=field_code) -> Paragraph:
+    """Como o parágrafo do corpo, mas reconhecendo w:fldSimple e campos complexos.
+
+    'classify' recebe a instrução do campo e devolve o field_code das runs do
+    resultado (None = texto comum).
+    """
+    para = Paragraph(alignment=paragraph_alignment(p_node))
+    state = None        # None, 'instr' ou 'result' dentro de um campo complexo
+    instr = []
+    current_code = None
+    field_run = None    # run que acumula o resultado do campo em andamento
+
+    def append(r_node, code):
+        nonlocal field_run
+        run = parse_run(r_node)
+        if run is None:
+            return
+        if code is None:
+            para.runs.append(run)
+        elif field_run is None:
+            run.field_code = code
+            field_run = run
+            para.runs.append(run)
+        else:
+            # O resultado de um campo pode vir em várias runs; vira uma só
+            field_run.text += run.text
+
+    for child in p_node:
+        if child.tag == W_FLD_SIMPLE:
+            code = classify(child.get(W + 'instr', ''))
+            for r_node in child.findall('w:r', NSMAP):
+                append(r_node, code)
+            field_run = None
+        elif child.tag == W_R:
+            fld_char = child.find(W_FLD_CHAR)
+            if fld_char is not None:
+                kind = fld_char.get(W + 'fldCharType')
+                if kind == 'begin':
+                    state, instr = 'instr', []
+                elif kind == 'separate':
+                    state, current_code = 'result', classify(''.join(instr))
+                elif kind == 'end':
+                    state, current_code, field_run = None, None, None
+                continue
+            if state == 'instr':
+                instr.extend(node.text or '' for node in child.iter(W_INSTR_TEXT))
+                continue
+            append(child, current_code)
+    return para
+
+def parse_part(xml_content: bytes, normalize: bool = True) -> List[Paragraph]:
+    """Parágrafos de um w:hdr ou w:ftr."""
+    root = etree.fromstring(xml_content)
+    paragraphs = []
+    for p_node in root.findall('w:p', NSMAP):
+        para = parse_field_paragraph(p_node)
+        if normalize:
+            para.runs = merge_runs(para.runs)
+        if para.runs:
+            paragraphs.append(para)
+    return paragraphs
+
+def load_section_furniture(docx_zip, references: List[Dict[str, str]],
+                           normalize: bool = True) -> List[Tuple[List[Paragraph], List[Paragraph]]]:
+    """(cabeçalho, rodapé) de cada seção, dadas as referências de cada uma, em ordem.
+
+    Sem referência de um tipo, a seção herda o da anterior (a primeira fica
+    sem). Seções que apontam para a mesma parte recebem a mesma lista.
+    """
+    targets = read_relationships(docx_zip) if any(references) else {}
+    loaded = {}
+    current = {'header': [], 'footer': []}
+    furniture = []
+    for section_references in references:
+        for kind in ('header', 'footer'):
+            r_id = section_references.get(kind)
+            if r_id is None:
+                continue
+            path = targets.get(r_id)
+            if path not in loaded:
+                try:
+                    loaded[path] = parse_part(docx_zip.read(path), normalize) if path else []
+                except KeyError:
+                    loaded[path] = []
+            current[kind] = loaded[path]
+        furniture.append((current['header'], current['footer']))
+    return furniture
+
+def load_headers_footers(docx_zip, references: Dict[str, str],
+                         normalize: bool = True) -> Tuple[List[Paragraph], List[Paragraph]]:
+    """(cabeçalho, rodapé) de um w:sectPr só; listas vazias quando não há."""
+    return load_section_furniture(docx_zip, [references], normalize)[0]
+
+def assign_furniture(doc: Document, docx_zip, references: List[Dict[str, str]],
+                     normalize: bool = True):
+    """Preenche o cabeçalho e o rodapé de cada seção de 'doc' e do próprio Document.
+
+    'references' tem as referências de cada seção de doc.sections, em ordem;
+    sem seções, só as do w:sectPr do corpo. Document.header/footer ficam com
+    os da última seção.
+    """
+    furniture = load_section_furniture(docx_zip, references, normalize)
+    for section, (header, footer) in zip(doc.sections, furniture):
+        section.header, section.footer = header, footer
+    doc.header, doc.footer = furniture[-1]
@@ -1,12 +1,106 @@
 # pydocx_render/core/parser.py
 import zipfile
+from typing import Optional
 from lxml import etree
 from .dom import Document, Paragraph, Run
+from .normalize import normalize_document
 
 NSMAP = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}
+W = '{%s}' % NSMAP['w']
+
+# Filhos de w:r que carregam texto. O Word grava tabulações e quebras como
+# elementos próprios, e uma run pode ter vários w:t.
+W_T = W + 't'
+W_TAB = W + 'tab'
+W_BR = W + 'br'
+W_CR = W + 'cr'
+
+_FALSE_VALUES = ('0', 'false', 'off')
+
+# Valores de w:jc -> alinhamento do Paragraph. 'start'/'end' são os nomes do
+# OOXML estrito; o que não estiver aqui é tratado como alinhado à esquerda.
+JC_ALIGNMENT = {
+    'left': 'left',
+    'start': 'left',
+    'center': 'center',
+    'right': 'right',
+    'end': 'right',
+    'both': 'justify',
+    'distribute': 'justify',
+}
+
+def is_toggle_on(rpr_node, tag: str) -> bool:
+    """Lê uma propriedade liga/desliga (w:b, w:i) respeitando w:val="0"."""
+    if rpr_node is None:
+        return False
+    node = rpr_node.find(tag, NSMAP)
+    if node is None:
+        return False
+    return node.get(W + 'val', 'true').lower() not in _FALSE_VALUES
+
+def run_size(rpr_node) -> Optional[float]:
+    """Tamanho da run em pontos. w:sz vem em meios pontos."""
+    if rpr_node is None:
+        return None
+    node = rpr_node.find('w:sz', NSMAP)
+    return half_points(node.get(W + 'val')) if node is not None else None
+
+def half_points(value) -> Optional[float]:
+    try:
+        half = int(value)
+    except (TypeError, ValueError):
+        return None
+    return half / 2 if half > 0 else None
+
+def run_text(r_node) -> str:
+    """Junta todo o conteúdo textual de uma run (w:t, w:tab, w:br, w:cr)."""
+    parts = []
+    for child in r_node:
+        tag = child.tag
+        if tag == W_T:
+            parts.append(child.text or "")
+        elif tag == W_TAB:
+            parts.append('\t')
+        elif tag == W_BR or tag == W_CR:
+            parts.append('\n')
+    return ''.join(parts)
+
+def paragraph_alignment(p_node) -> str:
+    """Alinhamento do parágrafo a partir de w:pPr/w:jc."""
+    jc = p_node.find('w:pPr/w:jc', NSMAP)
+    if jc is None:
+        return 'left'
+    return JC_ALIGNMENT.get(jc.get(W + 'val'), 'left')
+
+def parse_run(r_node) -> Optional[Run]:
+    """Run do DOM para um w:r, ou None se ela não tiver texto."""
+    text = run_text(r_node)
+    if not text:
+        return None
+    rpr = r_node.find('w:rPr', NSMAP)
+    return Run(text=text, is_bold=is_toggle_on(rpr, 'w:b'), is_italic=is_toggle_on(rpr, 'w:i'),
+               size=run_size(rpr))
+
+def parse_docx(file_path: str, normalize: bool = True, cache=None, deadline=None) -> Document:
+    # Com um DomCache, um documento já visto é carregado do disco sem parsing.
+    # Com um deadline.Deadline o prazo é conferido a cada parágrafo; vencido,
+    # levanta ConversionTimeout (o etree.fromstring em si não é interrompido:
+    # para XML enorme, parse_docx_sax confere a cada bloco lido)
+    # headers usa os auxiliares deste módulo (e dom_cache usa headers);
+    # importados aqui para evitar o ciclo
+    from .dom_cache import document_key
+    from .headers import assign_furniture, section_references
+    from .sections import parse_section
+
+    if cache is not None:
+        cache_key = document_key(file_path, normalize)
+        cached = cache.load(cache_key)
+        if cached is not None:
+            return cached
 
-def parse_docx(file_path: str) -> Document:
     doc = Document()
+    # Referências de cabeçalho/rodapé de cada seção, na ordem de doc.sections
+    references = []
 
     with zipfile.ZipFile(file_path, 'r') as docx_zip:
         xml_content = docx_zip.read('word/document.xml')
@@ -14,16 +108,33 @@ def parse_docx(file_path: str) -> Document:
         body = root.find('w:body', NSMAP)
 
         for p_node in body.findall('w:p', NSMAP):
-            para = Paragraph()
+            if deadline is not None:
+                deadline.check('parse', paragraphs=len(doc.body))
+            para = Paragraph(alignment=paragraph_alignment(p_node))
             for r_node in p_node.findall('w:r', NSMAP):
-                text_node = r_node.find('w:t', NSMAP)
-                if text_node is not None:
-                    text = text_node.text or ""
-                    is_bold = r_node.find('.//w:b', NSMAP) is not None
-                    is_italic = r_node.find('.//w:i', NSMAP) is not None
-                    para.runs.append(Run(text=text, is_bold=is_bold, is_italic=is_italic))
+                run = parse_run(r_node)
+                if run is not None:
+                    para.runs.append(run)
             
             if para.runs:
                 doc.body.append(para)
 
-    return doc
\ No newline at end of file
+            # Quebra de seção: o parágrafo é o último da seção
+            sect_pr = p_node.find('w:pPr/w:sectPr', NSMAP)
+            if sect_pr is not None:
+                doc.sections.append(parse_section(sect_pr, len(doc.body)))
+                references.append(section_references(sect_pr))
+
+        body_sect_pr = body.find('w:sectPr', NSMAP)
+        if body_sect_pr is not None or doc.sections:
+            doc.sections.append(parse_section(body_sect_pr, len(doc.body)))
+        references.append(section_references(body_sect_pr))
+        assign_furniture(doc, docx_zip, references, normalize)
+
+    if normalize:
+        doc.normalization = normalize_document(doc)
+
+    if cache is not None:
+        cache.store(cache_key, doc)
+
+    return doc
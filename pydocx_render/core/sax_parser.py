@@ -0,0 +1,238 @@
+# pydocx_render/core/sax_parser.py
+# Backend de parsing alternativo baseado na interface "parser target" do lxml.
+#
+# Em vez de materializar a árvore de elementos e percorrê-la com find/findall,
+# os callbacks start/end/data constroem diretamente os objetos Paragraph/Run.
+# O XML é alimentado em blocos a partir do zip, então a memória fica
+# proporcional ao DOM gerado e não ao tamanho do document.xml.
+
+import zipfile
+from typing import Iterator
+from lxml import etree
+from .dom import Document, Paragraph, Run
+from .headers import R_ID, W_FOOTER_REFERENCE, W_HEADER_REFERENCE, assign_furniture
+from .normalize import merge_runs, normalize_document
+from .parser import W, W_T, W_TAB, W_BR, W_CR, JC_ALIGNMENT, _FALSE_VALUES, half_points
+from .sections import W_PG_MAR, W_PG_SZ, section_from_attributes
+
+W_BODY = W + 'body'
+W_P = W + 'p'
+W_R = W + 'r'
+W_RPR = W + 'rPr'
+W_PPR = W + 'pPr'
+W_JC = W + 'jc'
+W_B = W + 'b'
+W_I = W + 'i'
+W_SZ = W + 'sz'
+W_VAL = W + 'val'
+W_TYPE = W + 'type'
+W_SECTPR = W + 'sectPr'
+
+# Profundidade de cada elemento que nos interessa (w:document = 0).
+# Reproduz exatamente o que parse_docx lê: body/p/r/(t|tab|br|cr), r/rPr/(b|i|sz)
+# e p/pPr/jc. O w:sectPr do corpo e os de p/pPr/sectPr fornecem a geometria e
+# as referências de cabeçalho/rodapé das seções.
+_DEPTH_BODY = 1
+_DEPTH_P = 2
+_DEPTH_R = 3
+_DEPTH_RUN_CHILD = 4
+_DEPTH_PPR_CHILD = 4
+_DEPTH_SECTPR_CHILD = 3
+_DEPTH_RPR_CHILD = 5
+_DEPTH_PPR_SECTPR_CHILD = 5
+
+# Filhos de w:sectPr que definem a geometria da seção
+_SECTION_TAGS = (W_PG_SZ, W_PG_MAR, W_TYPE)
+
+CHUNK_SIZE = 1 << 16
+
+class _DocxTarget:
+    """Recebe os eventos do lxml e monta parágrafos prontos."""
+
+    def __init__(self):
+        self.finished = []
+        # r:id do cabeçalho/rodapé 'default' do w:sectPr do corpo, como
+        # headers.section_references
+        self.references = {}
+        # Seções fechadas por quebras de seção (w:p/w:pPr/w:sectPr) e as
+        # referências de cada uma
+        self.sections = []
+        self.section_references = []
+        # Atributos de pgSz/pgMar/type do w:sectPr do corpo (None = não há)
+        self.body_section = None
+        self.paragraph_count = 0
+        self._para_section = None
+        self._para_references = None
+        self._in_sectpr = False
+        self._depth = -1
+        self._in_body = False
+        self._para = None
+        self._parts = None
+        self._in_rpr = False
+        self._in_ppr = False
+        self._in_text = False
+        self._is_bold = False
+        self._is_italic = False
+        self._size = None
+
+    def start(self, tag, attrib):
+        self._depth += 1
+        depth = self._depth
+
+        if depth == _DEPTH_BODY:
+            self._in_body = tag == W_BODY
+        elif not self._in_body:
+            return
+        elif depth == _DEPTH_P:
+            if tag == W_P:
+                self._para = Paragraph()
+            elif tag == W_SECTPR:
+                self._in_sectpr = True
+                self.body_section = {}
+        elif self._in_sectpr:
+            if depth == _DEPTH_SECTPR_CHILD and tag in _SECTION_TAGS:
+                self.body_section[tag] = dict(attrib)
+            elif depth == _DEPTH_SECTPR_CHILD:
+                _add_reference(self.references, tag, attrib)
+        elif self._para is None:
+            return
+        elif depth == _DEPTH_R:
+            if tag == W_R:
+                self._parts = []
+                self._is_bold = False
+                self._is_italic = False
+                self._size = None
+            elif tag == W_PPR:
+                self._in_ppr = True
+        elif self._in_ppr:
+            if depth == _DEPTH_PPR_CHILD and tag == W_JC:
+                self._para.alignment = JC_ALIGNMENT.get(attrib.get(W_VAL), 'left')
+            elif depth == _DEPTH_PPR_CHILD and tag == W_SECTPR:
+                self._para_section = {}
+                self._para_references = {}
+            elif depth == _DEPTH_PPR_SECTPR_CHILD and self._para_section is not None:
+                if tag in _SECTION_TAGS:
+                    self._para_section[tag] = dict(attrib)
+                else:
+                    _add_reference(self._para_references, tag, attrib)
+        elif self._parts is None:
+            return
+        elif depth == _DEPTH_RUN_CHILD:
+            if tag == W_T:
+                self._in_text = True
+            elif tag == W_TAB:
+                self._parts.append('\t')
+            elif tag == W_BR or tag == W_CR:
+                self._parts.append('\n')
+            elif tag == W_RPR:
+                self._in_rpr = True
+        elif depth == _DEPTH_RPR_CHILD and self._in_rpr:
+            if tag == W_B:
+                self._is_bold = attrib.get(W_VAL, 'true').lower() not in _FALSE_VALUES
+            elif tag == W_I:
+                self._is_italic = attrib.get(W_VAL, 'true').lower() not in _FALSE_VALUES
+            elif tag == W_SZ:
+                self._size = half_points(attrib.get(W_VAL))
+
+    def end(self, tag):
+        depth = self._depth
+        self._depth -= 1
+
+        if depth == _DEPTH_RUN_CHILD:
+            self._in_text = False
+            self._in_rpr = False
+        elif depth == _DEPTH_R and self._in_ppr:
+            self._in_ppr = False
+        elif depth == _DEPTH_R and self._parts is not None:
+            text = ''.join(self._parts)
+            if text:
+                self._para.runs.append(Run(text=text, is_bold=self._is_bold, is_italic=self._is_italic,
+                                          size=self._size))
+            self._parts = None
+        elif depth == _DEPTH_P and self._in_sectpr:
+            self._in_sectpr = False
+        elif depth == _DEPTH_P and self._para is not None:
+            if self._para.runs:
+                self.finished.append(self._para)
+                self.paragraph_count += 1
+            if self._para_section is not None:
+                self.sections.append(_section(self._para_section, self.paragraph_count))
+                self.section_references.append(self._para_references)
+                self._para_section = self._para_references = None
+            self._para = None
+
+    def data(self, data):
+        if self._in_text:
+            self._parts.append(data)
+
+    def close(self):
+        return None
+
+    def all_sections(self):
+        """Seções do documento, como em parse_docx (a do corpo fecha a lista)."""
+        if self.body_section is None and not self.sections:
+            return []
+        return [*self.sections, _section(self.body_section or {}, self.paragraph_count)]
+
+    def all_references(self):
+        """Referências de cabeçalho/rodapé de cada seção de all_sections (sem seções, as do corpo)."""
+        return [*self.section_references, self.references]
+
+def _add_reference(references, tag, attrib):
+    # Como headers.section_references, para um filho de w:sectPr
+    if attrib.get(W_TYPE, 'default') != 'default' or not attrib.get(R_ID):
+        return
+    if tag == W_HEADER_REFERENCE:
+        references['header'] = attrib.get(R_ID)
+    elif tag == W_FOOTER_REFERENCE:
+        references['footer'] = attrib.get(R_ID)
+
+def _section(attributes, end):
+    return section_from_attributes(attributes.get(W_PG_SZ, {}), attributes.get(W_PG_MAR, {}),
+                                   attributes.get(W_TYPE, {}).get(W_VAL), end)
+
+def iter_paragraphs(file_path: str, normalize: bool = True,
+                    chunk_size: int = CHUNK_SIZE, deadline=None) -> Iterator[Paragraph]:
+    """Gera os parágrafos do documento à medida que são lidos, sem árvore lxml.
+
+    Só parágrafos: as seções (w:sectPr) ficam de fora e o renderizador usa a
+    geometria padrão. Para as seções, parse_docx_sax. Com 'deadline'
+    (deadline.Deadline) o prazo é conferido a cada bloco de XML.
+    """
+    for para in _iter_raw_paragraphs(file_path, chunk_size, _DocxTarget(), deadline):
+        if normalize:
+            para.runs = merge_runs(para.runs)
+        yield para
+
+def _iter_raw_paragraphs(file_path, chunk_size, target, deadline=None):
+    parser = etree.XMLParser(target=target, huge_tree=True, resolve_entities=False)
+
+    with zipfile.ZipFile(file_path, 'r') as docx_zip:
+        with docx_zip.open('word/document.xml') as xml_stream:
+            while True:
+                # Por bloco, não por parágrafo: um parágrafo gigante também é interrompido
+                if deadline is not None:
+                    deadline.check('parse', paragraphs=target.paragraph_count)
+                chunk = xml_stream.read(chunk_size)
+                if not chunk:
+                    break
+                parser.feed(chunk)
+                if target.finished:
+                    yield from target.finished
+                    target.finished = []
+    parser.close()
+    yield from target.finished
+
+def parse_docx_sax(file_path: str, normalize: bool = True, deadline=None) -> Document:
+    """Equivalente a parse_docx, usando o backend orientado a eventos.
+
+    Com 'deadline' o prazo é conferido a cada bloco de XML lido.
+    """
+    target = _DocxTarget()
+    doc = Document(body=list(_iter_raw_paragraphs(file_path, CHUNK_SIZE, target, deadline)))
+    doc.sections = target.all_sections()
+    if normalize:
+        doc.normalization = normalize_document(doc)
+    with zipfile.ZipFile(file_path, 'r') as docx_zip:
+        assign_furniture(doc, docx_zip, target.all_references(), normalize)
+    return doc
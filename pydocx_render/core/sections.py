@@ -0,0 +1,71 @@
+# pydocx_render/core/sections.py
+# Seções do documento (w:sectPr): tamanho, orientação e margens das páginas.
+#
+# O Word grava o w:sectPr de cada seção no último parágrafo dela
+# (w:p/w:pPr/w:sectPr); o da última seção fica direto em w:body. As medidas
+# vêm em twips (1/20 pt). Os dois parsers (lxml e eventos) leem os mesmos
+# atributos de w:pgSz, w:pgMar e w:type e chamam section_from_attributes.
+
+from typing import List, Mapping, Optional
+from .dom import SECTION_STARTS, Section
+from .parser import W
+
+W_PG_SZ = W + 'pgSz'
+W_PG_MAR = W + 'pgMar'
+W_TYPE = W + 'type'
+W_VAL = W + 'val'
+
+TWIPS_PER_POINT = 20
+
+def twips(value, default: float) -> float:
+    """Medida em twips -> pontos; 'default' se faltar ou for inválida."""
+    try:
+        return int(value) / TWIPS_PER_POINT
+    except (TypeError, ValueError):
+        return default
+
+def section_from_attributes(pg_sz: Mapping, pg_mar: Mapping, start: Optional[str], end: int) -> Section:
+    """Section a partir dos atributos de w:pgSz e w:pgMar e do w:val de w:type."""
+    section = Section(end=end)
+    width = twips(pg_sz.get(W + 'w'), section.page_width)
+    height = twips(pg_sz.get(W + 'h'), section.page_height)
+    # O Word já grava largura e altura trocadas no paisagem; outros editores
+    # às vezes só marcam w:orient
+    if pg_sz.get(W + 'orient') == 'landscape' and width < height:
+        width, height = height, width
+    section.page_width = width
+    section.page_height = height
+    section.orientation = 'landscape' if width > height else 'portrait'
+
+    # Margens negativas em cima/embaixo só dizem que o cabeçalho não empurra o corpo
+    section.margin_top = abs(twips(pg_mar.get(W + 'top'), section.margin_top))
+    section.margin_bottom = abs(twips(pg_mar.get(W + 'bottom'), section.margin_bottom))
+    section.margin_right = twips(pg_mar.get(W + 'right'), section.margin_right)
+    section.margin_left = (twips(pg_mar.get(W + 'left'), section.margin_left)
+                           + twips(pg_mar.get(W + 'gutter'), 0.0))
+    section.header_distance = twips(pg_mar.get(W + 'header'), section.header_distance)
+    section.footer_distance = twips(pg_mar.get(W + 'footer'), section.footer_distance)
+    section.start = start if start in SECTION_STARTS else 'nextPage'
+    return section
+
+def parse_section(sect_pr, end: int) -> Section:
+    """Section de um w:sectPr do lxml (None = geometria padrão)."""
+    if sect_pr is None:
+        return Section(end=end)
+    pg_sz = sect_pr.find(W_PG_SZ)
+    pg_mar = sect_pr.find(W_PG_MAR)
+    start = sect_pr.find(W_TYPE)
+    return section_from_attributes(pg_sz.attrib if pg_sz is not None else {},
+                                   pg_mar.attrib if pg_mar is not None else {},
+                                   start.get(W_VAL) if start is not None else None, end)
+
+def section_ranges(sections: List[Section], n_paragraphs: int):
+    """(início, fim, seção) de cada seção; sem seções, o corpo inteiro na geometria padrão."""
+    if not sections:
+        return [(0, n_paragraphs, Section(end=n_paragraphs))]
+    ranges = []
+    start = 0
+    for section in sections:
+        ranges.append((start, section.end, section))
+        start = section.end
+    return ranges
@@ -0,0 +1,81 @@
+# pydocx_render/deadline.py
+# Prazo e cancelamento cooperativo das conversões.
+#
+# Um upload patológico (um parágrafo gigante, centenas de MB de XML) prendia
+# o worker por minutos, e o único remédio era matar o processo. Um Deadline é
+# passado a parse_docx / parse_docx_sax / render_to_pdf, que o conferem a
+# cada parágrafo (parse e layout), a cada bloco de XML (parser de eventos) e
+# a cada página (desenho). Vencido o prazo, ou chamado cancel() de outra
+# thread, a próxima conferência levanta ConversionTimeout com o progresso:
+# a conversão para num ponto limpo, sem deixar trava nem arquivo pela metade.
+#
+# O que não é interrompido: uma única chamada longa entre duas conferências
+# (a árvore inteira do lxml em parse_docx, o layout de um parágrafo só).
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass
+class Progress:
+    """Até onde a conversão chegou: etapa e parágrafos/páginas concluídos.
+
+    'paragraphs' conta do início do documento; None quando a etapa não
+    acompanha parágrafos (desenho).
+    """
+    stage: str
+    paragraphs: Optional[int] = None
+    pages: int = 0
+
+    def __str__(self):
+        paragraphs = '' if self.paragraphs is None else f", {self.paragraphs} parágrafos"
+        return f"etapa {self.stage}{paragraphs}, {self.pages} páginas"
+
+class ConversionTimeout(Exception):
+    """Prazo vencido (ou conversão cancelada); 'progress' diz até onde ela foi."""
+
+    def __init__(self, progress: Progress, cancelled: bool = False):
+        super().__init__(progress)
+        self.progress = progress
+        self.cancelled = cancelled
+
+    def __str__(self):
+        # Montada na hora: quem repassa a exceção completa o progresso (páginas)
+        reason = 'cancelada' if self.cancelled else 'prazo esgotado'
+        return f"Conversão interrompida ({reason}) em {self.progress}."
+
+class Deadline:
+    """Prazo em segundos a partir da criação (None = sem prazo) e/ou cancelamento manual.
+
+    O mesmo Deadline pode ser conferido por várias threads (as seções são
+    diagramadas em paralelo) e cancelado de qualquer uma.
+    """
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.expires_at = None if seconds is None else time.monotonic() + seconds
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def remaining(self) -> Optional[float]:
+        """Segundos até o prazo (0 se venceu; None se não há prazo)."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        if self._cancelled.is_set():
+            return True
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def check(self, stage: str, paragraphs: Optional[int] = None, pages: int = 0):
+        """Levanta ConversionTimeout se o prazo venceu ou a conversão foi cancelada."""
+        if self.expired:
+            raise ConversionTimeout(Progress(stage, paragraphs, pages), self.cancelled)
@@ -0,0 +1,67 @@
+# pydocx_render/disk_cache.py
+# Utilitários comuns aos caches em disco (DOM e PDFs de saída).
+#
+# Cada entrada é um arquivo no diretório do cache; o mtime marca o último uso,
+# de modo que o despejo remove primeiro os arquivos menos usados (LRU).
+
+import os
+import shutil
+import tempfile
+
+def atomic_write(target_path: str, data: bytes):
+    """Grava 'data' num temporário do mesmo diretório e troca com os.replace."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target_path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as tmp_file:
+            tmp_file.write(data)
+        os.replace(tmp_path, target_path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def atomic_copy(source_path: str, target_path: str):
+    """Copia um arquivo para dentro do cache sem nunca expor uma cópia parcial."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target_path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as tmp_file, open(source_path, 'rb') as source:
+            shutil.copyfileobj(source, tmp_file, 1 << 20)
+        os.replace(tmp_path, target_path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def touch(path: str):
+    """Marca a entrada como usada agora."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+def evict_lru(cache_dir: str, suffix: str, max_bytes: int) -> int:
+    """Remove as entradas mais antigas até o diretório caber em max_bytes."""
+    entries = []
+    total = 0
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            if entry.name.endswith(suffix):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+    removed = 0
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+            removed += 1
+        except OSError:
+            pass
+    return removed
@@ -0,0 +1,203 @@
+# pydocx_render/layout/advance_tables.py
+# Tabelas de avanço imutáveis e pool de faces FreeType por thread.
+#
+# Um freetype.Face é mutável (set_char_size, glyph corrente) e não pode ser
+# compartilhado entre threads. Aqui o FreeType só é usado para construir, uma
+# vez por processo, a tabela de avanços de cada fonte em unidades da fonte
+# (independente do tamanho). Depois de construída a tabela nunca muda, então
+# qualquer thread pode medir texto com consultas a ela, sem travas.
+#
+# Contrato de thread-safety:
+#   - AdvanceTable é imutável após advance_table_for() devolvê-la;
+#   - advance_table_for() constrói cada tabela uma única vez (trava por fonte);
+#   - FacePool.face() devolve um Face exclusivo da thread que chama.
+#
+# As fontes base-14 do modo rascunho ('Helvetica'...) não têm arquivo: as
+# tabelas delas vêm das larguras AFM de afm_data, sem FreeType.
+#
+# Com a extensão ft_native compilada a tabela é lida pela API C do FreeType,
+# sem o GIL; sem ela, pelo freetype-py. Os valores são os mesmos. Com um
+# diretório de métricas (metric_files) nem isso: a tabela é mapeada do disco.
+
+import threading
+from array import array
+from typing import Dict, Optional
+
+BMP_LIMIT = 0x10000
+# w:tab chega ao layout como '\t', que nenhuma fonte tem no cmap: é medido
+# como um espaço (sem paradas de tabulação) e desenhado como um espaço
+TAB = 0x09
+SPACE = 0x20
+
+class AdvanceTable:
+    """Avanços horizontais (em unidades da fonte) de todos os glifos do cmap."""
+
+    __slots__ = ('font_path', 'units_per_em', '_advances', 'default_advance',
+                 'ascender', 'descender', 'bmp_advances', '_astral_advances')
+
+    def __init__(self, font_path: str, units_per_em: int, advances: Optional[Dict[int, int]],
+                 default_advance: int, ascender: int, descender: int,
+                 bmp_advances=None, astral_advances: Optional[Dict[int, int]] = None):
+        self.font_path = font_path
+        self.units_per_em = units_per_em
+        if advances is not None and TAB not in advances and SPACE in advances:
+            advances[TAB] = advances[SPACE]
+        self._advances = advances
+        # Avanço do .notdef: o que o FreeType mediria para um caractere ausente
+        self.default_advance = default_advance
+        self.ascender = ascender
+        self.descender = descender
+        # Avanços do BMP num array denso (-1 = fora do cmap), para o motor
+        # Cython medir sem consultar o dicionário e sem o GIL. Vindo de um
+        # arquivo de métricas (metric_files) é uma view sobre o mmap, e o
+        # dicionário só é montado se alguém pedir 'advances'.
+        if bmp_advances is None:
+            bmp_advances = array('i', [-1]) * BMP_LIMIT
+            for cp, advance in advances.items():
+                if cp < BMP_LIMIT:
+                    bmp_advances[cp] = advance
+        self.bmp_advances = bmp_advances
+        self._astral_advances = astral_advances
+
+    @property
+    def advances(self) -> Dict[int, int]:
+        """{code point: avanço} de todo o cmap."""
+        advances = self._advances
+        if advances is None:
+            # Duas threads podem montar ao mesmo tempo: os dicionários são iguais
+            bmp = self.bmp_advances
+            advances = {cp: bmp[cp] for cp in range(BMP_LIMIT) if bmp[cp] >= 0}
+            advances.update(self._astral_advances or {})
+            self._advances = advances
+        return advances
+
+    def advance(self, cp: int) -> int:
+        """Avanço de um code point; o do .notdef se estiver fora do cmap."""
+        if cp < BMP_LIMIT:
+            advance = self.bmp_advances[cp]
+            return advance if advance >= 0 else self.default_advance
+        if self._advances is None:
+            return self._astral_advances.get(cp, self.default_advance)
+        return self._advances.get(cp, self.default_advance)
+
+    def range_units(self, text: str, start: int, end: int) -> int:
+        advances = self.advances
+        default = self.default_advance
+        total = 0
+        for i in range(start, end):
+            total += advances.get(ord(text[i]), default)
+        return total
+
+    def range_width(self, text: str, start: int, end: int, font_size: float) -> float:
+        """Largura de text[start:end] em pontos, sem criar a substring."""
+        return self.range_units(text, start, end) * font_size / self.units_per_em
+
+class FacePool:
+    """Um freetype.Face por (thread, fonte); nunca é compartilhado entre threads."""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def face(self, font_path: str):
+        faces = getattr(self._local, 'faces', None)
+        if faces is None:
+            faces = self._local.faces = {}
+        face = faces.get(font_path)
+        if face is None:
+            import freetype
+            face = faces[font_path] = freetype.Face(font_path)
+        return face
+
+FACE_POOL = FacePool()
+
+# Nome PostScript da base-14 -> (nome da fonte interna no PyMuPDF, larguras AFM)
+BASE14_FONTS = {
+    'Helvetica': ('helv', 'Helvetica'),
+    'Helvetica-Bold': ('hebo', 'Helvetica-Bold'),
+    'Helvetica-Oblique': ('heit', 'Helvetica'),
+    'Helvetica-BoldOblique': ('hebi', 'Helvetica-Bold'),
+}
+# Caractere que o PyMuPDF desenha no lugar dos que ficam fora do Latin-1
+BASE14_REPLACEMENT = 0xB7
+# Medidas verticais (1/1000 em) da Arial/Liberation Sans, que têm as mesmas
+# larguras da Helvetica: assim o rascunho pagina como a versão final
+BASE14_ASCENDER = 905
+BASE14_DESCENDER = -212
+
+_tables = {}
+_tables_lock = threading.Lock()
+_font_locks = {}
+
+def _build_table(font_path: str) -> AdvanceTable:
+    try:
+        from .ft_native import read_advances
+    except ImportError:
+        return _build_table_freetype_py(font_path)
+    units_per_em, ascender, descender, default_advance, advances = read_advances(font_path)
+    return AdvanceTable(
+        font_path=font_path,
+        units_per_em=units_per_em,
+        advances=advances,
+        default_advance=default_advance,
+        ascender=ascender,
+        descender=descender,
+    )
+
+def _build_table_freetype_py(font_path: str) -> AdvanceTable:
+    import freetype
+    face = FACE_POOL.face(font_path)
+    flags = freetype.FT_LOAD_NO_SCALE
+    advances = {}
+    for charcode, glyph_index in face.get_chars():
+        if glyph_index:
+            advances[charcode] = face.get_advance(glyph_index, flags)
+    return AdvanceTable(
+        font_path=font_path,
+        units_per_em=face.units_per_EM,
+        advances=advances,
+        default_advance=face.get_advance(0, flags),
+        ascender=face.ascender,
+        descender=face.descender,
+    )
+
+def _build_base14_table(font_name: str) -> AdvanceTable:
+    from .afm_data import WIDTHS
+    widths = WIDTHS[BASE14_FONTS[font_name][1]]
+    advances = {cp: width for cp, width in enumerate(widths) if width}
+    return AdvanceTable(
+        font_path=font_name,
+        units_per_em=1000,
+        advances=advances,
+        default_advance=widths[BASE14_REPLACEMENT],
+        ascender=BASE14_ASCENDER,
+        descender=BASE14_DESCENDER,
+    )
+
+def _load_or_build_table(font_path: str) -> AdvanceTable:
+    # Com um diretório de métricas configurado a tabela vem do arquivo
+    # pré-compilado (mmap), sem FreeType
+    from .metric_files import face_metrics
+    metrics = face_metrics(font_path)
+    if metrics is not None:
+        return metrics.table
+    return _build_table(font_path)
+
+def advance_table_for(font_path: str) -> AdvanceTable:
+    """Tabela compartilhada da fonte, construída na primeira chamada.
+
+    'font_path' também pode ser um nome de BASE14_FONTS.
+    """
+    table = _tables.get(font_path)
+    if table is not None:
+        return table
+
+    with _tables_lock:
+        font_lock = _font_locks.setdefault(font_path, threading.Lock())
+    # Trava por fonte: duas threads pedindo a mesma fonte constroem uma vez só,
+    # e fontes diferentes podem ser construídas em paralelo
+    with font_lock:
+        table = _tables.get(font_path)
+        if table is None:
+            build = _build_base14_table if font_path in BASE14_FONTS else _load_or_build_table
+            table = _tables[font_path] = build(font_path)
+    return table
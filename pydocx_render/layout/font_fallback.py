@@ -0,0 +1,120 @@
+# pydocx_render/layout/font_fallback.py
+# Cadeia de fontes de fallback guiada pela cobertura do cmap.
+#
+# Quando um caractere não existe na fonte principal, o FreeType mede o glifo
+# .notdef e o PyMuPDF desenha uma caixa. Em vez de testar cada glifo em cada
+# fonte na hora de desenhar, a cobertura do cmap de cada fonte candidata é
+# lida uma única vez e guardada como bitmap (BMP) + faixas ordenadas (planos
+# suplementares). Dividir uma run em sub-runs por fonte vira uma passada
+# linear com consultas O(1) ao bitmap.
+
+import os
+import unicodedata
+from bisect import bisect_right
+from functools import lru_cache
+from typing import List, Sequence, Tuple
+
+BMP_LIMIT = 0x10000
+
+class FontCoverage:
+    """Conjunto de code points mapeados no cmap de uma fonte."""
+
+    __slots__ = ('bmp', 'range_starts', 'range_ends')
+
+    def __init__(self, codepoints):
+        self.bmp = bytearray(BMP_LIMIT >> 3)
+        self.range_starts = []
+        self.range_ends = []
+        for cp in sorted(codepoints):
+            if cp < BMP_LIMIT:
+                self.bmp[cp >> 3] |= 1 << (cp & 7)
+            elif self.range_ends and self.range_ends[-1] == cp - 1:
+                self.range_ends[-1] = cp
+            else:
+                self.range_starts.append(cp)
+                self.range_ends.append(cp)
+        self.bmp = bytes(self.bmp)
+
+    @classmethod
+    def from_bitmap(cls, bmp, astral_codepoints) -> 'FontCoverage':
+        """Cobertura já pronta: bitmap do BMP (bytes ou view do mmap) + code points acima dele."""
+        coverage = cls(astral_codepoints)
+        coverage.bmp = bmp
+        return coverage
+
+    def __contains__(self, cp: int) -> bool:
+        if cp < BMP_LIMIT:
+            return bool(self.bmp[cp >> 3] & (1 << (cp & 7)))
+        index = bisect_right(self.range_starts, cp) - 1
+        return index >= 0 and cp <= self.range_ends[index]
+
+def _read_cmap(font_path: str):
+    try:
+        from .ft_native import read_cmap
+    except ImportError:
+        pass
+    else:
+        return read_cmap(font_path)
+    import freetype
+    face = freetype.Face(font_path)
+    return [charcode for charcode, glyph_index in face.get_chars() if glyph_index]
+
+@lru_cache(maxsize=None)
+def _coverage_cached(font_path: str, size: int, mtime: float) -> FontCoverage:
+    from .metric_files import face_metrics
+    metrics = face_metrics(font_path)
+    if metrics is not None:
+        return metrics.coverage
+    return FontCoverage(_read_cmap(font_path))
+
+def coverage_for(font_path: str) -> FontCoverage:
+    """Cobertura da fonte, lida do cmap uma vez por processo (e por versão do arquivo)."""
+    stat = os.stat(font_path)
+    return _coverage_cached(font_path, stat.st_size, stat.st_mtime)
+
+def _is_neutral(ch: str) -> bool:
+    # Espaços e controles não justificam trocar de fonte no meio da run
+    return unicodedata.category(ch)[0] in 'ZC'
+
+class FallbackResolver:
+    """Escolhe, para cada caractere, a primeira fonte da cadeia que o cobre."""
+
+    def __init__(self, font_paths: Sequence[str]):
+        self.font_paths = list(font_paths)
+        self.coverages = [coverage_for(path) for path in self.font_paths]
+
+    def font_for(self, cp: int) -> int:
+        """Índice da fonte para o code point (0 = principal, também quando ninguém cobre)."""
+        for index, coverage in enumerate(self.coverages):
+            if cp in coverage:
+                return index
+        return 0
+
+    def split(self, text: str) -> List[Tuple[str, int]]:
+        """Divide o texto em (trecho, índice_da_fonte) numa única passada."""
+        if not text:
+            return []
+        primary = self.coverages[0]
+        if len(self.coverages) == 1:
+            return [(text, 0)]
+
+        bmp = primary.bmp
+        pieces = []
+        start = 0
+        current = None
+        for i, ch in enumerate(text):
+            cp = ord(ch)
+            # Caminho rápido: a fonte principal cobre quase tudo
+            if current == 0 and cp < BMP_LIMIT and bmp[cp >> 3] & (1 << (cp & 7)):
+                continue
+            if _is_neutral(ch):
+                continue
+            index = 0 if cp in primary else self.font_for(cp)
+            if current is None:
+                current = index
+            elif index != current:
+                pieces.append((text[start:i], current))
+                start = i
+                current = index
+        pieces.append((text[start:], current or 0))
+        return pieces
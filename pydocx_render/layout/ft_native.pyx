@@ -0,0 +1,113 @@
+# pydocx_render/layout/ft_native.pyx
+# -*- coding: utf-8 -*-
+# Leitura de avanços e cmap direto na API C do FreeType.
+#
+# Pelo freetype-py cada glifo custa uma chamada ctypes (get_char, get_advance),
+# e isso domina o tempo de construir a tabela de uma fonte com dezenas de
+# milhares de glifos. Aqui o laço inteiro roda em C, sem o GIL.
+#
+# Cada chamada abre a sua própria FT_Library e FT_Face e as fecha no fim:
+# nada do FreeType é compartilhado entre threads, como no FACE_POOL.
+#
+# As tabelas ficam em unidades da fonte (FT_LOAD_NO_SCALE), então não há
+# FT_Set_Char_Size: a escala para cada tamanho é feita por quem mede.
+
+from libcpp.vector cimport vector
+
+cdef extern from "ft2build.h":
+    pass
+
+cdef extern from "freetype/freetype.h":
+    ctypedef int FT_Error
+    ctypedef int FT_Int32
+    ctypedef unsigned int FT_UInt
+    ctypedef long FT_Long
+    ctypedef unsigned long FT_ULong
+    ctypedef long FT_Fixed
+    ctypedef void* FT_Library
+
+    ctypedef struct FT_FaceRec:
+        unsigned short units_per_EM
+        short ascender
+        short descender
+    ctypedef FT_FaceRec* FT_Face
+
+    int FT_LOAD_NO_SCALE
+
+    FT_Error FT_Init_FreeType(FT_Library* library)
+    FT_Error FT_Done_FreeType(FT_Library library)
+    FT_Error FT_New_Face(FT_Library library, const char* path, FT_Long face_index, FT_Face* face)
+    FT_Error FT_Done_Face(FT_Face face)
+    FT_ULong FT_Get_First_Char(FT_Face face, FT_UInt* glyph_index) nogil
+    FT_ULong FT_Get_Next_Char(FT_Face face, FT_ULong char_code, FT_UInt* glyph_index) nogil
+
+cdef extern from "freetype/ftadvanc.h":
+    # Com FT_LOAD_NO_SCALE lê o hmtx direto; nos formatos sem esse atalho o
+    # próprio FreeType cai no FT_Load_Glyph
+    FT_Error FT_Get_Advance(FT_Face face, FT_UInt gindex, FT_Int32 load_flags, FT_Fixed* padvance) nogil
+
+cdef class _Face:
+    # FT_Library + FT_Face de uma única chamada
+    cdef FT_Library library
+    cdef FT_Face face
+
+    def __cinit__(self, str font_path):
+        cdef bytes path = font_path.encode('utf-8')
+        cdef FT_Error error = FT_Init_FreeType(&self.library)
+        if error:
+            self.library = NULL
+            raise OSError(f"FreeType: erro {error} ao inicializar a biblioteca")
+        error = FT_New_Face(self.library, path, 0, &self.face)
+        if error:
+            self.face = NULL
+            raise OSError(f"FreeType: erro {error} ao abrir {font_path}")
+
+    def __dealloc__(self):
+        if self.face != NULL:
+            FT_Done_Face(self.face)
+        if self.library != NULL:
+            FT_Done_FreeType(self.library)
+
+cdef void _read_chars(FT_Face face, vector[unsigned long]& charcodes,
+                      vector[unsigned int]& glyphs) noexcept nogil:
+    cdef FT_UInt glyph_index
+    cdef FT_ULong charcode = FT_Get_First_Char(face, &glyph_index)
+    while glyph_index:
+        charcodes.push_back(charcode)
+        glyphs.push_back(glyph_index)
+        charcode = FT_Get_Next_Char(face, charcode, &glyph_index)
+
+cdef long _advance(FT_Face face, FT_UInt glyph_index) noexcept nogil:
+    cdef FT_Fixed advance = 0
+    if FT_Get_Advance(face, glyph_index, FT_LOAD_NO_SCALE, &advance):
+        return 0
+    return advance
+
+def read_cmap(str font_path):
+    """Code points mapeados no cmap (mesma lista do font_fallback com freetype-py)."""
+    cdef _Face font = _Face(font_path)
+    cdef vector[unsigned long] charcodes
+    cdef vector[unsigned int] glyphs
+    with nogil:
+        _read_chars(font.face, charcodes, glyphs)
+    return list(charcodes)
+
+def read_advances(str font_path):
+    """(units_per_em, ascender, descender, avanço do .notdef, {code point: avanço})."""
+    cdef _Face font = _Face(font_path)
+    cdef FT_Face face = font.face
+    cdef vector[unsigned long] charcodes
+    cdef vector[unsigned int] glyphs
+    cdef vector[long] advances
+    cdef long default_advance
+    cdef size_t i
+    with nogil:
+        _read_chars(face, charcodes, glyphs)
+        advances.resize(glyphs.size())
+        for i in range(glyphs.size()):
+            advances[i] = _advance(face, glyphs[i])
+        default_advance = _advance(face, 0)
+    table = {}
+    for i in range(charcodes.size()):
+        table[charcodes[i]] = advances[i]
+    return face.units_per_EM, face.ascender, face.descender, default_advance, table
@@ -0,0 +1,128 @@
+# pydocx_render/layout/line_box.py
+# Linhas prontas para desenhar: trechos com posição e largura já medidas.
+#
+# O layout mede cada segmento para decidir onde quebrar; essas mesmas medidas
+# viram a posição de cada trecho na linha, então o renderizador só desenha.
+# O alinhamento (w:jc) é aplicado aqui, a partir da largura da linha, sem
+# nenhuma medição adicional. A altura e a linha de base saem do maior tamanho
+# de fonte presente na linha.
+
+from bisect import bisect_right
+from dataclasses import dataclass, field, replace
+from typing import List, Sequence, Tuple
+from ..core.dom import Run
+
+ALIGN_LEFT = 'left'
+ALIGN_CENTER = 'center'
+ALIGN_RIGHT = 'right'
+ALIGN_JUSTIFY = 'justify'
+ALIGNMENTS = (ALIGN_LEFT, ALIGN_CENTER, ALIGN_RIGHT, ALIGN_JUSTIFY)
+
+@dataclass
+class Span:
+    """Pedaço de uma run numa linha; x é relativo ao início da área de texto."""
+    run: Run
+    x: float
+    width: float
+
+@dataclass
+class Line:
+    spans: List[Span] = field(default_factory=list)
+    # Largura natural, sem os espaços pendurados no fim e sem a justificação
+    width: float = 0.0
+    # Maior tamanho de fonte da linha e as medidas verticais que vêm dele:
+    # a linha de base fica 'ascent' abaixo do topo da linha
+    size: float = 0.0
+    ascent: float = 0.0
+    descent: float = 0.0
+
+    @property
+    def height(self) -> float:
+        return self.ascent + self.descent
+
+class ParagraphBuffer:
+    """O parágrafo como um único texto; as runs passam a ser intervalos nele.
+
+    'ascent' e 'descent' vêm das métricas da fonte principal, por ponto de
+    tamanho: as medidas de uma linha são esses valores vezes o seu tamanho.
+    'faces' são as métricas de cada run: as de metrics.bold nas runs em
+    negrito, quando existem (modo rascunho), senão as próprias 'metrics'.
+    """
+
+    __slots__ = ('runs', 'text', 'run_ends', 'sizes', 'faces', 'max_width', 'alignment',
+                 'ascent', 'descent')
+
+    def __init__(self, runs, metrics, max_width: float, font_size: float, alignment: str):
+        self.runs = runs
+        self.text = ''.join([run.text for run in runs])
+        self.run_ends = []
+        self.sizes = []
+        self.faces = []
+        bold = metrics.bold
+        offset = 0
+        for run in runs:
+            offset += len(run.text)
+            self.run_ends.append(offset)
+            self.sizes.append(run.size or font_size)
+            self.faces.append(bold if run.is_bold and bold is not None else metrics)
+        self.max_width = max_width
+        self.alignment = alignment
+        self.ascent = metrics.ascent
+        self.descent = metrics.descent
+
+# Célula medida pelo layout: (início, fim, largura, índice da run). As células
+# de uma linha cobrem o texto dela sem buracos e nunca atravessam runs.
+Cell = Tuple[int, int, float, int]
+
+def build_line(para: ParagraphBuffer, cells: Sequence[Cell], gaps: Sequence[int],
+               width: float, mandatory: bool, line_start: int) -> Line:
+    """Monta a Line a partir das células medidas.
+
+    'gaps' são os índices das células que começam uma palavra depois de um
+    espaço: é ali que a justificação distribui a sobra. Linhas terminadas por
+    quebra obrigatória (fim do parágrafo, w:br) não são justificadas.
+    """
+    paragraph_runs = para.runs
+    text = para.text
+    alignment = para.alignment
+    sizes = para.sizes
+    slack = para.max_width - width
+    x = 0.0
+    extra = 0.0
+    gap_set = ()
+    if alignment == ALIGN_JUSTIFY and not mandatory and gaps and slack > 0:
+        extra = slack / len(gaps)
+        gap_set = set(gaps)
+    elif slack > 0:
+        if alignment == ALIGN_CENTER:
+            x = slack / 2
+        elif alignment == ALIGN_RIGHT:
+            x = slack
+
+    if cells:
+        size = max([sizes[cell[3]] for cell in cells])
+    else:
+        # Linha vazia (w:br seguidos): usa o tamanho da run onde ela começa
+        size = sizes[min(bisect_right(para.run_ends, line_start), len(sizes) - 1)]
+    line = Line(width=width, size=size, ascent=para.ascent * size, descent=para.descent * size)
+    spans = line.spans
+    span_start = span_end = span_index = -1
+    span_x = span_width = 0.0
+    for k, (start, end, cell_width, index) in enumerate(cells):
+        gap = k in gap_set
+        if gap:
+            x += extra
+        if index == span_index and not gap:
+            span_end = end
+            span_width += cell_width
+        else:
+            if span_index >= 0:
+                spans.append(Span(replace(paragraph_runs[span_index], text=text[span_start:span_end]),
+                                  span_x, span_width))
+            span_start, span_end, span_index = start, end, index
+            span_x, span_width = x, cell_width
+        x += cell_width
+    if span_index >= 0:
+        spans.append(Span(replace(paragraph_runs[span_index], text=text[span_start:span_end]),
+                          span_x, span_width))
+    return line
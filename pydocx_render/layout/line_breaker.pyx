@@ -11,64 +11,312 @@
 # distutils: language=c++
 
 cimport cython
-import freetype
-from ..core.dom import Run
+from libcpp.vector cimport vector
+from cpython.unicode cimport PyUnicode_DATA, PyUnicode_KIND
+from array import array
+from bisect import bisect_right
+from . import linebreak
+from .advance_tables import advance_table_for
+from .font_fallback import FallbackResolver
+from .line_box import ALIGN_LEFT, ParagraphBuffer, build_line
+from .line_breaker_pure import HANGING, face_key
+from .width_memo import MAX_TOKEN_LENGTH, WIDTH_MEMO
+
+# --- TABELAS DE QUEBRA DE LINHA (UAX #14) ---
+# As mesmas tabelas de dois estágios do motor puro, vistas como arrays C
+cdef const unsigned short[:] _stage1 = linebreak.STAGE1
+cdef const unsigned char[:] _stage2 = linebreak.STAGE2
+cdef const unsigned char[:] _pair = linebreak.PAIR_TABLE
+cdef int _shift = linebreak.SHIFT
+cdef int _mask = linebreak.MASK
+cdef int _pair_width = linebreak.PAIR_WIDTH
+
+cdef int AL = linebreak.AL
+cdef int CM = linebreak.CM
+cdef int WJ = linebreak.WJ
+cdef int BK = linebreak.BK
+cdef int CR = linebreak.CR
+cdef int LF = linebreak.LF
+cdef int NL = linebreak.NL
+cdef int SP = linebreak.SP
+cdef int DIRECT = linebreak.DIRECT
+cdef int INDIRECT = linebreak.INDIRECT
+
+cdef inline int _class_of(Py_UCS4 ch):
+    cdef unsigned int cp = ch
+    return _stage2[(_stage1[cp >> _shift] << _shift) | (cp & _mask)]
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef tuple find_breaks(str text):
+    """Mesma interface de linebreak.find_breaks: (offsets, mandatory)."""
+    cdef Py_ssize_t n = len(text)
+    cdef Py_ssize_t i
+    cdef int cls, prev, cur, action
+    cdef vector[unsigned int] offsets
+    cdef vector[unsigned char] mandatory
+
+    if n == 0:
+        return array('I'), bytearray()
+
+    cls = _class_of(text[0])
+    if cls == SP:
+        cls = WJ
+    elif cls == LF or cls == NL:
+        cls = BK
+    elif cls == CM:
+        cls = AL
+    prev = cls
+
+    for i in range(1, n):
+        cur = _class_of(text[i])
+
+        if cls == BK or (cls == CR and cur != LF):
+            offsets.push_back(i)
+            mandatory.push_back(1)
+            if cur == SP:
+                cur = WJ
+            elif cur == CM:
+                cur = AL
+            cls = BK if (cur == LF or cur == NL) else cur
+            prev = cls
+            continue
+
+        if cur == BK or cur == LF or cur == NL:
+            cls = BK
+            prev = cur
+            continue
+        if cur == CR:
+            cls = CR
+            prev = cur
+            continue
+        if cur == SP:
+            prev = SP
+            continue
+
+        if cur == CM:
+            if prev != SP:
+                prev = cur
+                continue
+            cur = AL
+
+        action = _pair[cls * _pair_width + cur]
+        if action == DIRECT or (action == INDIRECT and prev == SP):
+            offsets.push_back(i)
+            mandatory.push_back(0)
+        cls = cur
+        prev = cur
+
+    offsets.push_back(n)
+    mandatory.push_back(1)
+    return array('I', offsets), bytearray(mandatory)
+
+cdef extern from "Python.h":
+    # A macro só lê o buffer da str: pode rodar sem o GIL
+    Py_UCS4 _read_char "PyUnicode_READ" (int kind, const void* data, Py_ssize_t index) nogil
+
+# Trechos a partir deste tamanho são medidos com o GIL liberado; nos menores
+# (palavras) soltar e retomar o GIL custa mais que a própria medida
+cdef enum:
+    GIL_RELEASE_MIN = 512
+
+cdef Py_ssize_t _primary_units(int kind, const void* data, Py_ssize_t start, Py_ssize_t end,
+                               const int* bmp_advances, long default_advance,
+                               bint stop_on_missing, long* units) noexcept nogil:
+    # Soma os avanços da fonte principal a partir de 'start' e para no primeiro
+    # caractere que precisa do GIL: fora do BMP ou, com fallback, fora do cmap.
+    # Devolve a posição em que parou ('end' se mediu tudo).
+    cdef Py_ssize_t i
+    cdef Py_UCS4 cp
+    cdef int advance
+    for i in range(start, end):
+        cp = _read_char(kind, data, i)
+        if cp >= 0x10000:
+            return i
+        advance = bmp_advances[cp]
+        if advance >= 0:
+            units[0] += advance
+        elif stop_on_missing:
+            return i
+        else:
+            units[0] += default_advance
+    return end
 
-# ... (imports e __init__ da classe) ...
 cdef class FontMetrics:
-    cdef face
+    # Sem estado mutável: as larguras saem das tabelas de avanço imutáveis e
+    # compartilhadas (advance_tables), então a mesma instância pode ser usada
+    # por várias threads ao mesmo tempo. O FreeType só é tocado na construção.
+    # Os tokens que saem do caminho rápido passam pelo WIDTH_MEMO (thread-safe).
+    cdef object primary
+    cdef long default_advance
+    cdef double units_per_em
+    # Avanços do BMP da fonte principal (-1 = fora do cmap)
+    cdef const int[:] bmp_advances
+    # Cadeia de fallback: tables[0] é a fonte principal
+    cdef list tables
+    cdef object resolver
+    # Medidas verticais da fonte principal por ponto de tamanho
+    cdef readonly double ascent
+    cdef readonly double descent
+    # Fonte (com a cadeia de fallback) nas chaves do WIDTH_MEMO
+    cdef readonly str face_key
+    # Métricas das runs em negrito (ParagraphBuffer.faces); None = estas
+    cdef public FontMetrics bold
     
-    def __init__(self, font_path):
+    def __init__(self, font_path, fallback_paths=()):
         print(f"DEBUG: FontMetrics (Cython) inicializado com path: {font_path}")
-        self.face = freetype.Face(font_path)
+        self.tables = [advance_table_for(path) for path in (font_path, *fallback_paths)]
+        primary = self.primary = self.tables[0]
+        self.default_advance = primary.default_advance
+        self.units_per_em = primary.units_per_em
+        self.bmp_advances = primary.bmp_advances
+        self.ascent = primary.ascender / self.units_per_em
+        self.descent = -primary.descender / self.units_per_em
+        self.resolver = None
+        if fallback_paths:
+            self.resolver = FallbackResolver([font_path, *fallback_paths])
+        self.face_key = face_key(font_path, fallback_paths)
+
+    def memo_stats(self):
+        """Estatísticas do memo de larguras (width_memo.MemoStats)."""
+        return WIDTH_MEMO.stats()
 
     # Assinatura corrigida: tipo de retorno ANTES do nome.
     # Tipos de argumento DENTRO dos parênteses.
-    cpdef float get_text_width(self, str text, int font_size):
-        self.face.set_char_size(font_size * 64)
-        cdef float width = 0.0
-        for char_code in text:
-            self.face.load_char(char_code)
-            width += self.face.glyph.advance.x
-        return width / 64.0
+    cpdef float get_text_width(self, str text, double font_size):
+        return self.get_range_width(text, 0, len(text), font_size)
+
+    # Largura de text[start:end] sem criar a substring. As tabelas estão em
+    # unidades da fonte, então qualquer tamanho custa só a escala final.
+    cpdef float get_range_width(self, str text, Py_ssize_t start, Py_ssize_t end, double font_size):
+        cdef long units = 0
+        cdef double fallback_width = 0.0
+        cdef Py_ssize_t i = start
+        cdef unsigned int cp
+        cdef int kind = PyUnicode_KIND(text)
+        cdef const void* data = PyUnicode_DATA(text)
+        cdef const int* bmp_advances = &self.bmp_advances[0]
+        cdef long default_advance = self.default_advance
+        cdef bint has_resolver = self.resolver is not None
+        cdef str token = None
+        cdef double width
+        while i < end:
+            # Caminho rápido em C; só os caracteres em que ele para voltam ao Python
+            if end - i >= GIL_RELEASE_MIN:
+                with nogil:
+                    i = _primary_units(kind, data, i, end, bmp_advances, default_advance,
+                                       has_resolver, &units)
+            else:
+                i = _primary_units(kind, data, i, end, bmp_advances, default_advance,
+                                   has_resolver, &units)
+            if i >= end:
+                break
+            if token is None and end - start <= MAX_TOKEN_LENGTH:
+                # O token sai do caminho rápido: a largura pode já estar no memo
+                token = text[start:end]
+                cached = WIDTH_MEMO.get(token, self.face_key, font_size)
+                if cached is not None:
+                    return cached
+            # Fora do BMP ou, com fallback, fora do cmap da fonte principal
+            cp = text[i]
+            if not has_resolver or (cp >= 0x10000 and cp in self.resolver.coverages[0]):
+                units += self.primary.advance(cp)
+            else:
+                table = self.tables[self.resolver.font_for(cp)]
+                fallback_width += table.advance(cp) * font_size / table.units_per_em
+            i += 1
+        width = units * font_size / self.units_per_em + fallback_width
+        if token is not None:
+            WIDTH_MEMO.put(token, self.face_key, font_size, width)
+        return width
 
 # --- LÓGICA DE LAYOUT CORRIGIDA ---
-def layout_paragraph(list paragraph_runs, FontMetrics metrics, float max_width, int font_size):
-    cdef list lines = []
-    cdef list current_line_runs = []
-    cdef float current_line_width = 0.0
-       
-    # Primeiro, criamos uma lista única de "palavras" com seus estilos
-    all_words = []
-    for run in paragraph_runs:
-        for word in run.text.split(' '):
-            if word:
-                # Cada palavra herda o estilo de seu 'run' original
-                all_words.append(Run(text=word, is_bold=run.is_bold, is_italic=run.is_italic))
-    
-    if not all_words:
+def layout_paragraph(list paragraph_runs, FontMetrics metrics, float max_width, double font_size,
+                     str alignment=ALIGN_LEFT):
+    """Quebra o parágrafo em Lines com os trechos já posicionados e alinhados.
+
+    'font_size' é o tamanho das runs sem w:sz; as demais usam o próprio.
+    """
+    # O parágrafo vira um único buffer; as runs passam a ser intervalos nele
+    para = ParagraphBuffer(paragraph_runs, metrics, max_width, font_size, alignment)
+    cdef str text = para.text
+    if not text.strip(' '):
         return []
 
-    # Agora, processamos a lista de palavras para formar as linhas
-    for word_run in all_words:
-        # Adicionamos um espaço para o cálculo da largura, exceto na primeira palavra da linha
-        word_text_with_space = (" " if current_line_runs else "") + word_run.text
-        word_width = metrics.get_text_width(word_text_with_space, font_size)
+    # Oportunidades de quebra (UAX #14) como offsets sobre o buffer
+    breaks, mandatory = find_breaks(text)
+    cdef const unsigned int[:] break_view = breaks
+    cdef const unsigned char[:] mandatory_view = mandatory
+    cdef list run_ends = para.run_ends
+    cdef list sizes = para.sizes
+    cdef list faces = para.faces
 
-        if current_line_width + word_width <= max_width:
-            # A palavra cabe, adicionamos à linha atual
-            current_line_runs.append(word_run)
-            current_line_width += word_width
-        else:
-            # A palavra não cabe, finalizamos a linha atual
-            if current_line_runs:
-                lines.append(current_line_runs)
-            
-            # E começamos uma nova linha com a palavra atual
-            current_line_runs = [word_run]
-            current_line_width = metrics.get_text_width(word_run.text, font_size)
-
-    if current_line_runs:
-        lines.append(current_line_runs)
-
-    return lines
\ No newline at end of file
+    cdef list lines = []
+    cdef list cells = []
+    cdef list gaps = []
+    cdef list space_cells = []
+    cdef list seg_cells
+    cdef Py_ssize_t line_start = 0
+    cdef Py_ssize_t seg_start = 0
+    cdef Py_ssize_t seg_end, content_end, k
+    cdef float line_width = 0.0
+    cdef float pending_space = 0.0
+    cdef float seg_width
+
+    # Cada segmento entre duas oportunidades é indivisível; os espaços no fim
+    # de um segmento só contam se outro segmento vier depois na mesma linha.
+    # As medidas ficam guardadas em células e viram a posição dos trechos.
+    for k in range(break_view.shape[0]):
+        seg_end = break_view[k]
+        content_end = seg_end
+        while content_end > seg_start and text[content_end - 1] in HANGING:
+            content_end -= 1
+
+        seg_cells = []
+        seg_width = _measure_cells(faces, text, run_ends, sizes, seg_start, content_end, seg_cells)
+        if seg_start > line_start and line_width + pending_space + seg_width > max_width:
+            lines.append(build_line(para, cells, gaps, line_width, False, line_start))
+            line_start = seg_start
+            line_width = seg_width
+            cells = seg_cells
+            gaps = []
+        elif seg_cells:
+            line_width += pending_space + seg_width
+            if space_cells:
+                cells.extend(space_cells)
+                gaps.append(len(cells))
+            cells.extend(seg_cells)
+        space_cells = []
+        pending_space = _measure_cells(faces, text, run_ends, sizes, content_end, seg_end, space_cells)
+
+        if mandatory_view[k]:
+            lines.append(build_line(para, cells, gaps, line_width, True, line_start))
+            line_start = seg_end
+            line_width = 0.0
+            cells = []
+            gaps = []
+            space_cells = []
+            pending_space = 0.0
+
+        seg_start = seg_end
+
+    return lines
+
+cdef float _measure_cells(list faces, str text, list run_ends, list sizes,
+                          Py_ssize_t start, Py_ssize_t end, list cells):
+    # Mede [start, end) em células que não atravessam runs, cada uma no tamanho
+    # e na fonte da sua run; devolve a largura total
+    cdef float total = 0.0
+    cdef float width
+    cdef Py_ssize_t index = bisect_right(run_ends, start)
+    cdef Py_ssize_t run_end, piece_end
+    while start < end:
+        run_end = run_ends[index]
+        piece_end = run_end if run_end < end else end
+        if piece_end > start:
+            width = (<FontMetrics>faces[index]).get_range_width(text, start, piece_end, sizes[index])
+            cells.append((start, piece_end, width, index))
+            total += width
+        start = piece_end
+        index += 1
+    return total
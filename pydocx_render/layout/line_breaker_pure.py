@@ -1,47 +1,139 @@
 # pydocx_render/layout/line_breaker_pure.py
 # --- VERSÃO CORRIGIDA E MELHORADA ---
 
-from ..core.dom import Run
+import sys
+from bisect import bisect_right
+from .advance_tables import BASE14_FONTS, advance_table_for
+from .line_box import ALIGN_LEFT, ParagraphBuffer, build_line
+from .linebreak import find_breaks
+from .width_memo import MAX_TOKEN_LENGTH, WIDTH_MEMO
+
+# Espaços que "penduram" no fim da linha: não contam para a largura nem são desenhados
+HANGING = ' \n\r\x0b\x0c\x85\u2028\u2029'
+
+def face_key(font_path, fallback_paths=()) -> str:
+    """Identifica a fonte (e a cadeia de fallback) nas chaves do WIDTH_MEMO."""
+    return sys.intern('|'.join([str(font_path), *fallback_paths]))
 
 class FontMetrics:
-    def __init__(self, font_path=None):
+    # Estimativa sem fonte: as fontes de fallback não mudam a largura média.
+    # Fontes base-14 (modo rascunho) têm as larguras AFM embutidas no pacote,
+    # então são medidas de verdade mesmo sem a extensão Cython; a soma é um
+    # laço em Python, e as palavras passam pelo WIDTH_MEMO.
+    def __init__(self, font_path=None, fallback_paths=()):
         self.char_width = 7.0
-    
+        # Medidas verticais por ponto de tamanho, típicas de uma fonte sem serifa
+        self.ascent = 0.905
+        self.descent = 0.212
+        self.table = None
+        if font_path in BASE14_FONTS:
+            self.table = advance_table_for(font_path)
+            self.ascent = self.table.ascender / self.table.units_per_em
+            self.descent = -self.table.descender / self.table.units_per_em
+        self.face_key = face_key(font_path, fallback_paths)
+        # Métricas das runs em negrito (ParagraphBuffer.faces); None = estas
+        self.bold = None
+
+    def memo_stats(self):
+        """Estatísticas do memo de larguras (width_memo.MemoStats)."""
+        return WIDTH_MEMO.stats()
+
     def get_text_width(self, text, font_size):
-        return len(text) * self.char_width * (font_size / 11.0)
+        return self.get_range_width(text, 0, len(text), font_size)
 
-def layout_paragraph(paragraph_runs, metrics, max_width, font_size):
-    lines = []
-    current_line_runs = []
-    current_line_width = 0.0
-    
-    # 1. Achatamos a estrutura: de uma lista de 'runs' para uma lista de 'palavras'
-    all_words = []
-    for run in paragraph_runs:
-        for word in run.text.split(' '):
-            if word:
-                all_words.append(Run(text=word, is_bold=run.is_bold, is_italic=run.is_italic))
-
-    if not all_words:
+    def get_range_width(self, text, start, end, font_size):
+        """Largura de text[start:end] sem criar a substring."""
+        if self.table is not None:
+            if end - start > MAX_TOKEN_LENGTH:
+                return self.table.range_width(text, start, end, font_size)
+            token = text[start:end]
+            width = WIDTH_MEMO.get(token, self.face_key, font_size)
+            if width is None:
+                width = self.table.range_width(token, 0, end - start, font_size)
+                WIDTH_MEMO.put(token, self.face_key, font_size, width)
+            return width
+        return (end - start) * self.char_width * (font_size / 11.0)
+
+def layout_paragraph(paragraph_runs, metrics, max_width, font_size, alignment=ALIGN_LEFT):
+    """Quebra o parágrafo em Lines com os trechos já posicionados e alinhados.
+
+    'font_size' é o tamanho das runs sem w:sz; as demais usam o próprio.
+    """
+    # 1. O parágrafo vira um único buffer; as runs passam a ser intervalos nele
+    para = ParagraphBuffer(paragraph_runs, metrics, max_width, font_size, alignment)
+    text = para.text
+    if not text.strip(' '):
         return []
 
-    # 2. Construímos as linhas a partir da lista de palavras
-    for word_run in all_words:
-        # Calcula a largura da palavra + um espaço antes (se não for a primeira palavra da linha)
-        word_text_with_space = (" " if current_line_runs else "") + word_run.text
-        word_width = metrics.get_text_width(word_text_with_space, font_size)
-
-        if current_line_width + word_width <= max_width:
-            current_line_runs.append(word_run)
-            current_line_width += word_width
-        else:
-            if current_line_runs:
-                lines.append(current_line_runs)
-            
-            current_line_runs = [word_run]
-            current_line_width = metrics.get_text_width(word_run.text, font_size)
-
-    if current_line_runs:
-        lines.append(current_line_runs)
-
-    return lines
\ No newline at end of file
+    # 2. Oportunidades de quebra (UAX #14) como offsets sobre o buffer
+    breaks, mandatory = find_breaks(text)
+
+    # 3. Cada segmento entre duas oportunidades é indivisível. Os espaços no
+    #    fim de um segmento só contam se outro segmento vier depois na linha.
+    #    As medidas ficam guardadas em células e viram a posição dos trechos.
+    lines = []
+    line_start = 0
+    line_width = 0.0
+    cells = []
+    gaps = []
+    space_cells = []
+    pending_space = 0.0
+    seg_start = 0
+
+    for k in range(len(breaks)):
+        seg_end = breaks[k]
+        content_end = seg_end
+        while content_end > seg_start and text[content_end - 1] in HANGING:
+            content_end -= 1
+
+        seg_cells = []
+        seg_width = _measure_cells(para, seg_start, content_end, seg_cells)
+        if seg_start > line_start and line_width + pending_space + seg_width > max_width:
+            lines.append(build_line(para, cells, gaps, line_width, False, line_start))
+            line_start = seg_start
+            line_width = seg_width
+            cells = seg_cells
+            gaps = []
+        elif seg_cells:
+            line_width += pending_space + seg_width
+            if space_cells:
+                cells.extend(space_cells)
+                gaps.append(len(cells))
+            cells.extend(seg_cells)
+        space_cells = []
+        pending_space = _measure_cells(para, content_end, seg_end, space_cells)
+
+        if mandatory[k]:
+            lines.append(build_line(para, cells, gaps, line_width, True, line_start))
+            line_start = seg_end
+            line_width = 0.0
+            cells = []
+            gaps = []
+            space_cells = []
+            pending_space = 0.0
+
+        seg_start = seg_end
+
+    return lines
+
+def _measure_cells(para, start, end, cells):
+    """Mede [start, end) em células que não atravessam runs; devolve a largura total.
+
+    Cada célula é medida no tamanho e na fonte da sua run.
+    """
+    text = para.text
+    run_ends = para.run_ends
+    sizes = para.sizes
+    faces = para.faces
+    total = 0.0
+    index = bisect_right(run_ends, start)
+    while start < end:
+        run_end = run_ends[index]
+        piece_end = run_end if run_end < end else end
+        if piece_end > start:
+            width = faces[index].get_range_width(text, start, piece_end, sizes[index])
+            cells.append((start, piece_end, width, index))
+            total += width
+        start = piece_end
+        index += 1
+    return total
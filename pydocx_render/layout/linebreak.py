@@ -0,0 +1,156 @@
+# pydocx_render/layout/linebreak.py
+# Oportunidades de quebra de linha segundo o Unicode UAX #14.
+#
+# Substitui o antigo run.text.split(' '): parágrafos em CJK não têm espaços e
+# viravam uma única "palavra" que estourava a margem. As classes vêm de uma
+# tabela de dois estágios pré-computada (linebreak_data.py) e o algoritmo é o
+# da tabela de pares do UAX #14. O resultado são offsets sobre o texto do
+# parágrafo; nenhuma substring é criada.
+#
+# Tailandês, laosiano e afins (classe SA) precisariam de um dicionário para
+# achar as fronteiras de palavra; sem ele, a tabela os trata como AL (UAX #14,
+# LB1) e só quebram nos espaços, que nessas línguas separam frases.
+
+import base64
+import zlib
+from array import array
+from . import linebreak_data
+
+SHIFT = linebreak_data.SHIFT
+MASK = (1 << SHIFT) - 1
+CLASS_NAMES = linebreak_data.CLASS_NAMES
+
+def _decode(blob: str) -> bytes:
+    return zlib.decompress(base64.b64decode(blob))
+
+STAGE1 = array('H', _decode(linebreak_data.STAGE1))
+if STAGE1.itemsize != 2:
+    raise ImportError("array('H') precisa ter 2 bytes para ler a tabela de quebra de linha.")
+if array('H', [1]).tobytes() != b'\x01\x00':
+    STAGE1.byteswap()
+STAGE2 = _decode(linebreak_data.STAGE2)
+
+(OP, CL, CP, QU, GL, NS, EX, SY, IS, PR, PO, NU, AL, HL, ID, IN, HY, BA, BB,
+ B2, ZW, CM, WJ, H2, H3, JL, JV, JT, RI, BK, CR, LF, NL, SP) = range(len(CLASS_NAMES))
+
+# Ações da tabela de pares
+DIRECT = 0      # '_' quebra permitida
+INDIRECT = 1    # '%' quebra só se houver espaço entre os dois
+PROHIBITED = 2  # '^' nunca quebra
+
+# Tabela de pares do UAX #14: linha = classe antes, coluna = classe depois.
+# As colunas CM ('#'/'@' no original) são tratadas à parte em find_breaks.
+_PAIR_ROWS = (
+    # OP CL CP QU GL NS EX SY IS PR PO NU AL HL ID IN HY BA BB B2 ZW CM WJ H2 H3 JL JV JT RI
+    "^^^^^^^^^^^^^^^^^^^^^^^^^^^^^",  # OP
+    "_^^%%^^^^%%_____%%__^^^______",  # CL
+    "_^^%%^^^^%%%%%__%%__^^^______",  # CP
+    "^^^%%%^^^%%%%%%%%%%%^^^%%%%%%",  # QU
+    "%^^%%%^^^%%%%%%%%%%%^^^%%%%%%",  # GL
+    "_^^%%%^^^_______%%__^^^______",  # NS
+    "_^^%%%^^^______%%%__^^^______",  # EX
+    "_^^%%%^^^__%_%__%%__^^^______",  # SY
+    "_^^%%%^^^__%%%__%%__^^^______",  # IS
+    "%^^%%%^^^__%%%%_%%__^^^%%%%%_",  # PR
+    "%^^%%%^^^__%%%__%%__^^^______",  # PO
+    "%^^%%%^^^%%%%%_%%%__^^^______",  # NU
+    "%^^%%%^^^__%%%_%%%__^^^______",  # AL
+    "%^^%%%^^^__%%%_%%%__^^^______",  # HL
+    "_^^%%%^^^_%____%%%__^^^______",  # ID
+    "_^^%%%^^^______%%%__^^^______",  # IN
+    "_^^%_%^^^__%____%%__^^^______",  # HY
+    "_^^%_%^^^_______%%__^^^______",  # BA
+    "%^^%%%^^^%%%%%%%%%%%^^^%%%%%%",  # BB
+    "_^^%%%^^^_______%%_^^^^______",  # B2
+    "____________________^________",  # ZW
+    "%^^%%%^^^__%%%_%%%__^^^______",  # CM
+    "%^^%%%^^^%%%%%%%%%%%^^^%%%%%%",  # WJ
+    "_^^%%%^^^_%____%%%__^^^___%%_",  # H2
+    "_^^%%%^^^_%____%%%__^^^____%_",  # H3
+    "_^^%%%^^^_%____%%%__^^^%%%%__",  # JL
+    "_^^%%%^^^_%____%%%__^^^___%%_",  # JV
+    "_^^%%%^^^_%____%%%__^^^____%_",  # JT
+    "_^^%%%^^^_______%%__^^^_____%",  # RI
+)
+_ACTION = {'_': DIRECT, '%': INDIRECT, '^': PROHIBITED}
+PAIR_TABLE = bytes(_ACTION[c] for row in _PAIR_ROWS for c in row)
+PAIR_WIDTH = len(_PAIR_ROWS)
+
+def line_break_class(ch: str) -> int:
+    cp = ord(ch)
+    return STAGE2[(STAGE1[cp >> SHIFT] << SHIFT) | (cp & MASK)]
+
+def find_breaks(text: str):
+    """Oportunidades de quebra em 'text'.
+
+    Devolve (offsets, mandatory): offsets[k] é a posição antes da qual a linha
+    pode quebrar (os espaços ficam no fim do segmento anterior) e mandatory[k]
+    vale 1 quando a quebra é obrigatória (w:br, fim do texto). O último offset
+    é sempre len(text).
+    """
+    offsets = array('I')
+    mandatory = bytearray()
+    n = len(text)
+    if n == 0:
+        return offsets, mandatory
+
+    stage1 = STAGE1
+    stage2 = STAGE2
+    pair = PAIR_TABLE
+
+    cp = ord(text[0])
+    cls = stage2[(stage1[cp >> SHIFT] << SHIFT) | (cp & MASK)]
+    if cls == SP:
+        cls = WJ
+    elif cls == LF or cls == NL:
+        cls = BK
+    elif cls == CM:
+        cls = AL
+    prev = cls
+
+    for i in range(1, n):
+        cp = ord(text[i])
+        cur = stage2[(stage1[cp >> SHIFT] << SHIFT) | (cp & MASK)]
+
+        # LB4/LB5: quebra obrigatória depois de BK, CR (exceto CR LF), LF e NL
+        if cls == BK or (cls == CR and cur != LF):
+            offsets.append(i)
+            mandatory.append(1)
+            if cur == SP:
+                cur = WJ
+            elif cur == CM:
+                cur = AL
+            cls = BK if (cur == LF or cur == NL) else cur
+            prev = cls
+            continue
+
+        # LB6/LB7: nunca quebra antes de terminadores de linha ou de espaços
+        if cur == BK or cur == LF or cur == NL:
+            cls = BK
+            prev = cur
+            continue
+        if cur == CR:
+            cls = CR
+            prev = cur
+            continue
+        if cur == SP:
+            prev = SP
+            continue
+
+        # LB9/LB10: marcas combinantes grudam na base, a não ser após espaço
+        if cur == CM:
+            if prev != SP:
+                prev = cur
+                continue
+            cur = AL
+
+        action = pair[cls * PAIR_WIDTH + cur]
+        if action == DIRECT or (action == INDIRECT and prev == SP):
+            offsets.append(i)
+            mandatory.append(0)
+        cls = cur
+        prev = cur
+
+    offsets.append(n)
+    mandatory.append(1)
+    return offsets, mandatory
@@ -0,0 +1,55 @@
+# pydocx_render/layout/linebreak_data.py
+# Gerado por tools/gen_linebreak_tables.py a partir do LineBreak.txt. NÃO EDITE.
+# Unicode 14.0.0 (categorias gerais para a resolução de SA).
+
+SHIFT = 7
+
+CLASS_NAMES = ('OP', 'CL', 'CP', 'QU', 'GL', 'NS', 'EX', 'SY', 'IS', 'PR', 'PO', 'NU', 'AL', 'HL', 'ID', 'IN', 'HY', 'BA', 'BB', 'B2', 'ZW', 'CM', 'WJ', 'H2', 'H3', 'JL', 'JV', 'JT', 'RI', 'BK', 'CR', 'LF', 'NL', 'SP')
+
+# uint16 little-endian, zlib + base64
+STAGE1 = (
+    'eNrt1eVzFEEQxuEfi7u7S3B3CwESNECCu7u7JkAIcgnu7u7u+q/RNTU5clw+pJBL4N56qmd6Zntu'
+    'ZXbroASBU5JSri9tUYaylKM8FahIJSpThapUozo1qEktalOHutSjPg1oSCMa08StbGrRzP9aQHNa'
+    '0JJWJNCaNrSlHe3pQEc62bHOvqYLXelGd8t60JNe9A6v7kNf+tHfjwaE5wMGksggkhjMEIaSTArD'
+    'GM4IG8XOyJie7X82KmpmtNvlVMa4fizjSCOd8Uyw0UQmMZkpTGUa05lR7Ecz8723RSfvyc7y49nM'
+    'YS7zmM8CN17IImsXs4Sl1i+LWLvcYoXFSlax2s+tce1a1rGeDWxkE5vZwla2sZ0dZNixTHayi92W'
+    'ZbGHbPayj/0cIEQOuRzkkB05zBGORl3rsV+8x+Oc4KT1p/7IEzsd0/05U4ias5zjvM8vuPYil7j8'
+    'l7/OKxGjvGu5Wize6h/v9jXXXi/kihu/ecZQOLvp+1vc5k6BtXfD2T3uF1jxgIc8ctljP/PE4mm+'
+    'imc8j1jxIur+A176HXpl8Zo3vOWdZe/54Go+Wv7J1YV+2t/P+gcSiVv6/kXi+fsPRERERERERERE'
+    'REREREREREREROSf88XiK9/0JERERERE4sB3QsztSw=='
+)
+
+# uint8, zlib + base64
+STAGE2 = (
+    'eNrtHIl6sygQG2WjmZrFLv+e3eP9X3K5VEBAQUTTr5PWmEAYZphblFIF5J/Pz7/pAv7DN2g7uKE3'
+    'aO8/3396THC/AwAGP6D2DUKASAUSyb/UCzXq2rYV/W9AADp2PoD6zMaAbxAwwMQX++sg0LxQGx8k'
+    'GB1M7HdtCicz8E74sY1jCKGsP/vD0+zf/TA2G2ilLrGTruu4RmmDY4oxjqDAOcNZXzuBpgSb8TiV'
+    'B4xLK7jET+b5+KhIltcDKfJjWaXHMYgQN76yVFk2Z1et//QpbsoplCo6EpjqW5bHqhYlr4kD59Ka'
+    'MC0lgVXaITgaMvlPXVJsS33Xia87ZmuA5sA/IpGn1L2qIyz65KB/klD3Ohn0t6a8HMJ/a/3DWkr3'
+    '2gVNFn2DOvC35gj76LfwUwor9A86CUNZ/HRh6VKZ78Mf1D8F3X75d8jROB8wbZuOfyc+agRMrWV8'
+    'NUyEHOMK3c5h/CLCHypJZMAO9TCQGnOoRVLh4twIRDAYVahK4KUdwKnjws1vCf9g5DHVyCFSner6'
+    'wCCErqz37BaUgZ0XbKFwpvfUPUWJmPz3g+GPTPDnQXAoc4WIhrsQOBcC+FGVGdU2i7gm99xekLBb'
+    'WnNbBxgCw6iRhvGVtLDJHmNMmMnCImmrabT9ziOnG91rebDzFFfegvEpXINwpP/YTXYGpsFK4reQ'
+    't7Xp504lU37lR6obBkJ6ZnFIP8HUf/qGNVMaU/BIiK/AJ7U7Aw9hT5eZddz88seoXpnTbAjNGfV7'
+    'q5/biqVnF42JhJr9/yJ8Bzv74MX1G7rxf97t+XySz0855U4B6wBNo0qnqGrGc7WuHR+UD/7DNggh'
+    'D+/w+K2ErjWgU4fObmgTik2dkQ/qyfkp0LbwdeHpD/bsxe/7Q6PBk4Cb/dDnkfIepIsIDRSFN+rr'
+    'CGJGkKPxE3EuadBn2Wu/UWRrv12hNgVuAlh01iv5ml+ZF3V1wCBmc2qZprhliBNUajbAmDsIXDz9'
+    'JIWzijV3dDNAeWPmORHhAiz8sBII/j0G4VXFyB8f0sWi+UeyCWP0Jl8kToVNCDTthG34Xxm285tU'
+    'Vd83fT8r/nzeIN5opg/yVBybhmNq+vHlg2Zlstqvx7eGCy6L6RqO5Ijx5ZG9xwrBwQIDB8uDIFqH'
+    'XPM5S59yxEPREnUgMWXZYOW/ZOkPM1eWrJpMjsJcdKlPOivDBdOQL7bT92W6Fpv2DvO+mjz1kHk9'
+    '7fUKJaCDo/4Vxuitl3hT3ODFEUi6/mrimipZQg2IM4ejGeTZw0ReQhsDIJuSnqwU6lPWHqb9BlJ6'
+    'aBwFYkZlyz7atc4l/3/9zQ/fbd9t323Htm3poyuz5/I0b8p/7fmdartXzb2s6gjv6k/f5FoOqpfe'
+    '/9054oOqqpqGZfCVqpTWVLymN+Ft7VoR/0YFolVfAR+gH1vGPKLt+guy4Afgnk9NEMDmricBPAvA'
+    'gZgbGd3d7SyDZn9NvznhshKRZmvG4Hzna9yyd1dJn+fysHlTwtcE+iVQHHl5PVo4ckvTdXY2nMIG'
+    'UkIUQNt+GFlIp8uKArHy60uIuzW/Z4aVKUenvi7J+x1kCrZvGuQ4urJd5ThxFvsuSO0qR6h9Pr6K'
+    'puGPdIzRW0DMzUCi6qEZ63h7vhF/YNcx08E4Gqh+V2IC/5eVIH7tS1U2NfqG3MGVuceSY6XlAgyy'
+    'e8q+9U+//4JY99/YYRcZjb+5/TwDy3pth+F4I4qihU57EA4qYfuKukIVzP34tABqk8CD4zVtwRUM'
+    'hIhqOjGhGOstFbfpH3TIiHo9HsiwEo511kctHeaVu9/2uvnLtK1ZuS4q7i+9ULhtayhzg3TbosZi'
+    'ENov9F5HkSwgS8UmXHsP5m0u4/AqsFMfFvv67au5a+MPOFYOnDcSnK1fIDUftCBkL38nwxL0L68P'
+    'xPDaUVdQbRMHeu7lyLTOBrFR/uT6kqtsUgAPQqiqNu0v5Z0O2JN7dUBVCsVIPVMHVeKAKnqp0Cz3'
+    'KhZ9yEsBf5tf9WL9w94ypBacOY3Ytf1V8EkwZsfXtCo09YFesLsc5AZ+ybU25Mcq5Jy8QzvbRtbU'
+    'Qlb03tJmjd+LLo12d95r7JI3K4wFaxqrWlL+2WO5iPSnVtuewHdVMq80rUc07DDXyUbeTo2oql17'
+    'EtJDBd37nAC9CYrp2OXjS3sZysZbdPfcrfm2pXl3bnxqXDotIh+lZdIkD2Xdn9nBvvs+ikRrTvjL'
+    'C+H4KNxQIpiDHnQ80GcOIT2MDbA999oUyC2c7Wfej3e73awndpylRWer6dkSdCUrdQr16c97/ob0'
+    'Os8E/wMLuSiz'
+)
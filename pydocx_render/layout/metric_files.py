@@ -0,0 +1,236 @@
+# pydocx_render/layout/metric_files.py
+# Arquivos de métricas pré-compilados, mapeados com mmap.
+#
+# Sem eles cada processo de trabalho abre as mesmas fontes no FreeType e monta
+# as mesmas tabelas de avanço e de cobertura, e o custo de inicialização e a
+# memória crescem com o número de processos. Com um diretório de métricas
+# (set_metrics_dir ou a variável PYDOCX_METRICS_DIR, herdada pelos processos
+# filhos) as tabelas são views sobre um mmap somente leitura: todos os
+# processos compartilham as mesmas páginas físicas e nenhum toca no FreeType.
+#
+# Um arquivo por fonte, gerado offline por
+#     python -m pydocx_render.layout.metric_files compile-metrics DIR [fontes...]
+# ou na primeira vez que a fonte é pedida. Formato:
+#
+#   cabeçalho   struct HEADER (magic, versão, medidas verticais, tamanho,
+#               mtime e sha256 da fonte de origem)
+#   avanços     int32[65536]        avanço de cada code point do BMP; -1 = fora do cmap
+#   cobertura   uint8[8192]         bitmap do cmap no BMP (FontCoverage.bmp)
+#   astrais     uint32[n_astral]    code points acima do BMP, em ordem
+#               int32[n_astral]     e os seus avanços
+#
+# Um arquivo de outra versão ou de outra fonte é recompilado: o tamanho e o
+# mtime da fonte são conferidos a cada carga e, se mudaram, o sha256 decide.
+# Kerning não é gravado: o layout e o desenho (PyMuPDF e Pillow no modo
+# BASIC) não aplicam kerning, e as larguras têm de bater com o desenho.
+
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from ..disk_cache import atomic_write
+from .advance_tables import BMP_LIMIT, AdvanceTable, _build_table
+from .font_fallback import FontCoverage
+
+MAGIC = b'PDXM'
+# 2: a tabulação tem o avanço do espaço
+FORMAT_VERSION = 2
+# magic, versão, flags, units_per_em, ascender, descender, default_advance,
+# n_astral, tamanho da fonte, mtime da fonte (ns), sha256 da fonte
+HEADER = struct.Struct('<4sHHiiiiIqq32s')
+METRICS_SUFFIX = '.pdxm'
+COVERAGE_BYTES = BMP_LIMIT >> 3
+
+_LITTLE_ENDIAN = sys.byteorder == 'little'
+
+@dataclass
+class FaceMetrics:
+    """Tabela de avanços e cobertura de uma fonte, lidas de um arquivo de métricas."""
+    table: AdvanceTable
+    coverage: FontCoverage
+    path: Optional[str] = None
+
+_metrics_dir = os.environ.get('PYDOCX_METRICS_DIR') or None
+_faces: Dict[Tuple[str, str], FaceMetrics] = {}
+_lock = threading.Lock()
+
+def set_metrics_dir(metrics_dir: Optional[str]):
+    """Passa a carregar (e gravar) as métricas em 'metrics_dir'; None desliga."""
+    global _metrics_dir
+    _metrics_dir = metrics_dir
+
+def current_metrics_dir() -> Optional[str]:
+    """Diretório de métricas em uso (None se desligado)."""
+    return _metrics_dir
+
+def metrics_path(metrics_dir: str, font_path: str) -> str:
+    """Arquivo de métricas da fonte: nome do arquivo + hash do caminho absoluto."""
+    font_path = os.path.abspath(font_path)
+    stem = os.path.splitext(os.path.basename(font_path))[0]
+    tag = hashlib.sha1(font_path.encode('utf-8')).hexdigest()[:12]
+    return os.path.join(metrics_dir, f'{stem}-{tag}{METRICS_SUFFIX}')
+
+def file_sha256(path: str) -> bytes:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as source:
+        for chunk in iter(lambda: source.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+def _to_le_bytes(values: array) -> bytes:
+    if not _LITTLE_ENDIAN:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+def _table_view(view: memoryview, start: int, count: int, typecode: str):
+    raw = view[start:start + 4 * count]
+    if _LITTLE_ENDIAN:
+        return raw.cast(typecode)
+    table = array(typecode, raw)
+    table.byteswap()
+    return table
+
+def dump_metrics(table: AdvanceTable, font_path: str) -> bytes:
+    """Serializa a tabela da fonte no formato dos arquivos de métricas."""
+    stat = os.stat(font_path)
+    advances = table.advances
+    astral = sorted(cp for cp in advances if cp >= BMP_LIMIT)
+    # A cobertura do cmap são as mesmas chaves da tabela (glifo != 0)
+    coverage = FontCoverage(advances)
+    header = HEADER.pack(
+        MAGIC, FORMAT_VERSION, 0,
+        table.units_per_em, table.ascender, table.descender, table.default_advance,
+        len(astral), stat.st_size, stat.st_mtime_ns, file_sha256(font_path),
+    )
+    return b''.join((
+        header,
+        _to_le_bytes(array('i', table.bmp_advances)),
+        coverage.bmp,
+        _to_le_bytes(array('I', astral)),
+        _to_le_bytes(array('i', (advances[cp] for cp in astral))),
+    ))
+
+def load_metrics(buffer, font_path: str) -> Optional[FaceMetrics]:
+    """Tabela e cobertura sobre o buffer (bytes ou mmap); None se for de outra versão ou fonte."""
+    view = memoryview(buffer)
+    (magic, version, _flags, units_per_em, ascender, descender, default_advance,
+     n_astral, source_size, source_mtime_ns, source_sha256) = HEADER.unpack_from(view, 0)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        return None
+    stat = os.stat(font_path)
+    if (stat.st_size, stat.st_mtime_ns) != (source_size, source_mtime_ns):
+        # Fonte copiada ou tocada: só o conteúdo decide
+        if stat.st_size != source_size or file_sha256(font_path) != source_sha256:
+            return None
+
+    pos = HEADER.size
+    bmp_advances = _table_view(view, pos, BMP_LIMIT, 'i')
+    pos += 4 * BMP_LIMIT
+    bmp_coverage = view[pos:pos + COVERAGE_BYTES]
+    pos += COVERAGE_BYTES
+    astral_codepoints = _table_view(view, pos, n_astral, 'I').tolist()
+    pos += 4 * n_astral
+    astral_advances = _table_view(view, pos, n_astral, 'i').tolist()
+
+    table = AdvanceTable(
+        font_path=font_path,
+        units_per_em=units_per_em,
+        advances=None,
+        default_advance=default_advance,
+        ascender=ascender,
+        descender=descender,
+        bmp_advances=bmp_advances,
+        astral_advances=dict(zip(astral_codepoints, astral_advances)),
+    )
+    return FaceMetrics(table, FontCoverage.from_bitmap(bmp_coverage, astral_codepoints))
+
+def _open_metrics(path: str, font_path: str) -> Optional[FaceMetrics]:
+    try:
+        with open(path, 'rb') as metrics_file:
+            # O mmap continua vivo enquanto as views da tabela existirem
+            mapped = mmap.mmap(metrics_file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        metrics = load_metrics(mapped, font_path)
+    except (OSError, ValueError, struct.error):
+        metrics = None
+    if metrics is None:
+        # Sem close(): uma view ainda presa num traceback o faria falhar; o
+        # mmap é liberado com a última referência
+        return None
+    metrics.path = path
+    return metrics
+
+def compile_metrics(font_path: str, metrics_dir: str) -> str:
+    """Mede a fonte com o FreeType e grava o arquivo de métricas; devolve o caminho."""
+    os.makedirs(metrics_dir, exist_ok=True)
+    path = metrics_path(metrics_dir, font_path)
+    atomic_write(path, dump_metrics(_build_table(font_path), font_path))
+    # Legível pelos processos de trabalho de outros usuários
+    os.chmod(path, 0o644)
+    return path
+
+def face_metrics(font_path: str) -> Optional[FaceMetrics]:
+    """Métricas da fonte pelo diretório configurado; None se não houver diretório.
+
+    Um arquivo ausente ou desatualizado é recompilado na hora.
+    """
+    metrics_dir = _metrics_dir
+    if metrics_dir is None:
+        return None
+    key = (metrics_dir, font_path)
+    metrics = _faces.get(key)
+    if metrics is not None:
+        return metrics
+    with _lock:
+        metrics = _faces.get(key)
+        if metrics is None:
+            path = metrics_path(metrics_dir, font_path)
+            metrics = _open_metrics(path, font_path)
+            if metrics is None:
+                try:
+                    compile_metrics(font_path, metrics_dir)
+                except OSError as e:
+                    print(f"AVISO: não foi possível gravar as métricas de '{font_path}': {e}")
+                    table = _build_table(font_path)
+                    metrics = FaceMetrics(table, FontCoverage(table.advances))
+                else:
+                    metrics = _open_metrics(path, font_path)
+            _faces[key] = metrics
+    return metrics
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m pydocx_render.layout.metric_files',
+                                     description='Arquivos de métricas pré-compilados.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    compile_parser = commands.add_parser('compile-metrics',
+                                         help='compila as métricas das fontes (padrão: as do renderizador)')
+    compile_parser.add_argument('metrics_dir')
+    compile_parser.add_argument('fonts', nargs='*')
+    compile_parser.add_argument('--force', action='store_true',
+                                help='recompila também os arquivos em dia')
+    args = parser.parse_args()
+
+    fonts = args.fonts
+    if not fonts:
+        from ..renderer import find_fallback_fonts, find_font_file
+        fonts = [find_font_file(style) for style in ('regular', 'bold', 'italic', 'bold_italic')]
+        fonts += find_fallback_fonts()
+    for font_path in fonts:
+        path = metrics_path(args.metrics_dir, font_path)
+        if not args.force and _open_metrics(path, font_path) is not None:
+            print(f"INFO: {path} em dia.")
+            continue
+        compile_metrics(font_path, args.metrics_dir)
+        print(f"INFO: {font_path} -> {path}")
+
+if __name__ == '__main__':
+    main()
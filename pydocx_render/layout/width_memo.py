@@ -0,0 +1,115 @@
+# pydocx_render/layout/width_memo.py
+# Memo das larguras de palavras, compartilhado por todos os FontMetrics.
+#
+# A frequência das palavras segue a lei de Zipf: poucos milhares de tokens
+# distintos respondem pela maior parte das medidas que layout_paragraph faz.
+# Onde medir é caro, a largura de um token é guardada aqui, com a chave
+# (token, fonte, tamanho). Os tokens são internados, então cada palavra
+# repetida ocupa a memória uma vez só. O tamanho é limitado e a remoção segue
+# o algoritmo do relógio (CLOCK, uma aproximação barata de LRU): cada entrada
+# tem um bit de uso, marcado a cada acerto; na inserção com o memo cheio, o
+# ponteiro avança limpando bits até achar uma entrada não usada desde a
+# última volta.
+#
+# Onde o memo entra:
+#   - motor Cython: só nos tokens que saem do caminho rápido em C (fora do
+#     BMP ou com fallback). Os demais são somados em C em menos tempo do que
+#     custa criar a substring da chave;
+#   - motor Python puro com tabela de avanços (modo rascunho): em todo token,
+#     porque ali a soma é um laço em Python.
+#
+# Leitura sem trava (uma consulta ao dict); inserção e remoção sob uma trava.
+# Com várias threads as contagens de acertos são aproximadas.
+
+import os
+import sys
+import threading
+from dataclasses import dataclass
+
+DEFAULT_CAPACITY = 16384
+# Trechos maiores que isso não são palavras: medidos sem passar pelo memo
+MAX_TOKEN_LENGTH = 64
+
+@dataclass
+class MemoStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+    capacity: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __str__(self):
+        return (f"memo de larguras: {self.hit_rate:.1%} de acertos ({self.hits} de "
+                f"{self.hits + self.misses}), {self.size}/{self.capacity} entradas, "
+                f"{self.evictions} removidas")
+
+class WidthMemo:
+    """Larguras por (token, fonte, tamanho), limitado a 'capacity' entradas (0 = desligado)."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self._lock = threading.Lock()
+        self.resize(capacity)
+
+    def resize(self, capacity: int):
+        """Troca a capacidade; as entradas e as contagens são descartadas."""
+        with self._lock:
+            self.capacity = max(0, capacity)
+            # chave -> (largura, posição no relógio): a largura viaja junto
+            # com a chave, então uma leitura sem trava nunca pega a largura de
+            # uma entrada que acabou de ocupar a mesma posição
+            self._entries = {}
+            self._keys = [None] * self.capacity
+            self._used = bytearray(self.capacity)
+            self._hand = 0
+            self.hits = self.misses = self.evictions = 0
+
+    @staticmethod
+    def key(token: str, face: str, size: float):
+        return (sys.intern(token), face, size)
+
+    def get(self, token: str, face: str, size: float):
+        """Largura guardada, ou None."""
+        entry = self._entries.get((token, face, size))
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._used[entry[1]] = 1
+        return entry[0]
+
+    def put(self, token: str, face: str, size: float, width: float):
+        if not self.capacity:
+            return
+        key = self.key(token, face, size)
+        with self._lock:
+            entries = self._entries
+            if key in entries:
+                return
+            if len(entries) < self.capacity:
+                slot = len(entries)
+            else:
+                used = self._used
+                hand = self._hand
+                while used[hand]:
+                    used[hand] = 0
+                    hand = (hand + 1) % self.capacity
+                slot = hand
+                self._hand = (hand + 1) % self.capacity
+                del entries[self._keys[slot]]
+                self.evictions += 1
+            self._keys[slot] = key
+            self._used[slot] = 0
+            entries[key] = (width, slot)
+
+    def stats(self) -> MemoStats:
+        return MemoStats(self.hits, self.misses, self.evictions, len(self._entries), self.capacity)
+
+    def reset_stats(self):
+        self.hits = self.misses = self.evictions = 0
+
+WIDTH_MEMO = WidthMemo(int(os.environ.get('PYDOCX_WIDTH_MEMO', DEFAULT_CAPACITY)))
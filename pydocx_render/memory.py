@@ -0,0 +1,42 @@
+# pydocx_render/memory.py
+# Medição de memória do processo (RSS) sem dependências obrigatórias.
+#
+# Linux/macOS usam o módulo 'resource' e /proc; no Windows recorremos ao
+# psutil, se estiver instalado. Quando nada está disponível, devolvemos None.
+
+import os
+import sys
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+def peak_rss_mb():
+    """Pico de RSS do processo atual, em MB (ou None se não for mensurável)."""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss vem em bytes no macOS e em KB no Linux
+        if sys.platform == 'darwin':
+            return peak / (1024 * 1024)
+        return peak / 1024
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / (1024 * 1024)
+    return None
+
+def current_rss_mb():
+    """RSS atual do processo, em MB (ou None se não for mensurável)."""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    try:
+        with open('/proc/self/statm') as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return peak_rss_mb()
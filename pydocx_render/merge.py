@@ -0,0 +1,276 @@
+# pydocx_render/merge.py
+# Modo mala direta: um modelo .docx, milhares de variantes.
+#
+# O modelo é lido e diagramado uma única vez: parágrafos sem campos guardam as
+# linhas já quebradas e são reaproveitados em todos os registros. Por registro,
+# só os parágrafos com campos (MERGEFIELD ou {{nome}}) são preenchidos, e só
+# são quebrados de novo quando o texto preenchido muda. Cada seção do modelo é
+# diagramada na sua geometria, e o cabeçalho e o rodapé de cada uma viram um
+# único carimbo (Form XObject) compartilhado por todos os registros.
+
+import re
+import time
+import zipfile
+from dataclasses import dataclass, replace
+from typing import Iterable, Iterator, List, Mapping, Optional, Sequence
+from lxml import etree
+from .core.dom import Document, Paragraph
+from .core.headers import assign_furniture, field_code, parse_field_paragraph, section_references
+from .core.normalize import merge_runs
+from .core.parser import NSMAP
+from .core.sections import parse_section, section_ranges
+from .renderer import (_FITZ_LOCK, PageModel, RenderStats, _PdfWriter, _draw_page,
+                       _layout_furniture, _make_context, _number_pages, _paginate,
+                       _section_furniture, _stamp_for, layout_paragraph)
+
+MERGE_PREFIX = 'MERGEFIELD:'
+# Marcador textual, para modelos feitos sem o assistente de mala direta
+PLACEHOLDER = re.compile(r'\{\{\s*([^{}\s]+)\s*\}\}')
+
+def merge_field_code(instr: str) -> Optional[str]:
+    """'MERGEFIELD Nome \\* MERGEFORMAT' -> 'MERGEFIELD:Nome'; PAGE como nos cabeçalhos."""
+    words = instr.split()
+    if len(words) >= 2 and words[0].upper() == 'MERGEFIELD':
+        return MERGE_PREFIX + words[1].strip('"')
+    return field_code(instr)
+
+def parse_template(file_path: str, normalize: bool = True) -> Document:
+    """Lê o modelo como parse_docx, mas mantendo os campos de mala direta no corpo."""
+    doc = Document()
+    references = []
+    with zipfile.ZipFile(file_path, 'r') as docx_zip:
+        root = etree.fromstring(docx_zip.read('word/document.xml'))
+        body = root.find('w:body', NSMAP)
+        for p_node in body.findall('w:p', NSMAP):
+            para = parse_field_paragraph(p_node, merge_field_code)
+            if normalize:
+                para.runs = merge_runs(para.runs)
+            if para.runs:
+                doc.body.append(para)
+            sect_pr = p_node.find('w:pPr/w:sectPr', NSMAP)
+            if sect_pr is not None:
+                doc.sections.append(parse_section(sect_pr, len(doc.body)))
+                references.append(section_references(sect_pr))
+        # Sempre ao menos uma seção: a final (w:body/w:sectPr)
+        body_sect_pr = body.find('w:sectPr', NSMAP)
+        doc.sections.append(parse_section(body_sect_pr, len(doc.body)))
+        references.append(section_references(body_sect_pr))
+        assign_furniture(doc, docx_zip, references, normalize)
+    return doc
+
+def field_names(para: Paragraph) -> List[str]:
+    """Nomes dos campos usados no parágrafo, na ordem em que aparecem."""
+    names = []
+    for run in para.runs:
+        if run.field_code and run.field_code.startswith(MERGE_PREFIX):
+            names.append(run.field_code[len(MERGE_PREFIX):])
+        else:
+            names.extend(PLACEHOLDER.findall(run.text))
+    return names
+
+def fill_runs(para: Paragraph, record: Mapping) -> list:
+    """Runs do parágrafo com os campos substituídos pelos valores do registro."""
+    runs = []
+    for run in para.runs:
+        if run.field_code and run.field_code.startswith(MERGE_PREFIX):
+            text = str(record.get(run.field_code[len(MERGE_PREFIX):], ''))
+            if text:
+                runs.append(replace(run, text=text, field_code=None))
+        elif '{{' in run.text:
+            text = PLACEHOLDER.sub(lambda match: str(record.get(match.group(1), '')), run.text)
+            if text:
+                runs.append(replace(run, text=text))
+        else:
+            runs.append(run)
+    return runs
+
+@dataclass
+class MergeStats:
+    records: int = 0
+    pages: int = 0
+    # Parágrafos com campos quebrados de novo x reaproveitados do registro anterior
+    relaid_paragraphs: int = 0
+    reused_paragraphs: int = 0
+    seconds: float = 0.0
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return (f"{self.records} registros, {self.pages} páginas em {self.seconds:.2f}s "
+                f"({self.records_per_second:.1f} registros/s)")
+
+def _layout(ctx, runs, alignment):
+    return layout_paragraph(runs, ctx.metrics, ctx.max_width, ctx.font_size, alignment)
+
+class _DynamicParagraph:
+    """Parágrafo com campos e as linhas do último preenchimento."""
+
+    __slots__ = ('paragraph', 'last_key', 'last_lines')
+
+    def __init__(self, paragraph: Paragraph):
+        self.paragraph = paragraph
+        self.last_key = None
+        self.last_lines = None
+
+class _MergeSection:
+    """Seção do modelo: geometria, cabeçalho/rodapé já diagramados e os blocos do corpo."""
+
+    __slots__ = ('section', 'ctx', 'furniture', 'blocks')
+
+    def __init__(self, section, ctx, furniture, blocks):
+        self.section = section
+        self.ctx = ctx
+        self.furniture = furniture
+        # Cada bloco é a lista de linhas (parágrafo fixo) ou um _DynamicParagraph
+        self.blocks = blocks
+
+class MergeTemplate:
+    """Modelo de mala direta: parse e layout uma vez, um PDF (ou trecho de PDF) por registro.
+
+    Uso:
+        with MergeTemplate('carta.docx') as template:
+            template.render_each(registros, 'saida/carta_{index:05d}.pdf')
+            template.render_all(registros, 'saida/todas.pdf')
+    """
+
+    def __init__(self, file_path: str, fallback_fonts: Optional[Sequence[str]] = None,
+                 draft: bool = False):
+        doc = self.document = parse_template(file_path)
+        self.ctx = _make_context(fallback_fonts, draft)
+        self.stats = MergeStats()
+        self.fields = []
+        # Carimbo de cada cabeçalho/rodapé diagramado (id de _MergeSection.furniture)
+        self._stamps = {}
+
+        # Cada seção na sua geometria, como em render
+        self._sections = []
+        for start, end, section in section_ranges(doc.sections, len(doc.body)):
+            ctx = self.ctx.for_section(section)
+            header, footer = _section_furniture(section, doc.header, doc.footer)
+            blocks = []
+            for para in doc.body[start:end]:
+                names = field_names(para)
+                if names:
+                    self.fields.extend(name for name in names if name not in self.fields)
+                    blocks.append(_DynamicParagraph(para))
+                else:
+                    blocks.append(_layout(ctx, para.runs, para.alignment))
+            self._sections.append(_MergeSection(section, ctx, _layout_furniture(header, footer, ctx),
+                                                blocks))
+
+    def _line_groups(self, part: _MergeSection, record: Mapping, stats: MergeStats) -> Iterator[list]:
+        for block in part.blocks:
+            if not isinstance(block, _DynamicParagraph):
+                yield block
+                continue
+            runs = fill_runs(block.paragraph, record)
+            key = tuple((run.text, run.is_bold, run.is_italic, run.size) for run in runs)
+            if key != block.last_key:
+                block.last_key = key
+                block.last_lines = _layout(part.ctx, runs, block.paragraph.alignment)
+                stats.relaid_paragraphs += 1
+            else:
+                stats.reused_paragraphs += 1
+            yield block.last_lines
+
+    def page_models(self, record: Mapping, stats: Optional[MergeStats] = None) -> Iterator[PageModel]:
+        """Páginas do registro, sem desenhar nada."""
+        stats = stats or self.stats
+        return _number_pages(
+            (part.section, _paginate(self._line_groups(part, record, stats), part.furniture, part.ctx))
+            for part in self._sections)
+
+    def _draw_record(self, writer: _PdfWriter, record: Mapping, stats: MergeStats):
+        for model in self.page_models(record, stats):
+            key = id(model.furniture)
+            if key not in self._stamps:
+                self._stamps[key] = _stamp_for(model, self.ctx)
+            stamp = self._stamps[key]
+            page = writer.new_page(model.width, model.height)
+            with _FITZ_LOCK:
+                if stamp is not None:
+                    stamp.apply(page, model.number)
+                _draw_page(page, model, self.ctx)
+            stats.pages += 1
+        stats.records += 1
+
+    def render(self, record: Mapping, output_path: str) -> RenderStats:
+        """Um PDF para um único registro."""
+        merge_stats = MergeStats()
+        start = time.perf_counter()
+        writer = _PdfWriter(output_path)
+        try:
+            self._draw_record(writer, record, merge_stats)
+            stats = writer.close()
+        finally:
+            writer.cleanup()
+        merge_stats.seconds = time.perf_counter() - start
+        self._accumulate(merge_stats)
+        return stats
+
+    def render_each(self, records: Iterable[Mapping], output_path) -> MergeStats:
+        """Um PDF por registro.
+
+        'output_path' é um padrão com {index} (e os campos do registro, ex.:
+        'cartas/{index:05d}_{Nome}.pdf'; {index} é sempre a posição, mesmo que o
+        registro tenha um campo 'index') ou uma função (index, registro) -> caminho.
+        """
+        stats = MergeStats()
+        start = time.perf_counter()
+        for index, record in enumerate(records):
+            if callable(output_path):
+                path = output_path(index, record)
+            else:
+                path = output_path.format(**{**record, 'index': index})
+            writer = _PdfWriter(path)
+            try:
+                self._draw_record(writer, record, stats)
+                writer.close()
+            finally:
+                writer.cleanup()
+        stats.seconds = time.perf_counter() - start
+        self._accumulate(stats)
+        return stats
+
+    def render_all(self, records: Iterable[Mapping], output_path: str,
+                   pages_per_chunk: Optional[int] = None,
+                   memory_limit_mb: Optional[float] = None) -> MergeStats:
+        """Todos os registros num único PDF, com as fontes embutidas uma só vez.
+
+        A numeração de página (campo PAGE) recomeça em cada registro. Para
+        dezenas de milhares de registros use 'pages_per_chunk'/'memory_limit_mb'
+        (modo de memória limitada de render_to_pdf).
+        """
+        stats = MergeStats()
+        start = time.perf_counter()
+        writer = _PdfWriter(output_path, pages_per_chunk, memory_limit_mb)
+        try:
+            for record in records:
+                self._draw_record(writer, record, stats)
+            writer.close()
+        finally:
+            writer.cleanup()
+        stats.seconds = time.perf_counter() - start
+        self._accumulate(stats)
+        return stats
+
+    def _accumulate(self, stats: MergeStats):
+        self.stats.records += stats.records
+        self.stats.pages += stats.pages
+        self.stats.relaid_paragraphs += stats.relaid_paragraphs
+        self.stats.reused_paragraphs += stats.reused_paragraphs
+        self.stats.seconds += stats.seconds
+
+    def close(self):
+        for stamp in self._stamps.values():
+            if stamp is not None:
+                stamp.close()
+        self._stamps.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,109 @@
+# pydocx_render/output_cache.py
+# Cache endereçado por conteúdo para conversões idênticas.
+#
+# Boa parte do tráfego converte arquivos .docx byte a byte iguais com as mesmas
+# configurações. A chave combina o hash do arquivo de entrada, as opções de
+# renderização, as versões da biblioteca, do PyMuPDF e das fontes usadas, o
+# motor de layout (Cython ou Python puro, que paginam diferente) e o
+# diretório dos arquivos de métricas; num acerto, o PDF guardado é devolvido sem parsing nem renderização.
+
+import hashlib
+import json
+import os
+import shutil
+from . import __version__
+from .disk_cache import atomic_copy, evict_lru, touch
+
+CACHE_SUFFIX = '.pdf'
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as source:
+        for chunk in iter(lambda: source.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def environment_fingerprint() -> dict:
+    """Versões de tudo que influencia os bytes do PDF gerado."""
+    import fitz
+    from .layout import metric_files
+    from .renderer import find_fallback_fonts, find_font_file, layout_paragraph
+
+    def describe(font_path):
+        stat = os.stat(font_path)
+        return [font_path, stat.st_size, int(stat.st_mtime)]
+
+    fonts = {}
+    for style in ('regular', 'bold', 'italic', 'bold_italic'):
+        try:
+            fonts[style] = describe(find_font_file(style))
+        except (FileNotFoundError, OSError):
+            fonts[style] = None
+    fonts['fallback'] = [describe(path) for path in find_fallback_fonts()]
+
+    return {
+        'pydocx_render': __version__,
+        'pymupdf': getattr(fitz, 'VersionBind', None),
+        'fonts': fonts,
+        # line_breaker (Cython) ou line_breaker_pure: o mesmo .docx pagina diferente
+        'layout_engine': layout_paragraph.__module__,
+        # De onde vêm as larguras (arquivos de métricas ou FreeType na hora)
+        'metrics_dir': metric_files.current_metrics_dir(),
+    }
+
+class OutputCache:
+    """PDFs já gerados, guardados em disco com despejo LRU por tamanho."""
+
+    def __init__(self, cache_dir: str, max_bytes: int = 1024 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._environment = None
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + CACHE_SUFFIX)
+
+    def key_for(self, input_path: str, render_options: dict = None) -> str:
+        # O diretório de métricas pode ser trocado depois (set_metrics_dir)
+        from .layout.metric_files import current_metrics_dir
+        if self._environment is None or self._environment['metrics_dir'] != current_metrics_dir():
+            self._environment = environment_fingerprint()
+        payload = json.dumps({
+            'input': file_digest(input_path),
+            'options': render_options or {},
+            'environment': self._environment,
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def fetch(self, key: str, output_path: str) -> bool:
+        """Copia o PDF em cache para output_path; devolve False se não houver."""
+        cached_path = self._path(key)
+        try:
+            shutil.copyfile(cached_path, output_path)
+        except FileNotFoundError:
+            self.misses += 1
+            return False
+        touch(cached_path)
+        self.hits += 1
+        return True
+
+    def store(self, key: str, pdf_path: str):
+        if os.path.getsize(pdf_path) > self.max_bytes:
+            return
+        atomic_copy(pdf_path, self._path(key))
+        self.stores += 1
+        self.evictions += evict_lru(self.cache_dir, CACHE_SUFFIX, self.max_bytes)
+
+    def metrics(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,293 @@
+# pydocx_render/pipeline.py
+# Conversão de vários documentos em pipeline: parse -> layout -> desenho -> gravação.
+#
+# Em vez de cada documento passar pelas quatro etapas antes do próximo começar,
+# cada etapa tem suas próprias threads e as etapas se comunicam por filas
+# limitadas. O parse do documento N+1 e a gravação do N-1 acontecem enquanto o
+# N é diagramado e desenhado; as filas limitadas seguram a leitura quando uma
+# etapa mais lenta fica para trás, então a memória não cresce com o lote.
+#
+# O PyMuPDF continua atrás de _FITZ_LOCK: com threads, desenho e compressão
+# não rodam em paralelo entre si, só com o parse (zip/lxml) e o layout. Como o
+# desenho costuma ser o gargalo, ele pode rodar em processos separados
+# (draw_processes), que recebem os PageModel já diagramados. As estatísticas
+# por etapa mostram qual delas é o gargalo.
+
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+import fitz
+from .core.parser import parse_docx
+from .deadline import ConversionTimeout, Deadline
+from .layout import metric_files
+from .renderer import (_FITZ_LOCK, _Stamps, _draw_page, _iter_document_models,
+                       _make_context)
+
+# Marca de fim de fluxo numa fila
+_STOP = object()
+
+@dataclass
+class StageStats:
+    name: str
+    workers: int
+    items: int = 0
+    # Tempo somado das threads trabalhando em itens
+    busy_seconds: float = 0.0
+    # Tempo somado das threads esperando vaga na fila seguinte (contrapressão)
+    blocked_seconds: float = 0.0
+    # Profundidade da fila de entrada, amostrada a cada item retirado
+    max_queue: int = 0
+    queue_samples: int = 0
+    queue_total: int = 0
+
+    @property
+    def mean_queue(self) -> float:
+        return self.queue_total / self.queue_samples if self.queue_samples else 0.0
+
+    def utilization(self, wall_seconds: float) -> float:
+        """Fração do tempo total em que as threads da etapa trabalharam."""
+        if not wall_seconds:
+            return 0.0
+        return self.busy_seconds / (wall_seconds * self.workers)
+
+@dataclass
+class PipelineResult:
+    input_path: str
+    output_path: str
+    pages: int = 0
+    error: Optional[BaseException] = None
+
+@dataclass
+class PipelineStats:
+    seconds: float = 0.0
+    stages: List[StageStats] = field(default_factory=list)
+    results: List[PipelineResult] = field(default_factory=list)
+
+    @property
+    def documents(self) -> int:
+        return len(self.results)
+
+    @property
+    def failed(self) -> int:
+        return sum(1 for result in self.results if result.error is not None)
+
+    @property
+    def bottleneck(self) -> Optional[StageStats]:
+        """Etapa com maior utilização."""
+        if not self.stages:
+            return None
+        return max(self.stages, key=lambda stage: stage.utilization(self.seconds))
+
+    def __str__(self):
+        lines = [f"{self.documents} documentos ({self.failed} com erro) em {self.seconds:.2f}s",
+                 f"{'etapa':<8} {'threads':>7} {'itens':>6} {'ocupação':>9} "
+                 f"{'bloqueio (s)':>12} {'fila média':>10} {'fila máx':>8}"]
+        for stage in self.stages:
+            lines.append(f"{stage.name:<8} {stage.workers:>7} {stage.items:>6} "
+                         f"{stage.utilization(self.seconds):>9.0%} {stage.blocked_seconds:>12.2f} "
+                         f"{stage.mean_queue:>10.1f} {stage.max_queue:>8}")
+        return '\n'.join(lines)
+
+class _Job:
+    """Um documento atravessando o pipeline; 'payload' muda a cada etapa."""
+
+    __slots__ = ('result', 'payload', 'deadline')
+
+    def __init__(self, result: PipelineResult, payload):
+        self.result = result
+        self.payload = payload
+        self.deadline = None
+
+class _Stage:
+    def __init__(self, name: str, func: Callable, workers: int,
+                 inbox: queue.Queue, outbox: Optional[queue.Queue]):
+        self.func = func
+        self.inbox = inbox
+        self.outbox = outbox
+        self.stats = StageStats(name=name, workers=workers)
+        self.stats_lock = threading.Lock()
+        self.threads = [threading.Thread(target=self._work, name=f'pipeline-{name}-{i}', daemon=True)
+                        for i in range(workers)]
+
+    def start(self):
+        for thread in self.threads:
+            thread.start()
+
+    def _work(self):
+        stats = self.stats
+        while True:
+            depth = self.inbox.qsize()
+            job = self.inbox.get()
+            if job is _STOP:
+                return
+            busy = 0.0
+            if job.result.error is None:
+                start = time.perf_counter()
+                try:
+                    job.payload = self.func(job)
+                except Exception as exc:
+                    job.result.error = exc
+                    job.payload = None
+                    print(f"AVISO: '{job.result.input_path}' falhou na etapa {stats.name}: {exc}")
+                busy = time.perf_counter() - start
+            blocked = 0.0
+            if self.outbox is not None:
+                start = time.perf_counter()
+                self.outbox.put(job)
+                blocked = time.perf_counter() - start
+            with self.stats_lock:
+                stats.items += 1
+                stats.busy_seconds += busy
+                stats.blocked_seconds += blocked
+                stats.max_queue = max(stats.max_queue, depth)
+                stats.queue_samples += 1
+                stats.queue_total += depth
+
+    def join(self):
+        for thread in self.threads:
+            thread.join()
+
+def _draw_document(models, ctx):
+    """Desenha as páginas num fitz.Document novo. Quem chama segura _FITZ_LOCK."""
+    stamps = _Stamps(ctx)
+    pdf_doc = fitz.open()
+    try:
+        for model in models:
+            page = pdf_doc.new_page(width=model.width, height=model.height)
+            stamps.apply(page, model)
+            _draw_page(page, model, ctx)
+    except BaseException:
+        pdf_doc.close()
+        raise
+    finally:
+        stamps.close()
+    return pdf_doc
+
+# Contexto de layout de cada processo de desenho (draw_processes > 0)
+_PROCESS_CTX = None
+
+def _init_draw_process(fallback_fonts, draft, metrics_dir=None):
+    global _PROCESS_CTX
+    # Com arquivos de métricas o processo mapeia as tabelas em vez de medir as fontes
+    metric_files.set_metrics_dir(metrics_dir)
+    _PROCESS_CTX = _make_context(fallback_fonts, draft)
+
+def _draw_to_bytes(models) -> bytes:
+    """Desenho e compressão num processo à parte; devolve o PDF pronto."""
+    with _FITZ_LOCK:
+        pdf_doc = _draw_document(models, _PROCESS_CTX)
+        try:
+            return pdf_doc.tobytes(garbage=4, deflate=True)
+        finally:
+            pdf_doc.close()
+
+def convert_batch(jobs: Iterable[Tuple[str, str]],
+                  parse_workers: int = 1, layout_workers: int = 1,
+                  draw_workers: int = 1, save_workers: int = 1,
+                  queue_size: int = 2,
+                  draw_processes: int = 0,
+                  fallback_fonts: Optional[Sequence[str]] = None,
+                  draft: bool = False,
+                  dom_cache=None,
+                  document_timeout: Optional[float] = None) -> PipelineStats:
+    """Converte pares (entrada .docx, saída .pdf) em pipeline.
+
+    Cada etapa tem seu número de threads e, entre etapas, uma fila de até
+    'queue_size' documentos. Um documento que falha numa etapa segue pelo
+    pipeline só para ser contado: o erro fica em PipelineResult.error e o lote
+    continua. Os resultados voltam na ordem de entrada.
+
+    Com 'draw_processes' > 0 o desenho e a compressão rodam nesse número de
+    processos (cada um com seu PyMuPDF, sem disputar _FITZ_LOCK nem o GIL);
+    'draw_workers' é ignorado e a etapa de gravação só escreve os bytes.
+    'draft' como em render_to_pdf.
+
+    Com 'document_timeout' cada documento tem esse número de segundos, a
+    partir do início do seu parse, para o parse e o layout (conferidos a cada
+    parágrafo e página, como em render_to_pdf). Um documento que estoura o
+    prazo falha com deadline.ConversionTimeout e não grava nada; o lote
+    segue com as mesmas threads.
+    """
+    ctx = _make_context(fallback_fonts, draft)
+    pool = None
+    if draw_processes > 0:
+        # spawn: um fork com threads no meio de uma chamada ao fitz herdaria a trava presa
+        pool = ProcessPoolExecutor(max_workers=draw_processes,
+                                   mp_context=multiprocessing.get_context('spawn'),
+                                   initializer=_init_draw_process,
+                                   initargs=(fallback_fonts, draft, metric_files.current_metrics_dir()))
+        draw_workers = draw_processes
+
+    def parse(job):
+        if document_timeout is not None:
+            job.deadline = Deadline(document_timeout)
+        return parse_docx(job.result.input_path, cache=dom_cache, deadline=job.deadline)
+
+    def layout(job):
+        # Um documento por thread de layout: as seções não abrem outro pool
+        job_ctx = ctx if job.deadline is None else replace(ctx, deadline=job.deadline)
+        models = []
+        try:
+            for model in _iter_document_models(job.payload, job_ctx, workers=1):
+                if job.deadline is not None:
+                    job.deadline.check('layout', pages=len(models))
+                models.append(model)
+        except ConversionTimeout as e:
+            e.progress.pages = len(models)
+            raise
+        return models
+
+    def draw(job):
+        models = job.payload
+        job.result.pages = len(models)
+        if pool is not None:
+            return pool.submit(_draw_to_bytes, models).result()
+        with _FITZ_LOCK:
+            return _draw_document(models, ctx)
+
+    def save(job):
+        pdf_bytes = job.payload
+        if not isinstance(pdf_bytes, bytes):
+            # Compressão sob a trava; a escrita em disco fica de fora
+            with _FITZ_LOCK:
+                try:
+                    pdf_bytes = job.payload.tobytes(garbage=4, deflate=True)
+                finally:
+                    job.payload.close()
+        tmp_path = f"{job.result.output_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as target:
+            target.write(pdf_bytes)
+        os.replace(tmp_path, job.result.output_path)
+
+    specs = [('parse', parse, parse_workers), ('layout', layout, layout_workers),
+             ('draw', draw, draw_workers), ('save', save, save_workers)]
+    queues = [queue.Queue(maxsize=queue_size) for _ in specs]
+    stages = []
+    for index, (name, func, workers) in enumerate(specs):
+        outbox = queues[index + 1] if index + 1 < len(queues) else None
+        stages.append(_Stage(name, func, max(1, workers), queues[index], outbox))
+
+    stats = PipelineStats(stages=[stage.stats for stage in stages])
+    start = time.perf_counter()
+    try:
+        for stage in stages:
+            stage.start()
+        for input_path, output_path in jobs:
+            result = PipelineResult(input_path=input_path, output_path=output_path)
+            stats.results.append(result)
+            queues[0].put(_Job(result, None))
+        # Cada etapa só recebe o fim de fluxo depois que a anterior esvaziou
+        for stage in stages:
+            for _ in stage.threads:
+                stage.inbox.put(_STOP)
+            stage.join()
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    stats.seconds = time.perf_counter() - start
+    return stats
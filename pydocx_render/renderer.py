@@ -2,8 +2,21 @@
 # --- VERSÃO FINAL CORRIGIDA ---
 
 import fitz
+import hashlib
 import os
-from .core.dom import Document
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Iterable, Iterator, List, Optional, Sequence, Union
+from .core.dom import Document, Paragraph, Run, Section
+from .core.sections import section_ranges
+from .deadline import ConversionTimeout, Deadline, Progress
+from .layout.advance_tables import BASE14_FONTS
+from .layout.font_fallback import FallbackResolver
+from .layout.line_box import Line, Span
+from .memory import current_rss_mb, peak_rss_mb
 
 try:
     from .layout.line_breaker import layout_paragraph, FontMetrics
@@ -12,6 +25,23 @@ except ImportError:
     print("AVISO: Extensão Cython não encontrada. Usando motor de layout Python puro (mais lento).")
     from .layout.line_breaker_pure import layout_paragraph, FontMetrics
 
+# PyMuPDF não é thread-safe, nem com documentos separados: toda chamada ao fitz
+# passa por esta trava. Layout e medição (tabelas de avanço imutáveis) ficam de
+# fora, então várias chamadas a render_to_pdf podem rodar em threads paralelas.
+_FITZ_LOCK = threading.RLock()
+
+# Tamanho padrão das páginas novas no PyMuPDF
+PAGE_SIZE = fitz.paper_size('a4')
+
+# Modo rascunho: fontes base-14 do PDF, sem arquivo, sem embutir e medidas
+# pelas larguras AFM do pacote (sem FreeType)
+DRAFT_FONTS = {
+    'regular': 'Helvetica',
+    'bold': 'Helvetica-Bold',
+    'italic': 'Helvetica-Oblique',
+    'bold_italic': 'Helvetica-BoldOblique',
+}
+
 def find_font_file(style='regular'):
     """Encontra o arquivo de fonte (.ttf) para um determinado estilo."""
     font_map = {
@@ -39,65 +69,706 @@ def find_font_file(style='regular'):
     
     return font_path
 
-def render_to_pdf(doc: Document, output_path: str):
-    pdf_doc = fitz.open()
-    page = pdf_doc.new_page()
+# Fontes candidatas para caracteres que a fonte principal não tem (símbolos,
+# CJK, tailandês...). A primeira da lista que cobrir o caractere é usada.
+_WINDOWS_FONTS = os.path.join(os.environ.get("SystemRoot", "C:\\Windows"), "Fonts")
+FALLBACK_FONT_CANDIDATES = [
+    os.path.join(_WINDOWS_FONTS, 'seguisym.ttf'),   # Segoe UI Symbol
+    os.path.join(_WINDOWS_FONTS, 'tahoma.ttf'),     # Tahoma (tailandês)
+    os.path.join(_WINDOWS_FONTS, 'arialuni.ttf'),   # Arial Unicode MS
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+    '/usr/share/fonts/truetype/noto/NotoSansThai-Regular.ttf',
+    '/usr/share/fonts/truetype/droid/DroidSansFallbackFull.ttf',
+]
+
+def find_fallback_fonts() -> List[str]:
+    """Lista as fontes de fallback instaladas, na ordem de preferência."""
+    return [path for path in FALLBACK_FONT_CANDIDATES if os.path.exists(path)]
+
+@dataclass
+class RenderStats:
+    pages: int = 0
+    parts: int = 0
+    peak_rss_mb: Optional[float] = None
+    # Saída parcial (on_timeout='partial'): onde o prazo venceu; None = documento completo
+    truncated: Optional[Progress] = None
+
+# Modo de memória limitada: a primeira parte tem ao menos essas páginas e esse
+# orçamento de memória (MB), mesmo que o processo já tenha começado acima do limite
+MIN_PAGES_PER_PART = 25
+MIN_PART_MB = 8
+
+# Referências pelas quais cada parte embute (de novo) as fontes: programa,
+# tabela de larguras e mapas de caracteres
+_SHARED_KEYS = ('FontFile', 'FontFile2', 'FontFile3', 'W', 'ToUnicode', 'CIDToGIDMap')
+
+def _share_objects(pdf_doc, first_xref: int, seen: dict):
+    """Aponta as referências de _SHARED_KEYS dos objetos a partir de
+    'first_xref' para a primeira cópia de cada objeto (mesmo texto e, nos
+    streams, mesmos bytes), registrada em 'seen'; as cópias viram null.
+    """
+    replaced = {}
+    for xref in range(first_xref, pdf_doc.xref_length()):
+        for key in _SHARED_KEYS:
+            kind, value = pdf_doc.xref_get_key(xref, key)
+            if kind != 'xref':
+                continue
+            target = int(value.split()[0])
+            if target not in replaced:
+                digest = hashlib.sha1(pdf_doc.xref_object(target, compressed=True).encode())
+                if pdf_doc.xref_is_stream(target):
+                    digest.update(pdf_doc.xref_stream_raw(target))
+                replaced[target] = seen.setdefault(digest.digest(), target)
+            if replaced[target] != target:
+                pdf_doc.xref_set_key(xref, key, f"{replaced[target]} 0 R")
+    for target, original in replaced.items():
+        if original != target:
+            pdf_doc.update_object(target, 'null')
+
+class _PdfWriter:
+    """Fornece páginas novas ao renderizador e grava o resultado em output_path.
+
+    No modo de memória limitada, a cada 'pages_per_chunk' páginas (ou, com
+    'memory_limit_mb', a cada tantas páginas quantas couberam no limite na
+    primeira parte) o documento em memória é salvo numa parte temporária e
+    descartado. Cada parte é logo acrescentada ao PDF final em disco, por
+    gravação incremental: só a parte nova é carregada, e as fontes que ela
+    embute de novo passam a apontar para as da primeira parte (_share_objects).
+
+    Com 'deadline' o prazo é conferido a cada página nova e de novo logo
+    depois de gravar uma parte, que demora bem mais que uma página; a
+    gravação final, em close, não é interrompida.
+    """
+
+    def __init__(self, output_path: str, pages_per_chunk: Optional[int] = None,
+                 memory_limit_mb: Optional[float] = None,
+                 deadline: Optional[Deadline] = None):
+        self.output_path = output_path
+        self.deadline = deadline
+        self.pages_per_chunk = pages_per_chunk
+        self.memory_limit_mb = memory_limit_mb
+        self.chunked = pages_per_chunk is not None or memory_limit_mb is not None
+        with _FITZ_LOCK:
+            self.pdf_doc = fitz.open()
+        self.merged_path = None
+        self.tmp_dir = None
+        self._shared = {}
+        # A memória liberada ao salvar uma parte fica com o alocador e é
+        # reaproveitada pela parte seguinte: o RSS não volta a cair abaixo do
+        # limite nem cresce de novo de forma confiável. Por isso o limite só
+        # mede a primeira parte: quanto o RSS pode crescer desde a primeira
+        # página (as fontes já carregadas), no mínimo MIN_PART_MB. As partes
+        # seguintes têm o mesmo número de páginas.
+        self._measuring = memory_limit_mb is not None
+        self._rss_mark = None
+        self._part_budget_mb = None
+        self._part_pages = pages_per_chunk
+        self.stats = RenderStats()
+
+    def new_page(self, width: float = PAGE_SIZE[0], height: float = PAGE_SIZE[1]):
+        self._check_deadline()
+        with _FITZ_LOCK:
+            if self.chunked and self.pdf_doc.page_count and self._should_flush():
+                self._flush_part()
+                self._check_deadline()
+            self.stats.pages += 1
+            return self.pdf_doc.new_page(width=width, height=height)
+
+    def _should_flush(self) -> bool:
+        page_count = self.pdf_doc.page_count
+        if self._part_pages and page_count >= self._part_pages:
+            return True
+        if not self._measuring:
+            return False
+        rss = current_rss_mb()
+        if rss is None:
+            self._measuring = False
+        elif self._rss_mark is None:
+            self._rss_mark = rss
+            self._part_budget_mb = max(self.memory_limit_mb - rss, MIN_PART_MB)
+        elif page_count >= MIN_PAGES_PER_PART and rss - self._rss_mark >= self._part_budget_mb:
+            # Medido: as próximas partes têm esse número de páginas
+            self._part_pages = page_count
+            self._measuring = False
+            return True
+        return False
+
+    def _check_deadline(self):
+        if self.deadline is not None:
+            self.deadline.check('draw', pages=self.stats.pages)
+
+    def _flush_part(self):
+        if self.tmp_dir is None:
+            self.tmp_dir = tempfile.mkdtemp(prefix='pydocx_render_')
+        part_path = os.path.join(self.tmp_dir, 'part.pdf')
+        self.pdf_doc.save(part_path, garbage=4, deflate=True)
+        self.pdf_doc.close()
+        self._append_part(part_path)
+        self.stats.parts += 1
+        self.pdf_doc = fitz.open()
+
+    def _append_part(self, part_path: str):
+        if self.merged_path is None:
+            self.merged_path = os.path.join(self.tmp_dir, 'merged.pdf')
+            os.replace(part_path, self.merged_path)
+            with fitz.open(self.merged_path) as merged:
+                _share_objects(merged, 1, self._shared)
+            return
+        with fitz.open(self.merged_path) as merged:
+            first_xref = merged.xref_length()
+            with fitz.open(part_path) as part:
+                merged.insert_pdf(part)
+            _share_objects(merged, first_xref, self._shared)
+            merged.saveIncr()
+        os.remove(part_path)
+
+    def close(self) -> RenderStats:
+        with _FITZ_LOCK:
+            self._save()
+        self.cleanup()
+        self.stats.peak_rss_mb = peak_rss_mb()
+        return self.stats
+
+    def _save(self):
+        if self.merged_path is None:
+            self.pdf_doc.save(self.output_path, garbage=4, deflate=True)
+            self.pdf_doc.close()
+            self.stats.parts = 1
+        else:
+            if self.pdf_doc.page_count:
+                self._flush_part()
+            self.pdf_doc.close()
+            shutil.move(self.merged_path, self.output_path)
+            self.merged_path = None
+
+    def cleanup(self):
+        if self.tmp_dir is not None:
+            shutil.rmtree(self.tmp_dir, ignore_errors=True)
+            self.tmp_dir = None
+            self.merged_path = None
+
+@dataclass
+class _LayoutContext:
+    metrics: object
+    resolver: Optional[FallbackResolver]
+    fallback_fonts: List[str]
+    # Tamanho das runs sem w:sz
+    font_size: float
+    # Geometria das páginas: a da seção em diagramação (for_section)
+    section: Section = field(default_factory=Section)
+    # Fontes base-14 (DRAFT_FONTS) no lugar dos arquivos .ttf
+    draft: bool = False
+    # Conferido a cada parágrafo diagramado (render(..., deadline=...))
+    deadline: Optional[Deadline] = None
+
+    @property
+    def page_width(self) -> float:
+        return self.section.page_width
+
+    @property
+    def page_height(self) -> float:
+        return self.section.page_height
+
+    @property
+    def max_width(self) -> float:
+        """Largura da área de texto."""
+        return self.section.page_width - self.section.margin_left - self.section.margin_right
+
+    def for_section(self, section: Section) -> '_LayoutContext':
+        """O mesmo contexto (fontes, métricas) com a geometria de outra seção."""
+        return replace(self, section=section)
+
+@dataclass
+class PlacedLine:
+    """Linha já quebrada e posicionada: (x, y) é a origem da linha de base.
+
+    O x de cada trecho é relativo a x e já inclui o alinhamento do parágrafo.
+    """
+    x: float
+    y: float
+    spans: List[Span]
+
+@dataclass
+class PageModel:
+    """Página pronta para desenhar, sem nenhum objeto do PyMuPDF."""
+    number: int
+    width: float
+    height: float
+    lines: List[PlacedLine] = field(default_factory=list)
+    # Cabeçalho e rodapé: a mesma lista em todas as páginas do documento
+    furniture: List[PlacedLine] = field(default_factory=list)
+
+@dataclass
+class RenderedPage:
+    """Página já desenhada, como um PDF de uma página só."""
+    number: int
+    pdf_bytes: bytes
+
+def _make_context(fallback_fonts: Optional[Sequence[str]], draft: bool = False) -> _LayoutContext:
+    resolver = None
+
+    if draft:
+        # Sem fallback: o PyMuPDF troca o que não é Latin-1 por '·', e as
+        # tabelas AFM já medem esses caracteres com a largura do '·'. As
+        # oblíquas têm as larguras das retas: basta a Helvetica-Bold à parte.
+        metrics = FontMetrics(DRAFT_FONTS['regular'])
+        metrics.bold = FontMetrics(DRAFT_FONTS['bold'])
+        return _LayoutContext(metrics=metrics, resolver=None, fallback_fonts=[], font_size=11,
+                              draft=True)
 
-    page_width = page.rect.width
-    margin = 50
-    y_cursor = 50
-    line_height = 15
-    font_size = 11
-    max_width = page_width - (2 * margin)
-    
     try:
-        # A classe de métricas precisa apenas da fonte regular para os cálculos de largura
+        # A classe de métricas precisa apenas da fonte regular (e das de fallback) para as larguras
         regular_font_file = find_font_file('regular')
-        metrics = FontMetrics(regular_font_file)
+        if fallback_fonts is None:
+            fallback_fonts = find_fallback_fonts()
+        fallback_fonts = [path for path in fallback_fonts if path != regular_font_file]
+        metrics = FontMetrics(regular_font_file, fallback_fonts)
+        if fallback_fonts:
+            resolver = FallbackResolver([regular_font_file, *fallback_fonts])
     except (FileNotFoundError, TypeError) as e:
         print(f"AVISO: {e}. Recorrendo a estimativas de largura.")
         from .layout.line_breaker_pure import FontMetrics as PureMetrics
         metrics = PureMetrics()
+        fallback_fonts = []
+
+    return _LayoutContext(metrics=metrics, resolver=resolver, fallback_fonts=list(fallback_fonts),
+                          font_size=11)
+
+def _document_parts(doc: Union[Document, Iterable[Paragraph]]):
+    """(corpo, cabeçalho, rodapé); um iterável de parágrafos não tem cabeçalho nem rodapé."""
+    if isinstance(doc, Document):
+        return doc.body, doc.header, doc.footer
+    return doc, [], []
+
+def _section_furniture(section: Section, header, footer):
+    """(cabeçalho, rodapé) da seção; os do documento quando ela não tem os seus."""
+    return (header if section.header is None else section.header,
+            footer if section.footer is None else section.footer)
+
+class _FurnitureStamp:
+    """Cabeçalho e rodapé desenhados uma única vez numa página à parte.
+
+    show_pdf_page transforma essa página num Form XObject, e o PyMuPDF guarda o
+    xref dele por documento de destino: todas as páginas referenciam o mesmo
+    objeto em vez de repetir o desenho. Só os campos PAGE são desenhados em
+    cada página, por cima.
+    """
+
+    def __init__(self, lines: List[PlacedLine], ctx: _LayoutContext, width: float, height: float):
+        self.ctx = ctx
+        self.field_lines = []
+        for line in lines:
+            spans = [span for span in line.spans if span.run.field_code]
+            if spans:
+                self.field_lines.append(PlacedLine(x=line.x, y=line.y, spans=spans))
+        with _FITZ_LOCK:
+            self.doc = fitz.open()
+            page = self.doc.new_page(width=width, height=height)
+            # Nomes de fonte próprios: o PyMuPDF reaproveita, pelo nome, fontes
+            # que já aparecem na página (inclusive dentro do XObject), e o
+            # texto do corpo sairia com a codificação errada
+            for line in lines:
+                _draw_line(page, line, ctx, font_prefix='H')
+
+    def apply(self, page, number: int):
+        """Carimba a página. Quem chama segura _FITZ_LOCK."""
+        page.show_pdf_page(page.rect, self.doc, 0)
+        for line in self.field_lines:
+            _draw_line(page, line, self.ctx, number)
+
+    def close(self):
+        with _FITZ_LOCK:
+            self.doc.close()
+
+def _stamp_for(model: PageModel, ctx: _LayoutContext) -> Optional[_FurnitureStamp]:
+    if not model.furniture:
+        return None
+    return _FurnitureStamp(model.furniture, ctx, model.width, model.height)
+
+class _Stamps:
+    """Um _FurnitureStamp por seção.
 
-    for para in doc.body:
-        lines_of_runs = layout_paragraph(para.runs, metrics, max_width, font_size)
-
-        for line_runs in lines_of_runs:
-            if y_cursor > page.rect.height - margin:
-                page = pdf_doc.new_page()
-                y_cursor = margin
-
-            x_cursor = margin
-            for i, run in enumerate(line_runs):
-                style = 'regular'
-                if run.is_bold and run.is_italic:
-                    style = 'bold_italic'
-                elif run.is_bold:
-                    style = 'bold'
-                elif run.is_italic:
-                    style = 'italic'
-                
+    Cada seção tem o seu cabeçalho e rodapé (Section.header/footer, herdados
+    da seção anterior quando ela não define os seus, como no Word),
+    diagramados na sua geometria; um novo carimbo é feito quando a
+    diagramação muda (PageModel.furniture é outra lista).
+    """
+
+    def __init__(self, ctx: _LayoutContext):
+        self.ctx = ctx
+        self._furniture = None
+        self._stamp = None
+        # Os carimbos já usados ficam abertos: as páginas carimbadas os referenciam
+        self._stamps = []
+
+    def apply(self, page, model: PageModel):
+        """Carimba a página do modelo. Quem chama segura _FITZ_LOCK."""
+        if model.furniture is not self._furniture:
+            self._furniture = model.furniture
+            self._stamp = _stamp_for(model, self.ctx)
+            if self._stamp is not None:
+                self._stamps.append(self._stamp)
+        if self._stamp is not None:
+            self._stamp.apply(page, model.number)
+
+    def close(self):
+        for stamp in self._stamps:
+            stamp.close()
+        self._stamps.clear()
+        self._furniture = self._stamp = None
+
+def render_to_pdf(doc: Union[Document, Iterable[Paragraph]], output_path: str,
+                  pages_per_chunk: Optional[int] = None,
+                  memory_limit_mb: Optional[float] = None,
+                  fallback_fonts: Optional[Sequence[str]] = None,
+                  draft: bool = False,
+                  section_workers: Optional[int] = None,
+                  text_index_path: Optional[str] = None,
+                  deadline: Optional[Deadline] = None,
+                  on_timeout: str = 'abort') -> RenderStats:
+    """Renderiza o documento em PDF e devolve estatísticas (páginas, partes, pico de RSS).
+
+    'doc' pode ser um Document ou qualquer iterável de parágrafos, por exemplo
+    core.sax_parser.iter_paragraphs, para não manter o corpo inteiro em memória.
+    Com 'pages_per_chunk' e/ou 'memory_limit_mb' ativa-se o modo de memória limitada.
+    'fallback_fonts' define a cadeia de fallback (None = find_fallback_fonts(), [] = desligada).
+    Com 'draft' o texto sai em Helvetica base-14, sem fontes embutidas: bem
+    mais rápido e menor, para cópias de revisão.
+    Cada seção (Document.sections) tem o seu tamanho de página e as suas
+    margens; 'section_workers' é o número de threads que diagramam as seções.
+    Com 'text_index_path' grava, enquanto desenha, um índice JSON lines com
+    página, caixa, texto e estilo de cada trecho (ver text_index), para
+    indexar o documento sem extrair o texto do PDF de novo.
+    'deadline' e 'on_timeout' como em render.
+    """
+    # Importado aqui: backends.pdf usa os auxiliares deste módulo
+    from .backends.pdf import PdfBackend
+    return render(doc, PdfBackend(output_path, pages_per_chunk, memory_limit_mb, text_index_path),
+                  fallback_fonts, draft, section_workers, deadline, on_timeout)
+
+# on_timeout: levantar ConversionTimeout ou entregar as páginas prontas
+ON_TIMEOUT = ('abort', 'partial')
+
+def render(doc: Union[Document, Iterable[Paragraph]], backend,
+           fallback_fonts: Optional[Sequence[str]] = None,
+           draft: bool = False,
+           section_workers: Optional[int] = None,
+           deadline: Optional[Deadline] = None,
+           on_timeout: str = 'abort') -> RenderStats:
+    """Diagrama o documento e entrega as páginas, em ordem, a um backend.
+
+    Os backends (pacote backends/) recebem PageModel prontos: PdfBackend
+    (PyMuPDF), NullBackend (só conta) e RasterBackend (imagens via Pillow).
+
+    Com 'deadline' (deadline.Deadline) o prazo é conferido a cada parágrafo
+    diagramado e a cada página entregue. Vencido, on_timeout='abort' levanta
+    ConversionTimeout (o backend descarta a saída em cleanup) e 'partial'
+    conclui a saída com as páginas prontas mais uma página de aviso; o
+    progresso fica em RenderStats.truncated.
+    """
+    if on_timeout not in ON_TIMEOUT:
+        raise ValueError(f"on_timeout deve ser um de {ON_TIMEOUT}, não {on_timeout!r}")
+    ctx = _make_context(fallback_fonts, draft)
+    ctx.deadline = deadline
+    backend.start(ctx)
+    try:
+        last = None
+        truncated = None
+        try:
+            for model in _iter_document_models(doc, ctx, section_workers):
+                if deadline is not None:
+                    deadline.check('draw', pages=last.number if last else 0)
+                backend.draw_page(model)
+                last = model
+        except ConversionTimeout as e:
+            # As verificações do layout não sabem quantas páginas já foram entregues
+            e.progress.pages = last.number if last else 0
+            if on_timeout == 'abort':
+                raise
+            truncated = e.progress
+            print(f"AVISO: conversão interrompida em {truncated}; salvando as páginas prontas.")
+            # A página de aviso e a gravação das prontas já não têm prazo
+            ctx.deadline = None
+            backend.draw_page(_truncation_page(last, ctx))
+        stats = backend.close()
+        stats.truncated = truncated
+        return stats
+    finally:
+        backend.cleanup()
+
+TRUNCATION_NOTICE = "[Documento truncado: a conversão foi interrompida por tempo depois de {pages} páginas.]"
+
+def _truncation_page(last: Optional[PageModel], ctx: _LayoutContext) -> PageModel:
+    """Página final da saída parcial, com o aviso, no tamanho da última página pronta."""
+    section = ctx.section
+    if last is not None:
+        section = replace(section, page_width=last.width, page_height=last.height)
+    ctx = replace(ctx.for_section(section), deadline=None)
+    pages = last.number if last else 0
+    notice = Paragraph(runs=[Run(text=TRUNCATION_NOTICE.format(pages=pages), is_bold=True)])
+    model = next(_iter_page_models([notice], [], [], ctx))
+    model.number = pages + 1
+    return model
+
+def iter_pages(doc: Union[Document, Iterable[Paragraph]], as_pdf: bool = True,
+               fallback_fonts: Optional[Sequence[str]] = None,
+               draft: bool = False) -> Iterator[Union[RenderedPage, PageModel]]:
+    """Gera as páginas uma a uma, assim que cada uma fica pronta.
+
+    Com as_pdf=True cada item é um RenderedPage (PDF de uma página, com as
+    fontes embutidas); com as_pdf=False é o PageModel, sem desenhar nada.
+    Combinado com core.sax_parser.iter_paragraphs, só a página em andamento
+    fica em memória. 'draft' como em render_to_pdf.
+    """
+    ctx = _make_context(fallback_fonts, draft)
+    stamps = _Stamps(ctx)
+    try:
+        for model in _iter_document_models(doc, ctx):
+            if not as_pdf:
+                yield model
+                continue
+            with _FITZ_LOCK:
+                pdf_doc = fitz.open()
                 try:
-                    # Encontra o arquivo .ttf para o estilo atual
-                    font_file = find_font_file(style)
-                    
-                    text_to_draw = (" " if i > 0 else "") + run.text
-                    
-                    # AQUI ESTÁ A CORREÇÃO: passamos o 'fontfile' para o PyMuPDF
-                    page.insert_text(
-                        (x_cursor, y_cursor),
-                        text_to_draw,
-                        fontname=f"F{style}", # Um nome único para a fonte no PDF
-                        fontfile=font_file,
-                        fontsize=font_size
-                    )
-                    x_cursor += metrics.get_text_width(text_to_draw, font_size)
-                
-                except FileNotFoundError as e:
-                    print(f"ERRO DE FONTE: {e}, pulando run.")
-                    continue
-
-            y_cursor += line_height
-
-    pdf_doc.save(output_path, garbage=4, deflate=True)
-    pdf_doc.close()
\ No newline at end of file
+                    page = pdf_doc.new_page(width=model.width, height=model.height)
+                    stamps.apply(page, model)
+                    _draw_page(page, model, ctx)
+                    pdf_bytes = pdf_doc.tobytes(garbage=4, deflate=True)
+                finally:
+                    pdf_doc.close()
+            yield RenderedPage(number=model.number, pdf_bytes=pdf_bytes)
+    finally:
+        stamps.close()
+
+def _layout_block(paragraphs, ctx: _LayoutContext) -> List[Line]:
+    lines = []
+    for para in paragraphs:
+        lines.extend(layout_paragraph(para.runs, ctx.metrics, ctx.max_width, ctx.font_size,
+                                      para.alignment))
+    return lines
+
+def _layout_furniture(header, footer, ctx: _LayoutContext):
+    """Posiciona cabeçalho e rodapé; devolve (linhas, topo do corpo, base do corpo).
+
+    Um cabeçalho (rodapé) mais alto que a margem empurra o corpo, como no Word.
+    """
+    section = ctx.section
+    x = section.margin_left
+    placed = []
+    y_top = section.header_distance
+    for line in _layout_block(header, ctx):
+        placed.append(PlacedLine(x=x, y=y_top + line.ascent, spans=line.spans))
+        y_top += line.height
+    body_top = max(section.margin_top, y_top)
+
+    footer_lines = _layout_block(footer, ctx)
+    y_top = ctx.page_height - section.footer_distance - sum(line.height for line in footer_lines)
+    body_bottom = min(ctx.page_height - section.margin_bottom, y_top)
+    for line in footer_lines:
+        placed.append(PlacedLine(x=x, y=y_top + line.ascent, spans=line.spans))
+        y_top += line.height
+    return placed, body_top, body_bottom
+
+def _iter_page_models(paragraphs, header, footer, ctx: _LayoutContext,
+                      first_paragraph: int = 0) -> Iterator[PageModel]:
+    """Layout puro: quebra as linhas e as distribui em páginas (sempre ao menos uma).
+
+    Cabeçalho e rodapé são diagramados uma única vez, antes do corpo.
+    'first_paragraph' é a posição do primeiro parágrafo no documento (para o
+    progresso informado pelo deadline).
+    """
+    metrics = ctx.metrics
+    font_size = ctx.font_size
+    if ctx.deadline is not None:
+        paragraphs = _checked(paragraphs, ctx.deadline, first_paragraph)
+    line_groups = (layout_paragraph(para.runs, metrics, ctx.max_width, font_size, para.alignment)
+                   for para in paragraphs)
+    return _paginate(line_groups, _layout_furniture(header, footer, ctx), ctx)
+
+def _checked(paragraphs, deadline: Deadline, first_paragraph: int = 0):
+    """Confere o prazo antes de entregar cada parágrafo ao layout."""
+    for number, para in enumerate(paragraphs, first_paragraph):
+        deadline.check('layout', paragraphs=number)
+        yield para
+
+def _iter_document_models(doc: Union[Document, Iterable[Paragraph]], ctx: _LayoutContext,
+                          workers: Optional[int] = None) -> Iterator[PageModel]:
+    """Páginas de todas as seções, numeradas em sequência.
+
+    Toda seção começa numa página nova (as 'continuous' também), então cada
+    uma é diagramada de forma independente, na sua geometria, por um pool de 'workers' threads (padrão:
+    uma por seção, até os.cpu_count()). As páginas saem em ordem, conforme as
+    seções ficam prontas. Com uma seção só (ou um iterável de parágrafos) não
+    há pool e as páginas saem enquanto o corpo é diagramado.
+    """
+    paragraphs, header, footer = _document_parts(doc)
+    sections = doc.sections if isinstance(doc, Document) else []
+    if len(sections) <= 1:
+        section_ctx = ctx
+        if sections:
+            section_ctx = ctx.for_section(sections[0])
+            header, footer = _section_furniture(sections[0], header, footer)
+        yield from _iter_page_models(paragraphs, header, footer, section_ctx)
+        return
+
+    # Marcado quando ninguém mais vai consumir as páginas (prazo vencido no
+    # desenho, erro no backend, iter_pages abandonado): as seções em andamento
+    # param no próximo parágrafo em vez de ir até o fim
+    stop = threading.Event()
+
+    def layout(section_range):
+        start, end, section = section_range
+        return list(_iter_page_models(_until(stop, paragraphs[start:end]),
+                                      *_section_furniture(section, header, footer),
+                                      ctx.for_section(section), start))
+
+    workers = workers or min(len(sections), os.cpu_count() or 1)
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='section')
+    futures = []
+    try:
+        futures = [executor.submit(layout, section_range)
+                   for section_range in section_ranges(sections, len(paragraphs))]
+        yield from _number_pages((section, future.result())
+                                 for section, future in zip(sections, futures))
+    finally:
+        stop.set()
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+def _until(stop: threading.Event, paragraphs):
+    """Entrega os parágrafos até 'stop' ser marcado."""
+    for para in paragraphs:
+        if stop.is_set():
+            return
+        yield para
+
+def _number_pages(section_pages) -> Iterator[PageModel]:
+    """Numera em sequência as páginas de cada seção; 'section_pages' dá (seção, páginas) em ordem."""
+    number = 0
+    for section, models in section_pages:
+        for index, model in enumerate(models):
+            # evenPage/oddPage: uma página só com cabeçalho e rodapé acerta a paridade
+            if index == 0 and number and ((section.start == 'evenPage' and number % 2 == 0) or
+                                          (section.start == 'oddPage' and number % 2 == 1)):
+                number += 1
+                yield PageModel(number=number, width=model.width, height=model.height,
+                                furniture=model.furniture)
+            number += 1
+            model.number = number
+            yield model
+
+def _paginate(line_groups: Iterable[List[Line]], furniture_layout, ctx: _LayoutContext) -> Iterator[PageModel]:
+    """Distribui linhas já quebradas (um grupo por parágrafo) em páginas."""
+    x = ctx.section.margin_left
+    furniture, body_top, page_bottom = furniture_layout
+    model = PageModel(number=1, width=ctx.page_width, height=ctx.page_height, furniture=furniture)
+    # y_top é o topo da próxima linha; cada linha tem a altura do seu maior tamanho
+    y_top = body_top
+    for lines in line_groups:
+        for line in lines:
+            if y_top + line.height > page_bottom and model.lines:
+                yield model
+                model = PageModel(number=model.number + 1, width=ctx.page_width,
+                                  height=ctx.page_height, furniture=furniture)
+                y_top = body_top
+
+            model.lines.append(PlacedLine(x=x, y=y_top + line.ascent, spans=line.spans))
+            y_top += line.height
+
+    yield model
+
+def _draw_page(page, model: PageModel, ctx: _LayoutContext):
+    """Desenha as linhas do modelo na página. Quem chama segura _FITZ_LOCK."""
+    if ctx.draft:
+        # Sem fontfile, todo o texto da página cabe num único Shape: um commit
+        # por página em vez de um por trecho
+        shape = page.new_shape()
+        for line in model.lines:
+            _draw_line(shape, line, ctx)
+        shape.commit()
+        return
+    for line in model.lines:
+        _draw_line(page, line, ctx)
+
+def run_style(run) -> str:
+    """Estilo de fonte da run: 'regular', 'bold', 'italic' ou 'bold_italic'."""
+    if run.is_bold and run.is_italic:
+        return 'bold_italic'
+    if run.is_bold:
+        return 'bold'
+    if run.is_italic:
+        return 'italic'
+    return 'regular'
+
+@dataclass
+class TextOp:
+    """Trecho de texto numa fonte só, na posição final: o que um backend desenha."""
+    x: float
+    y: float
+    text: str
+    style: str
+    # 0 = fonte do estilo; n > 0 = ctx.fallback_fonts[n - 1]
+    font_index: int
+    size: float
+
+def _text_ops(line: PlacedLine, ctx: _LayoutContext, page_number: Optional[int] = None) -> Iterator[TextOp]:
+    """Decompõe uma linha posicionada em TextOp.
+
+    Campos (PAGE) só são gerados quando 'page_number' é informado. A posição
+    vem pronta do layout; caracteres fora da fonte principal viram sub-runs na
+    fonte de fallback, e só nesse caso (raro) as sub-runs precisam ser medidas
+    para achar onde cada uma começa.
+    """
+    y = line.y
+    for span in line.spans:
+        run = span.run
+        text = run.text
+        if run.field_code:
+            if page_number is None:
+                continue
+            text = str(page_number)
+        if '\t' in text:
+            # Nenhuma fonte tem glifo para a tabulação: o layout a mediu como espaço
+            text = text.replace('\t', ' ')
+        font_size = run.size or ctx.font_size
+        style = run_style(run)
+        x = line.x + span.x
+        pieces = ctx.resolver.split(text) if ctx.resolver else [(text, 0)]
+        for number, (piece, font_index) in enumerate(pieces):
+            yield TextOp(x, y, piece, style, font_index, font_size)
+            if number + 1 < len(pieces):
+                x += ctx.metrics.get_text_width(piece, font_size)
+
+def _draw_line(page, line: PlacedLine, ctx: _LayoutContext, page_number: Optional[int] = None,
+               font_prefix: str = 'F'):
+    """Desenha uma linha já posicionada. Quem chama segura _FITZ_LOCK.
+
+    Campos (PAGE) só são desenhados quando 'page_number' é informado.
+    """
+    for op in _text_ops(line, ctx, page_number):
+        if ctx.draft:
+            page.insert_text((op.x, op.y), op.text,
+                             fontname=BASE14_FONTS[DRAFT_FONTS[op.style]][0], fontsize=op.size)
+            continue
+
+        if op.font_index:
+            fontname = f"{font_prefix}B{op.font_index}"
+            font_file = ctx.fallback_fonts[op.font_index - 1]
+        else:
+            try:
+                # Encontra o arquivo .ttf para o estilo atual
+                font_file = find_font_file(op.style)
+            except FileNotFoundError as e:
+                print(f"ERRO DE FONTE: {e}, pulando run.")
+                continue
+            fontname = f"{font_prefix}{op.style}" # Um nome único para a fonte no PDF
+
+        # O 'fontfile' é passado ao PyMuPDF: a fonte é embutida no PDF
+        page.insert_text(
+            (op.x, op.y),
+            op.text,
+            fontname=fontname,
+            fontfile=font_file,
+            fontsize=op.size
+        )
@@ -0,0 +1,93 @@
+# pydocx_render/text_index.py
+# Índice de posições do texto, gravado junto com o PDF.
+#
+# O indexador de busca precisava reabrir cada PDF e extrair o texto com o
+# PyMuPDF só para saber onde cada palavra está. O renderizador já tem tudo
+# isso no PageModel: cada trecho (Span) tem x e largura medidos pelo layout,
+# e a linha tem a linha de base. TextIndexWriter grava, página a página, um
+# registro JSON por trecho desenhado, sem nenhuma medição nova:
+#
+#   {"page": 3, "bbox": [x0, y0, x1, y1], "text": "...", "style": "bold",
+#    "size": 11, "furniture": false}
+#
+# As coordenadas são as do PyMuPDF (origem no canto superior esquerdo, em
+# pontos): x1 = x0 + largura do trecho, y0/y1 = linha de base -/+ ascent e
+# descent da fonte principal no tamanho do trecho. Cabeçalho e rodapé se
+# repetem em cada página com "furniture": true, e os campos PAGE trazem o
+# número da página. O arquivo é escrito num .tmp e só aparece no caminho
+# final em close(), como os PDFs do pipeline.
+
+import json
+import os
+from typing import Iterator, Optional
+from .renderer import PageModel, PlacedLine, _LayoutContext, run_style
+
+class TextIndexWriter:
+    """Grava o índice de posições (JSON lines) de um documento, página a página."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.tmp_path = f"{path}.{os.getpid()}.tmp"
+        self.file = open(self.tmp_path, 'w', encoding='utf-8')
+        self.records = 0
+
+    def write_page(self, model: PageModel, ctx: _LayoutContext):
+        """Registros de todos os trechos da página, corpo e cabeçalho/rodapé."""
+        records = []
+        for line in model.lines:
+            self._line_records(records, line, ctx, model.number, None)
+        for line in model.furniture:
+            self._line_records(records, line, ctx, model.number, model.number)
+        if records:
+            self.file.write('\n'.join(records))
+            self.file.write('\n')
+            self.records += len(records)
+
+    @staticmethod
+    def _line_records(records, line: PlacedLine, ctx: _LayoutContext, page: int,
+                      page_number: Optional[int]):
+        # Mesma regra de _text_ops: campos só onde o número da página é desenhado
+        ascent = ctx.metrics.ascent
+        descent = ctx.metrics.descent
+        furniture = page_number is not None
+        for span in line.spans:
+            run = span.run
+            text = run.text
+            if run.field_code:
+                if page_number is None:
+                    continue
+                text = str(page_number)
+            # Como em _text_ops: a tabulação sai como espaço
+            text = text.replace('\t', ' ')
+            if not text.strip():
+                continue
+            size = run.size or ctx.font_size
+            x0 = line.x + span.x
+            records.append(json.dumps({
+                'page': page,
+                'bbox': [round(x0, 2), round(line.y - ascent * size, 2),
+                         round(x0 + span.width, 2), round(line.y + descent * size, 2)],
+                'text': text,
+                'style': run_style(run),
+                'size': size,
+                'furniture': furniture,
+            }, ensure_ascii=False, separators=(',', ':')))
+
+    def close(self):
+        """Conclui o arquivo e o move para o caminho final."""
+        self.file.close()
+        os.replace(self.tmp_path, self.path)
+
+    def cleanup(self):
+        """Descarta o arquivo incompleto (depois de um erro)."""
+        if not self.file.closed:
+            self.file.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+def iter_text_index(path: str) -> Iterator[dict]:
+    """Lê um índice gravado por TextIndexWriter, um registro por trecho."""
+    with open(path, encoding='utf-8') as index_file:
+        for line in index_file:
+            if line.strip():
+                yield json.loads(line)
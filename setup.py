@@ -1,5 +1,7 @@
 # setup.py
 import os
+import shlex
+import subprocess
 import sys
 from setuptools import setup, Extension
 from Cython.Build import cythonize
@@ -20,6 +22,43 @@ else:
     extra_compile_args = ["-O3"]
     extra_link_args = []
 
+def freetype_flags():
+    """include_dirs/library_dirs/libraries do libfreetype do sistema, ou None.
+
+    Ordem: FREETYPE_ROOT, pkg-config e os prefixos comuns.
+    """
+    root = os.environ.get("FREETYPE_ROOT")
+    if root:
+        return {
+            "include_dirs": [os.path.join(root, "include"), os.path.join(root, "include", "freetype2")],
+            "library_dirs": [os.path.join(root, "lib")],
+            "libraries": ["freetype"],
+        }
+    try:
+        output = subprocess.run(["pkg-config", "--cflags", "--libs", "freetype2"],
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        pass
+    else:
+        flags = {"include_dirs": [], "library_dirs": [], "libraries": []}
+        for token in shlex.split(output):
+            if token.startswith("-I"):
+                flags["include_dirs"].append(token[2:])
+            elif token.startswith("-L"):
+                flags["library_dirs"].append(token[2:])
+            elif token.startswith("-l"):
+                flags["libraries"].append(token[2:])
+        return flags
+    for prefix in ("/usr", "/usr/local", "/opt/homebrew"):
+        include_dir = os.path.join(prefix, "include", "freetype2")
+        if os.path.exists(os.path.join(include_dir, "ft2build.h")):
+            return {
+                "include_dirs": [include_dir],
+                "library_dirs": [os.path.join(prefix, "lib")],
+                "libraries": ["freetype"],
+            }
+    return None
+
 # Definir extensões
 extensions = [
     Extension(
@@ -32,6 +71,24 @@ extensions = [
     )
 ]
 
+# Leitura das fontes pela API C do FreeType. Sem o libfreetype o pacote
+# continua funcionando com o freetype-py
+freetype = freetype_flags()
+if freetype is None:
+    print("AVISO: FreeType não encontrado (defina FREETYPE_ROOT); "
+          "ft_native não será compilado e o freetype-py será usado.")
+else:
+    extensions.append(
+        Extension(
+            "pydocx_render.layout.ft_native",
+            ["pydocx_render/layout/ft_native.pyx"],
+            extra_compile_args=extra_compile_args,
+            extra_link_args=extra_link_args,
+            language="c++",
+            **freetype
+        )
+    )
+
 # Configurações do Cython
 compiler_directives = {
     'boundscheck': False,
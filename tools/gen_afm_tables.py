@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Gera pydocx_render/layout/afm_data.py: larguras das fontes base-14 Helvetica.
+
+O modo rascunho desenha com as fontes base-14 do PDF, que o leitor já tem e
+não são embutidas. O PyMuPDF as escreve com codificação Latin-1: caracteres
+acima de U+00FF saem como '·' (U+00B7). Por isso só os code points 0..255 são
+gravados, em unidades de 1/1000 em, como nos arquivos AFM da Adobe.
+
+As larguras vêm das fontes internas do MuPDF (Nimbus Sans, com as mesmas
+métricas da Helvetica). Oblique tem as larguras da regular e BoldOblique as da
+bold, como nos AFM.
+
+Uso:
+    python tools/gen_afm_tables.py
+"""
+
+import os
+
+import fitz
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUTPUT = os.path.join(ROOT, 'pydocx_render', 'layout', 'afm_data.py')
+
+# Nome PostScript -> nome da fonte interna no PyMuPDF
+FONTS = (('Helvetica', 'helv'), ('Helvetica-Bold', 'hebo'))
+
+def widths_for(fitz_name):
+    font = fitz.Font(fitz_name)
+    widths = []
+    for cp in range(256):
+        # Controles C0/C1 não têm glifo: ficam com 0 e caem no valor padrão
+        if cp < 0x20 or 0x7F <= cp < 0xA0:
+            widths.append(0)
+        else:
+            widths.append(round(font.glyph_advance(cp) * 1000))
+    return widths
+
+def main():
+    lines = [
+        '# pydocx_render/layout/afm_data.py',
+        '# Gerado por tools/gen_afm_tables.py. NÃO EDITE.',
+        '# Larguras (1/1000 em) dos code points 0..255; 0 = sem glifo.',
+        '',
+        'WIDTHS = {',
+    ]
+    for name, fitz_name in FONTS:
+        widths = widths_for(fitz_name)
+        lines.append(f'    {name!r}: (')
+        for start in range(0, 256, 16):
+            lines.append('        ' + ', '.join(str(w) for w in widths[start:start + 16]) + ',')
+        lines.append('    ),')
+    lines.append('}')
+    with open(OUTPUT, 'w', encoding='utf-8') as target:
+        target.write('\n'.join(lines) + '\n')
+    print(f"Gravado {OUTPUT}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Gera pydocx_render/layout/linebreak_data.py a partir do LineBreak.txt do Unicode.
+
+As classes de quebra de linha (UAX #14) são gravadas numa tabela de dois
+estágios: STAGE1 mapeia cada bloco de 2**SHIFT code points para um bloco
+deduplicado de STAGE2, que guarda um byte (id da classe) por code point.
+
+As resoluções da regra LB1 são aplicadas aqui, uma única vez:
+    AI, SG, XX, AK, AP, AS, VI, VF -> AL
+    CJ -> NS,  CB -> ID,  EB, EM -> ID,  ZWJ -> CM
+    SA -> CM para marcas (Mn/Mc), AL para o resto: sem um segmentador com
+          dicionário não há como achar as fronteiras de palavra do
+          tailandês, laosiano e afins, então, como recomenda o UAX #14, não
+          há quebra dentro de um trecho SA (só nos espaços entre frases)
+
+Uso:
+    python tools/gen_linebreak_tables.py caminho/para/LineBreak.txt
+"""
+
+import base64
+import os
+import sys
+import unicodedata
+import zlib
+from array import array
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUTPUT = os.path.join(ROOT, 'pydocx_render', 'layout', 'linebreak_data.py')
+
+SHIFT = 7
+
+# A ordem importa: os 29 primeiros indexam a tabela de pares (PAIR_TABLE).
+CLASS_NAMES = (
+    'OP', 'CL', 'CP', 'QU', 'GL', 'NS', 'EX', 'SY', 'IS', 'PR', 'PO', 'NU',
+    'AL', 'HL', 'ID', 'IN', 'HY', 'BA', 'BB', 'B2', 'ZW', 'CM', 'WJ', 'H2',
+    'H3', 'JL', 'JV', 'JT', 'RI',
+    'BK', 'CR', 'LF', 'NL', 'SP',
+)
+
+RESOLVE = {
+    'AI': 'AL', 'SG': 'AL', 'XX': 'AL', 'AK': 'AL', 'AP': 'AL', 'AS': 'AL',
+    'VI': 'AL', 'VF': 'AL', 'CJ': 'NS', 'CB': 'ID', 'EB': 'ID', 'EM': 'ID',
+    'ZWJ': 'CM',
+}
+
+def read_classes(path):
+    classes = bytearray([CLASS_NAMES.index('AL')]) * 0x110000
+    with open(path, encoding='utf-8') as source:
+        for line in source:
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            code_range, name = (field.strip() for field in line.split(';'))
+            first, _, last = code_range.partition('..')
+            first = int(first, 16)
+            last = int(last, 16) if last else first
+            for cp in range(first, last + 1):
+                resolved = name
+                if name == 'SA':
+                    resolved = 'CM' if unicodedata.category(chr(cp)) in ('Mn', 'Mc') else 'AL'
+                resolved = RESOLVE.get(resolved, resolved)
+                classes[cp] = CLASS_NAMES.index(resolved)
+    return classes
+
+def build_stages(classes):
+    block_size = 1 << SHIFT
+    blocks = {}
+    stage1 = array('H')
+    stage2 = bytearray()
+    for start in range(0, len(classes), block_size):
+        block = bytes(classes[start:start + block_size])
+        index = blocks.get(block)
+        if index is None:
+            index = blocks[block] = len(blocks)
+            stage2.extend(block)
+        stage1.append(index)
+    return stage1, bytes(stage2)
+
+def encode(data):
+    return base64.b64encode(zlib.compress(data, 9)).decode('ascii')
+
+def wrap(text, width=76):
+    return '\n'.join(f"    '{text[i:i + width]}'" for i in range(0, len(text), width))
+
+def main():
+    if len(sys.argv) != 2:
+        sys.exit(__doc__)
+
+    classes = read_classes(sys.argv[1])
+    stage1, stage2 = build_stages(classes)
+    if sys.byteorder != 'little':
+        stage1.byteswap()
+
+    with open(OUTPUT, 'w', encoding='utf-8', newline='\n') as out:
+        out.write("# pydocx_render/layout/linebreak_data.py\n")
+        out.write("# Gerado por tools/gen_linebreak_tables.py a partir do LineBreak.txt. NÃO EDITE.\n")
+        out.write(f"# Unicode {unicodedata.unidata_version} (categorias gerais para a resolução de SA).\n\n")
+        out.write(f"SHIFT = {SHIFT}\n\n")
+        out.write(f"CLASS_NAMES = {CLASS_NAMES!r}\n\n")
+        out.write("# uint16 little-endian, zlib + base64\n")
+        out.write(f"STAGE1 = (\n{wrap(encode(stage1.tobytes()))}\n)\n\n")
+        out.write("# uint8, zlib + base64\n")
+        out.write(f"STAGE2 = (\n{wrap(encode(stage2))}\n)\n")
+
+    print(f"{OUTPUT}: {len(stage1)} entradas no estágio 1, "
+          f"{len(stage2) >> SHIFT} blocos únicos no estágio 2 ({len(stage2)} bytes)")
+
+if __name__ == '__main__':
+    main()